@@ -3,11 +3,36 @@ import os
 from mcp.server.fastmcp import FastMCP
 from egret.data.model_data import ModelData
 from egret.models.unit_commitment import solve_unit_commitment
-from egret.models.acopf import solve_acopf, create_psv_acopf_model
-from egret.models.dcopf import solve_dcopf, create_ptdf_dcopf_model
-from typing import Dict, Any, Optional
+from egret.models.acopf import create_psv_acopf_model
+from egret.models.dcopf import solve_dcopf, create_ptdf_dcopf_model, create_btheta_dcopf_model
+from egret.common import lazy_ptdf_utils as lpu
+from egret.common.solver_interface import _solve_model
+from egret.model_library.transmission import tx_utils
+from egret.model_library.transmission import bus as libbus
+from egret.model_library.transmission import branch as libbranch
+from egret.model_library.transmission import gen as libgen
+from egret.data.data_utils import zip_items
+from egret.models.fixed_vars import fix_var_and_remove_bounds
+import pyomo.environ as pe
+import pyomo.opt as po
+from pyomo.common.collections import ComponentMap, ComponentSet
+from pyomo.contrib.appsi.base import PersistentSolver as AppsiPersistentSolver
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
 import io
+import json
 import logging
+import math
+import multiprocessing
+import pickle
+import re
+import tempfile
+import time
+from math import radians, degrees
+from collections import OrderedDict
 from contextlib import redirect_stdout, redirect_stderr
 import numpy as np
 
@@ -19,6 +44,74 @@ logging.getLogger('pyomo').setLevel(logging.WARNING)
 # Create an MCP server
 mcp = FastMCP("Egret Power System Analysis Server")
 
+# Parsed case files, keyed by absolute path, least recently used first. Each
+# entry holds the pickled model data, which is much faster to load than
+# ModelData.clone() (a deepcopy) and gives every solve a private copy.
+_case_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_case_stats = {"hits": 0, "misses": 0}
+_MAX_CASES = int(os.environ.get("EGRET_MCP_CASE_CACHE", 16))
+
+# Optional directory for pickled cases keyed by file hash, reused across server restarts
+_CASE_DIR = os.environ.get("EGRET_MCP_CASE_DIR")
+
+
+def _file_hash(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_case(case_file: str) -> Tuple[ModelData, Dict[str, Any]]:
+    """Get a private copy of a parsed case file, parsing it only if it changed.
+
+    Entries are reused while the file's mtime and size are unchanged; if they
+    changed, the content hash decides whether the file must be parsed again.
+    Returns the model data and the cache statistics of the request.
+    """
+    path = os.path.abspath(case_file)
+    stat = os.stat(path)
+    entry = _case_cache.get(path)
+    hit = entry is not None and (entry["mtime_ns"], entry["size"]) == (stat.st_mtime_ns, stat.st_size)
+    if not hit and entry is not None and entry["size"] == stat.st_size:
+        hit = entry["hash"] == _file_hash(path)
+        entry["mtime_ns"] = stat.st_mtime_ns
+    if hit:
+        _case_stats["hits"] += 1
+        _case_cache.move_to_end(path)
+    else:
+        _case_stats["misses"] += 1
+        start_time = time.perf_counter()
+        file_hash = _file_hash(path)
+        stored = os.path.join(_CASE_DIR, file_hash + ".pkl") if _CASE_DIR else None
+        if stored and os.path.exists(stored):
+            with open(stored, "rb") as f:
+                data = f.read()
+        else:
+            data = pickle.dumps(ModelData.read(path).data, protocol=pickle.HIGHEST_PROTOCOL)
+            if stored:
+                os.makedirs(_CASE_DIR, exist_ok=True)
+                with open(stored, "wb") as f:
+                    f.write(data)
+        entry = {"data": data, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": file_hash,
+                 "parse_time_s": time.perf_counter() - start_time}
+        _case_cache[path] = entry
+        while len(_case_cache) > _MAX_CASES:
+            _case_cache.popitem(last=False)
+
+    start_time = time.perf_counter()
+    md = ModelData(pickle.loads(entry["data"]))
+    return md, {
+        "hit": hit,
+        "parse_time_s": entry["parse_time_s"],
+        "clone_time_s": time.perf_counter() - start_time,
+        "hits": _case_stats["hits"],
+        "misses": _case_stats["misses"]
+    }
+
+
 @mcp.tool()
 def solve_unit_commitment_problem(
     case_file: str,
@@ -44,7 +137,7 @@ def solve_unit_commitment_problem(
         
         with redirect_stdout(f_out), redirect_stderr(f_err):
             # Load the case file
-            md = ModelData.read(case_file)
+            md, case_cache = _read_case(case_file)
             
             # Solve the unit commitment problem with solver_tee=False to silence solver output
             md_sol = solve_unit_commitment(
@@ -60,6 +153,7 @@ def solve_unit_commitment_problem(
             "status": "success",
             "total_cost": md_sol.data['system']['total_cost'],
             "solution": md_sol.data,
+            "case_cache": case_cache,
             # Include captured output for debugging if needed
             "stdout": f_out.getvalue(),
             "stderr": f_err.getvalue()
@@ -73,11 +167,175 @@ def solve_unit_commitment_problem(
             "message": str(e)
         }
 
+# Last AC OPF solution of each case (primal values and multipliers), keyed by
+# absolute path, for warm starts of later solves of the same case
+_ac_solutions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# IPOPT options for a start from a previous AC solution with its multipliers
+_IPOPT_WARM_START_OPTIONS = {
+    "warm_start_init_point": "yes",
+    "warm_start_bound_push": 1e-6,
+    "warm_start_slack_bound_push": 1e-6,
+    "warm_start_mult_bound_push": 1e-6,
+    "mu_init": 1e-6
+}
+
+# Variables of the polar AC model defined by an equality on the voltages,
+# in the order they can be computed from angles and magnitudes
+_AC_DEFINED_VARS = (("dva", "eq_delta_va"), ("vmsq", "eq_vmsq"), ("c", "eq_c"), ("s", "eq_s"),
+                    ("pf", "eq_pf_branch"), ("pt", "eq_pt_branch"),
+                    ("qf", "eq_qf_branch"), ("qt", "eq_qt_branch"))
+
+
+def _component_values(model: pe.ConcreteModel, ctype: Any, suffix: Optional[pe.Suffix] = None) -> Dict[str, Dict[Any, float]]:
+    """Values of the free variables (or suffix values of the constraints) of a model by component name and index."""
+    values = {}
+    for comp in model.component_objects(ctype, descend_into=True):
+        if suffix is None:
+            comp_values = {idx: var.value for idx, var in comp.items() if not var.fixed and var.value is not None}
+        else:
+            comp_values = {idx: suffix[data] for idx, data in comp.items() if data in suffix}
+        if comp_values:
+            values[comp.name] = comp_values
+    return values
+
+
+def _set_component_values(model: pe.ConcreteModel, values: Dict[str, Dict[Any, float]],
+                          suffix: Optional[pe.Suffix] = None) -> int:
+    """Set variable values (or suffix values) from _component_values on a model of the same case.
+
+    Fixed variables (the loads) keep the values of the model. Returns the number of values set.
+    """
+    count = 0
+    for name, comp_values in values.items():
+        comp = model.find_component(name)
+        if comp is None:
+            continue
+        for idx, val in comp_values.items():
+            if idx not in comp:
+                continue
+            data = comp[idx]
+            if suffix is not None:
+                suffix[data] = val
+            elif not data.fixed:
+                data.set_value(val, skip_validation=True)
+            else:
+                continue
+            count += 1
+    return count
+
+
+def _set_dc_start(model: pe.ConcreteModel, md: ModelData, dc_solver: str) -> None:
+    """Initialize the angles and dispatch of a polar AC model from a DC OPF of the case.
+
+    The branch flows and the other voltage-defined variables are computed from them.
+    """
+    md_dc = solve_dcopf(md, dc_solver, dcopf_model_generator=create_ptdf_dcopf_model, solver_tee=False)
+    base_mva = md_dc.data['system']['baseMVA']
+    for name, bus in md_dc.elements(element_type='bus'):
+        # Egret's DC models take pf = -(va_f - va_t) / x, so their angles have the opposite sign
+        if name in model.va and not model.va[name].fixed:
+            model.va[name].set_value(-radians(bus['va']), skip_validation=True)
+    for name, gen in md_dc.elements(element_type='generator'):
+        if name in model.pg:
+            model.pg[name].set_value(gen['pg'] / base_mva, skip_validation=True)
+    for var_name, con_name in _AC_DEFINED_VARS:
+        var, con = getattr(model, var_name), getattr(model, con_name)
+        for idx in con:
+            lhs, rhs = con[idx].expr.args
+            if lhs is var[idx]:
+                var[idx].set_value(pe.value(rhs), skip_validation=True)
+            else:
+                calculate_variable_from_constraint(var[idx], con[idx])
+
+
+def _ipopt_iterations(log_file: str) -> Optional[int]:
+    """Number of iterations from an IPOPT output file."""
+    if not os.path.exists(log_file):
+        return None
+    with open(log_file) as f:
+        match = re.search(r"Number of Iterations\.*:\s*(\d+)", f.read())
+    return int(match.group(1)) if match else None
+
+
+def _solve_acopf_from(md: ModelData, solver: str, solver_options: Optional[Dict[str, Any]],
+                      start: Optional[str], dc_solver: str, stored: Optional[Dict[str, Any]]) -> Tuple[ModelData, Any, Dict[str, Any]]:
+    """Solve the polar AC OPF of a case from a cold start, a DC OPF solution ("dc") or a
+    stored AC solution ("ac"), like solve_acopf with create_psv_acopf_model.
+
+    Returns the solved model data (in MW), the solver results and the solve statistics.
+    """
+    start_time = time.perf_counter()
+    model, md_pu = create_psv_acopf_model(md)
+    ipopt = "ipopt" in solver
+    model.dual = pe.Suffix(direction=pe.Suffix.IMPORT_EXPORT if ipopt else pe.Suffix.IMPORT)
+    options = {}
+    if ipopt:
+        model.ipopt_zL_out = pe.Suffix(direction=pe.Suffix.IMPORT)
+        model.ipopt_zU_out = pe.Suffix(direction=pe.Suffix.IMPORT)
+        model.ipopt_zL_in = pe.Suffix(direction=pe.Suffix.EXPORT)
+        model.ipopt_zU_in = pe.Suffix(direction=pe.Suffix.EXPORT)
+    if start == "dc":
+        _set_dc_start(model, md, dc_solver)
+    elif start == "ac":
+        _set_component_values(model, stored["primal"])
+        if ipopt:
+            _set_component_values(model, stored["dual"], model.dual)
+            _set_component_values(model, stored["zL"], model.ipopt_zL_in)
+            _set_component_values(model, stored["zU"], model.ipopt_zU_in)
+            options.update(_IPOPT_WARM_START_OPTIONS)
+    init_time = time.perf_counter() - start_time
+    options.update(solver_options or {})
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_file = os.path.join(log_dir, "ipopt.out")
+        if ipopt:
+            options.setdefault("output_file", log_file)
+        start_time = time.perf_counter()
+        model, results = _solve_model(model, solver, solver_tee=False, solver_options=options)
+        solve_time = time.perf_counter() - start_time
+        iterations = _ipopt_iterations(options["output_file"]) if ipopt else None
+
+    # save results data to ModelData object, as solve_acopf does
+    md_pu.data['system']['total_cost'] = pe.value(model.obj)
+    for name, gen in md_pu.elements(element_type='generator'):
+        gen['pg'] = pe.value(model.pg[name])
+        gen['qg'] = pe.value(model.qg[name])
+    for name, bus in md_pu.elements(element_type='bus'):
+        bus['lmp'] = pe.value(model.dual[model.eq_p_balance[name]])
+        bus['qlmp'] = pe.value(model.dual[model.eq_q_balance[name]])
+        bus['pl'] = pe.value(model.pl[name])
+        bus['vm'] = pe.value(model.vm[name])
+        bus['va'] = degrees(pe.value(model.va[name]))
+    for name, branch in md_pu.elements(element_type='branch'):
+        for attr in ('pf', 'pt', 'qf', 'qt'):
+            branch[attr] = pe.value(getattr(model, attr)[name])
+    tx_utils.unscale_ModelData_to_pu(md_pu, inplace=True)
+
+    solution = {"primal": _component_values(model, pe.Var)}
+    if ipopt:
+        solution["dual"] = _component_values(model, pe.Constraint, model.dual)
+        solution["zL"] = _component_values(model, pe.Var, model.ipopt_zL_out)
+        solution["zU"] = _component_values(model, pe.Var, model.ipopt_zU_out)
+    stats = {
+        "start": start,
+        "init_time_s": init_time,
+        "solve_time_s": solve_time,
+        "iterations": iterations,
+        "solution": solution
+    }
+    return md_pu, results, stats
+
+
 @mcp.tool()
 def solve_ac_opf(
     case_file: str,
     solver: str = "ipopt",
-    return_results: bool = True
+    return_results: bool = True,
+    warm_start: Optional[str] = None,
+    dc_solver: Optional[str] = None,
+    solver_options: Optional[Dict[str, Any]] = None,
+    compare_cold_start: bool = False
 ) -> Dict[str, Any]:
     """Solve an AC Optimal Power Flow problem using Egret
     
@@ -85,38 +343,68 @@ def solve_ac_opf(
         case_file: Path to the case file (can be Matpower or Egret JSON format)
         solver: Solver to use (default: ipopt)
         return_results: Whether to return detailed results (default: True)
+        warm_start: Initial point: None for Egret's default (cold start), "ac" for the
+            last AC solution of this case file (with its multipliers and IPOPT's
+            warm-start options; cold start if there is none) or "dc" for the
+            angles and dispatch of a DC OPF solution (default: None)
+        dc_solver: Solver for the DC OPF of a "dc" warm start (default: solver)
+        solver_options: Options passed to the solver, overriding the warm-start options
+        compare_cold_start: Also solve from a cold start and report both (default: False)
     
     Returns:
-        Dict containing the solution results
+        Dict containing the solution results and the iterations and solve time of
+        the warm start against a cold start of the case
     """
     try:
+        if warm_start not in (None, "ac", "dc"):
+            raise ValueError(f"Unknown warm_start '{warm_start}', expected 'ac' or 'dc'")
         # Completely capture both stdout and stderr
         f_out = io.StringIO()
         f_err = io.StringIO()
         
         with redirect_stdout(f_out), redirect_stderr(f_err):
             # Load the case file
-            md = ModelData.read(case_file)
+            md, case_cache = _read_case(case_file)
+            path = os.path.abspath(case_file)
+            stored = _ac_solutions.get(path)
+            start = warm_start if warm_start != "ac" or stored is not None else None
             
-            # Solve AC OPF with solver_tee=False to silence solver output
-            md_sol, results = solve_acopf(
-                md,
-                solver,
-                acopf_model_generator=create_psv_acopf_model,
-                return_results=return_results,
-                solver_tee=False  # Explicitly disable solver output
-            )
+            # Statistics of the last cold start of the case, or a new one to compare with
+            cold = stored["cold_start"] if stored else None
+            if compare_cold_start and start is not None:
+                _, _, cold = _solve_acopf_from(md, solver, solver_options, None, None, None)
+            md_sol, results, stats = _solve_acopf_from(md, solver, solver_options, start,
+                                                       dc_solver or solver, stored)
+        
+        ac_solution = stats.pop("solution")
+        if start is None:
+            cold = stats
+        if cold is not None:
+            cold = {key: cold[key] for key in ("solve_time_s", "iterations")}
+        if results.solver.termination_condition in (po.TerminationCondition.optimal,
+                                                    po.TerminationCondition.locallyOptimal):
+            _ac_solutions[path] = {**ac_solution, "cold_start": cold}
+            _ac_solutions.move_to_end(path)
+            while len(_ac_solutions) > _MAX_CASES:
+                _ac_solutions.popitem(last=False)
+        if start is not None and cold is not None:
+            stats["cold_start"] = cold
+            stats["speedup"] = cold["solve_time_s"] / stats["solve_time_s"]
+        stats["requested"] = warm_start
         
         # Extract key results
         solution = {
             "status": "success",
             "objective_value": results["Solution"][0]["Objective"]["f"],
             "termination_condition": str(results["Solver"][0]["Termination condition"]),
-            "solution": md_sol.data,
+            "warm_start": stats,
+            "case_cache": case_cache,
             # Include captured output for debugging if needed
             "stdout": f_out.getvalue(),
             "stderr": f_err.getvalue()
         }
+        if return_results:
+            solution["solution"] = md_sol.data
         
         return solution
     
@@ -126,11 +414,233 @@ def solve_ac_opf(
             "message": str(e)
         }
 
+# PTDF matrices of network topologies, least recently used first, with the
+# branches that were binding in the last solve. A PTDF matrix keeps the rows it
+# has computed, and the binding branches seed the monitored set of the next solve.
+_ptdf_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Persistent interfaces of solvers, so that constraint generation rounds only pass
+# the new flow limits to the solver instead of the whole model
+_PERSISTENT_SOLVERS = {"gurobi": "gurobi_persistent", "cplex": "cplex_persistent",
+                       "xpress": "xpress_persistent", "highs": "appsi_highs"}
+
+
+def _topology_key(md: ModelData, ptdf_options: Dict[str, Any]) -> str:
+    """Digest of the data a PTDF matrix depends on: the buses and in-service branches
+    (in model order, as the matrix is indexed by position), the reference bus and the
+    PTDF options."""
+    branches = [(name, branch) for name, branch in md.elements(element_type='branch')
+                if branch.get('in_service', True)]
+    data = [list(md.data['elements']['bus']), md.data['system']['reference_bus'], branches, ptdf_options]
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _persistent_solver(solver: str) -> str:
+    """Name of the persistent interface of a solver if it is available, otherwise the solver."""
+    persistent = _PERSISTENT_SOLVERS.get(solver)
+    if persistent and po.SolverFactory(persistent).available(exception_flag=False):
+        return persistent
+    return solver
+
+
+def _add_violated_flow_limits(model: pe.ConcreteModel, md: ModelData, solver: Any = None) -> int:
+    """Add violated flow limits (at most max_violations_per_iteration) to a lazy PTDF DC OPF model.
+
+    Returns the number of added limits, 0 if none are violated or all violated
+    limits are already in the model.
+    """
+    ptdf_options = model._ptdf_options
+    flows, viol_num, mon_viol_num, viol_lazy = lpu.check_violations(
+        model, md, model._PTDF, ptdf_options['max_violations_per_iteration'])
+    if viol_num == mon_viol_num:
+        return 0
+    lpu.add_violations(viol_lazy, flows, model, md, solver if isinstance(solver, PersistentSolver) else None,
+                       ptdf_options, model._PTDF)
+    return len(viol_lazy)
+
+
+def _create_lazy_ptdf_dcopf_model(model_data: ModelData, ptdf_options: Dict[str, Any],
+                                  PTDF: Any) -> Tuple[pe.ConcreteModel, ModelData]:
+    """Build the lazy PTDF DC OPF model of create_ptdf_dcopf_model on an existing PTDF matrix.
+
+    Unlike the unit commitment models (PTDF_matrix_dict), create_ptdf_dcopf_model
+    takes no PTDF matrix, so its lazy formulation (flat start, no feasibility
+    slack, 'delta' piecewise costs) is declared here with Egret's model library.
+    """
+    ptdf_options = lpu.populate_default_ptdf_options(ptdf_options)
+    lpu.check_and_scale_ptdf_options(ptdf_options, model_data.data['system']['baseMVA'])
+
+    md = model_data.clone_in_service()
+    tx_utils.scale_ModelData_to_pu(md, inplace=True)
+
+    gens = dict(md.elements(element_type='generator'))
+    buses = dict(md.elements(element_type='bus'))
+    branches = dict(md.elements(element_type='branch'))
+    loads = dict(md.elements(element_type='load'))
+    shunts = dict(md.elements(element_type='shunt'))
+    dc_branches = dict(md.elements(element_type='dc_branch'))
+    gen_attrs = md.attributes(element_type='generator')
+    buses_idx = tuple(buses.keys())
+    branches_idx = tuple(branches.keys())
+    if PTDF.buses_keys != buses_idx or PTDF.branches_keys != branches_idx:
+        raise ValueError("The PTDF matrix does not match the buses and branches of the case")
+    gens_by_bus = tx_utils.gens_by_bus(buses, gens)
+
+    model = pe.ConcreteModel()
+
+    bus_p_loads, _ = tx_utils.dict_of_bus_loads(buses, loads)
+    libbus.declare_var_pl(model, buses_idx, initialize=bus_p_loads)
+    for var in model.pl.values():
+        fix_var_and_remove_bounds(var, var.value)
+    _, bus_gs_fixed_shunts = tx_utils.dict_of_bus_fixed_shunts(buses, shunts)
+
+    pg_init = {k: (gen_attrs['p_min'][k] + gen_attrs['p_max'][k]) / 2.0 for k in gen_attrs['pg']}
+    libgen.declare_var_pg(model, gen_attrs['names'], initialize=pg_init,
+                          bounds=zip_items(gen_attrs['p_min'], gen_attrs['p_max']))
+
+    dc_inlet_branches_by_bus = dc_outlet_branches_by_bus = None
+    if dc_branches:
+        dcpf_bounds = {k: (None, None) if branch['rating_long_term'] is None
+                       else (-branch['rating_long_term'], branch['rating_long_term'])
+                       for k, branch in dc_branches.items()}
+        libbranch.declare_var_dcpf(model=model, index_set=dc_branches.keys(), initialize=0., bounds=dcpf_bounds)
+        dc_inlet_branches_by_bus, dc_outlet_branches_by_bus = \
+            tx_utils.inlet_outlet_branches_by_bus(dc_branches, buses)
+
+    libbus.declare_eq_p_balance_ed(model=model, index_set=buses_idx, bus_p_loads=bus_p_loads,
+                                   gens_by_bus=gens_by_bus, bus_gs_fixed_shunts=bus_gs_fixed_shunts)
+    libbus.declare_expr_p_net_withdraw_at_bus(model=model, index_set=buses_idx, bus_p_loads=bus_p_loads,
+                                              gens_by_bus=gens_by_bus, bus_gs_fixed_shunts=bus_gs_fixed_shunts,
+                                              dc_inlet_branches_by_bus=dc_inlet_branches_by_bus,
+                                              dc_outlet_branches_by_bus=dc_outlet_branches_by_bus)
+    libbranch.declare_expr_pf(model=model, index_set=branches_idx)
+
+    model._PTDF = PTDF
+    model._ptdf_options = ptdf_options
+    # Flow limits start out empty; the monitored ones are added from the PTDF rows
+    libbranch.declare_ineq_p_branch_thermal_bounds(model=model, index_set=branches_idx, branches=branches,
+                                                   p_thermal_limits=None, approximation_type=None)
+    lpu.add_monitored_flow_tracker(model)
+    lpu.add_initial_monitored_constraints(model, md, branches_idx, ptdf_options, PTDF)
+
+    p_costs = gen_attrs['p_cost']
+    pw_pg_cost_gens = list(libgen.pw_gen_generator(gen_attrs['names'], costs=p_costs))
+    if pw_pg_cost_gens:
+        libgen.declare_var_delta_pg(model=model, index_set=pw_pg_cost_gens, p_costs=p_costs)
+        libgen.declare_pg_delta_pg_con(model=model, index_set=pw_pg_cost_gens, p_costs=p_costs)
+    libgen.declare_expression_pg_operating_cost(model=model, index_set=gen_attrs['names'], p_costs=p_costs,
+                                                pw_formulation='delta')
+    model.obj = pe.Objective(expr=sum(model.pg_operating_cost[name] for name in model.pg_operating_cost))
+    return model, md
+
+
+def _lazy_ptdf_session(md: ModelData, solver: str, ptdf_options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build Egret's lazy PTDF DC OPF model of a case as an OPF session.
+
+    The PTDF matrix of the network topology is reused, and the branches at their
+    limits in the last solve of the topology are monitored from the start.
+    """
+    ptdf_options = lpu.populate_default_ptdf_options(ptdf_options)
+    ptdf_options['lazy'] = True
+    key = _topology_key(md, ptdf_options)
+    entry = _ptdf_cache.get(key)
+    hit = entry is not None
+    seeded = []
+    if hit:
+        _ptdf_cache.move_to_end(key)
+        # Egret monitors branches flagged 'lazy': False from the start
+        branches = md.data['elements']['branch']
+        seeded = [name for name in entry["binding"] if 'lazy' not in branches[name]]
+        for name in seeded:
+            branches[name]['lazy'] = False
+        # The rows of the seeded branches come from the cached matrix as well
+        model, md_pu = _create_lazy_ptdf_dcopf_model(md, ptdf_options, entry["ptdf"])
+    else:
+        model, md_pu = create_ptdf_dcopf_model(md, ptdf_options=ptdf_options)
+        entry = {"ptdf": model._PTDF, "binding": []}
+        _ptdf_cache[key] = entry
+        while len(_ptdf_cache) > _MAX_CASES:
+            _ptdf_cache.popitem(last=False)
+    model.dual = pe.Suffix(direction=pe.Suffix.IMPORT)
+    solver = _persistent_solver(solver)
+    session = _new_session(None, "dc", model, md_pu, solver, None)
+    session.update({
+        "solver_name": solver,
+        "ptdf_entry": entry,
+        "ptdf_cache_hit": hit,
+        "seeded_branches": seeded,
+        "initial_constraints": len(model._idx_monitored)
+    })
+    return session
+
+
+def _branches_at_limit(PTDF: Any, PFV: np.ndarray) -> List[str]:
+    """Branches whose flow (indexed like PTDF.branches_keys) is at its limit."""
+    return [PTDF.branches_keys[i] for i in np.flatnonzero(np.abs(PFV) >= (1. - 1e-4) * PTDF.branch_limits_array)]
+
+
+def _solve_lazy_ptdf_dcopf(md: ModelData, solver: str,
+                           ptdf_options: Optional[Dict[str, Any]]) -> Tuple[ModelData, Any, Dict[str, Any]]:
+    """Solve a DC OPF with Egret's lazy PTDF model, adding violated flow limits round
+    by round, like solve_dcopf with create_ptdf_dcopf_model.
+
+    Returns the solved model data (in MW), the solver results of the last round and
+    the constraint generation statistics.
+    """
+    start_time = time.perf_counter()
+    session = _lazy_ptdf_session(md, solver, ptdf_options)
+    build_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    _solve_session_model(session)
+    solve_time = time.perf_counter() - start_time
+
+    # Branches at their limits are monitored from the start next time
+    model, md_pu = session["model"], session["md"]
+    PTDF = model._PTDF
+    PFV, _, VA = PTDF.calculate_PFV(model)
+    session["ptdf_entry"]["binding"] = _branches_at_limit(PTDF, PFV)
+
+    # save results data to ModelData object, as solve_dcopf does
+    md_pu.data['system']['total_cost'] = pe.value(model.obj)
+    for name, gen in md_pu.elements(element_type='generator'):
+        gen['pg'] = pe.value(model.pg[name])
+    branches = dict(md_pu.elements(element_type='branch'))
+    for i, name in enumerate(PTDF.branches_keys):
+        branches[name]['pf'] = PFV[i]
+    for name in session["seeded_branches"]:
+        branches[name].pop('lazy', None)
+    buses = dict(md_pu.elements(element_type='bus'))
+    LMP = PTDF.calculate_LMP(model, model.dual, model.eq_p_balance)
+    for i, name in enumerate(PTDF.buses_keys):
+        buses[name]['lmp'] = LMP[i]
+        buses[name]['pl'] = pe.value(model.pl[name])
+        buses[name]['va'] = degrees(VA[i])
+    for name, dc_branch in md_pu.elements(element_type='dc_branch'):
+        dc_branch['pf'] = pe.value(model.dcpf[name])
+    tx_utils.unscale_ModelData_to_pu(md_pu, inplace=True)
+
+    return md_pu, session["results"], {
+        "solver": session["solver_name"],
+        "rounds": session["rounds"],
+        "initial_constraints": session["initial_constraints"],
+        "added_constraints": session["added_constraints"],
+        "monitored_branches": len(model._idx_monitored),
+        "branches": len(PTDF.branches_keys),
+        "binding_branches": len(session["ptdf_entry"]["binding"]),
+        "ptdf_cache_hit": session["ptdf_cache_hit"],
+        "build_time_s": build_time,
+        "solve_time_s": solve_time
+    }
+
+
 @mcp.tool()
 def solve_dc_opf(
     case_file: str,
     solver: str = "gurobi",
-    return_results: bool = True
+    return_results: bool = True,
+    lazy: bool = True,
+    ptdf_options: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """Solve a DC Optimal Power Flow problem using Egret
     
@@ -138,9 +648,16 @@ def solve_dc_opf(
         case_file: Path to the case file (can be Matpower or Egret JSON format)
         solver: Solver to use (default: gurobi)
         return_results: Whether to return detailed results (default: True)
+        lazy: Start the PTDF model without flow limits and add violated ones round
+            by round; PTDF matrices and binding branches are reused across solves
+            of the same topology. If False, every flow limit is in the model
+            (B-theta formulation) (default: True)
+        ptdf_options: Egret PTDF options for the lazy mode, e.g.
+            {"max_violations_per_iteration": 20}
     
     Returns:
-        Dict containing the solution results
+        Dict containing the solution results and, in lazy mode, the number of
+        rounds and added flow limits
     """
     try:
         # Completely capture both stdout and stderr
@@ -149,22 +666,28 @@ def solve_dc_opf(
         
         with redirect_stdout(f_out), redirect_stderr(f_err):
             # Load the case file
-            md = ModelData.read(case_file)
+            md, case_cache = _read_case(case_file)
             
-            # Solve DC OPF with solver_tee=False to silence solver output
-            md_sol, results = solve_dcopf(
-                md,
-                solver,
-                dcopf_model_generator=create_ptdf_dcopf_model,
-                return_results=return_results,
-                solver_tee=False  # Explicitly disable solver output
-            )
+            if lazy:
+                md_sol, results, lazy_stats = _solve_lazy_ptdf_dcopf(md, solver, ptdf_options)
+            else:
+                # Solve DC OPF with solver_tee=False to silence solver output
+                md_sol, results = solve_dcopf(
+                    md,
+                    solver,
+                    dcopf_model_generator=create_btheta_dcopf_model,
+                    return_results=True,
+                    solver_tee=False  # Explicitly disable solver output
+                )
         
         # Extract key results
         solution = {
             "status": "success",
-            "solution": md_sol.data
+            "solution": md_sol.data,
+            "case_cache": case_cache
         }
+        if lazy:
+            solution["lazy"] = lazy_stats
         
         if return_results:
             solution["solver_results"] = results
@@ -181,5 +704,501 @@ def solve_dc_opf(
             "message": str(e)
         }
 
+# Open OPF sessions, keyed by session id. Each holds the built Pyomo model and
+# the solver interface so that re-solves only update parameters.
+_opf_sessions: Dict[str, Dict[str, Any]] = {}
+
+_OPF_MODEL_GENERATORS = {"dc": create_ptdf_dcopf_model, "ac": create_psv_acopf_model}
+_DEFAULT_OPF_SOLVERS = {"dc": "gurobi", "ac": "ipopt"}
+
+# APPSI change checks that DC session solves do not need: updates only change load
+# values and generator bounds (update_vars) and the rounds only add flow limits
+_APPSI_DC_SKIPPED_CHECKS = ("check_for_new_or_removed_vars", "check_for_new_or_removed_params",
+                            "check_for_new_objective", "update_constraints", "update_params",
+                            "update_named_expressions", "update_objective")
+
+
+def _session_solver(solver: str) -> Any:
+    """Instantiate persistent solvers, which keep the model between solves; other solvers are passed by name."""
+    instance = po.SolverFactory(solver)
+    return instance if isinstance(instance, (PersistentSolver, AppsiPersistentSolver)) else solver
+
+
+def _new_session(case_file: Optional[str], formulation: str, model: pe.ConcreteModel, md_pu: ModelData,
+                 solver: str, solver_options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """State of a built OPF model and its solver between solves."""
+    bus_p_loads, _ = tx_utils.dict_of_bus_loads(dict(md_pu.elements(element_type='bus')),
+                                                dict(md_pu.elements(element_type='load')))
+    instance = _session_solver(solver)
+    if formulation == "dc" and isinstance(instance, AppsiPersistentSolver):
+        # Keep the (fixed) load variables as solver columns, so a load change is a bound
+        # change rather than re-adding every flow limit that contains the load
+        instance.update_config.treat_fixed_vars_as_params = False
+    return {
+        "case_file": case_file,
+        "formulation": formulation,
+        "model": model,
+        "md": md_pu,
+        "base_mva": md_pu.data['system']['baseMVA'],
+        "loaded_buses": {bus for bus, load in bus_p_loads.items() if load},
+        "solver": instance,
+        "solver_options": solver_options or {},
+        "solves": 0,
+        "instance_set": False,
+        "stale_constraints": ComponentSet(),
+        "stale_vars": ComponentSet(),
+        "fixed_var_constraints": None
+    }
+
+
+def _solve_session_model_once(session: Dict[str, Any]) -> str:
+    """Solve the model of a session, keeping the instance of persistent solvers.
+
+    Returns the termination condition.
+    """
+    model, solver = session["model"], session["solver"]
+    if isinstance(solver, AppsiPersistentSolver):
+        # APPSI solvers keep the instance and pick up changed bounds, fixed values and new constraints themselves
+        try:
+            results = solver.solve(model, options=session["solver_options"])
+        except RuntimeError:
+            # Hot starts from the previous basis can fail numerically after load changes
+            # (HiGHS reports a solve error); the second attempt starts without it
+            results = solver.solve(model, options=session["solver_options"])
+        session["results"] = results
+        condition = results.solver.termination_condition
+        if condition != po.TerminationCondition.optimal:
+            raise Exception('Problem encountered during solve, termination_condition {}'.format(condition))
+        return str(condition)
+    if isinstance(solver, PersistentSolver) and session["instance_set"]:
+        # Legacy persistent solvers substitute fixed variables (the loads) when a
+        # constraint is added, so constraints with changed loads are added again
+        for con in session["stale_constraints"]:
+            solver.remove_constraint(con)
+            solver.add_constraint(con)
+        for var in session["stale_vars"]:
+            solver.update_var(var)
+    session["stale_constraints"] = ComponentSet()
+    session["stale_vars"] = ComponentSet()
+    _, results = _solve_model(model, solver, solver_tee=False, solver_options=session["solver_options"],
+                              set_instance=not session["instance_set"])
+    session["instance_set"] = True
+    session["results"] = results
+    return str(results.solver.termination_condition)
+
+
+def _solve_session_model(session: Dict[str, Any]) -> str:
+    """Solve the model of a session. DC models are Egret's lazy PTDF models, so
+    violated flow limits are added and the model is re-solved until none remain;
+    the added limits stay in the model for later re-solves.
+
+    Returns the termination condition; the number of solves and added limits
+    are kept in the session.
+    """
+    session["rounds"], session["added_constraints"] = 1, 0
+    if session["formulation"] != "dc":
+        return _solve_session_model_once(session)
+    model, solver = session["model"], session["solver"]
+    # Re-evaluating the load terms of every (dense) flow limit dominates APPSI solves otherwise
+    config = solver.update_config if isinstance(solver, AppsiPersistentSolver) else None
+    saved = {name: getattr(config, name) for name in _APPSI_DC_SKIPPED_CHECKS} if config else {}
+    try:
+        for name in saved:
+            setattr(config, name, False)
+        termination = _solve_session_model_once(session)
+        for _ in range(model._ptdf_options['iteration_limit']):
+            added = _add_violated_flow_limits(model, session["md"], solver)
+            if not added:
+                break
+            session["rounds"] += 1
+            session["added_constraints"] += added
+            # The new flow limits contain the load variables as well
+            session["fixed_var_constraints"] = None
+            termination = _solve_session_model_once(session)
+    finally:
+        for name, value in saved.items():
+            setattr(config, name, value)
+    return termination
+
+
+def _update_session_model(session: Dict[str, Any], loads: Optional[Dict[str, Any]],
+                          generators: Optional[Dict[str, Dict[str, float]]]) -> int:
+    """Apply load and generator limit changes (in MW/MVAr) to the model of a session.
+
+    Returns the number of changed model variables.
+    """
+    model, md, base_mva = session["model"], session["md"], session["base_mva"]
+    load_dicts = dict(md.elements(element_type='load'))
+    changed = ComponentSet()
+
+    for name, update in (loads or {}).items():
+        if name not in load_dicts:
+            raise KeyError(f"Unknown load '{name}'")
+        for attr, val in (update if isinstance(update, dict) else {"p_load": update}).items():
+            if attr not in ("p_load", "q_load"):
+                raise ValueError(f"Unsupported load attribute '{attr}', expected p_load or q_load")
+            load_dicts[name][attr] = val / base_mva
+    if loads:
+        bus_p_loads, bus_q_loads = tx_utils.dict_of_bus_loads(dict(md.elements(element_type='bus')), load_dicts)
+        for bus in {load_dicts[name]['bus'] for name in loads}:
+            # The model only contains the load variables of buses that had a load when it was built
+            if bus not in session["loaded_buses"]:
+                raise ValueError(f"Bus '{bus}' had no load when the session was created; create a new session")
+            for var, total in ((model.pl, bus_p_loads), (getattr(model, "ql", None), bus_q_loads)):
+                if var is not None and var[bus].value != total[bus]:
+                    var[bus].fix(total[bus])
+                    changed.add(var[bus])
+
+    gen_vars = {"p_min": "pg", "p_max": "pg", "q_min": "qg", "q_max": "qg"}
+    for name, update in (generators or {}).items():
+        if name not in model.pg:
+            raise KeyError(f"Unknown generator '{name}'")
+        for attr, val in update.items():
+            if attr not in gen_vars or not hasattr(model, gen_vars[attr]):
+                raise ValueError(f"Unsupported generator attribute '{attr}'")
+            var = getattr(model, gen_vars[attr])[name]
+            (var.setlb if attr.endswith("min") else var.setub)(val / base_mva)
+            session["stale_vars"].add(var)
+            changed.add(var)
+
+    if changed and isinstance(session["solver"], PersistentSolver):
+        if session["fixed_var_constraints"] is None:
+            usage = ComponentMap()
+            for con in model.component_data_objects(pe.Constraint, active=True, descend_into=True):
+                for var in identify_variables(con.body, include_fixed=True):
+                    if var.fixed:
+                        usage.setdefault(var, []).append(con)
+            session["fixed_var_constraints"] = usage
+        for var in changed:
+            session["stale_constraints"].update(session["fixed_var_constraints"].get(var, []))
+    return len(changed)
+
+
+def _session_results(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the cost, dispatch (MW) and LMPs ($/MWh) from the solved model of a session."""
+    model, base_mva = session["model"], session["base_mva"]
+    results = {"total_cost": pe.value(model.obj),
+               "dispatch": {gen: pe.value(model.pg[gen]) * base_mva for gen in model.pg}}
+    if session["formulation"] == "dc":
+        ptdf = model._PTDF
+        lmp = dict(zip(ptdf.buses_keys, ptdf.calculate_LMP(model, model.dual, model.eq_p_balance)))
+        results["monitored_branches"] = len(model._idx_monitored)
+        results["rounds"] = session["rounds"]
+        results["added_constraints"] = session["added_constraints"]
+    else:
+        lmp = {bus: model.dual[model.eq_p_balance[bus]] for bus in model.eq_p_balance}
+    results["lmp"] = {bus: float(price) / base_mva for bus, price in lmp.items()}
+    return results
+
+
+@mcp.tool()
+def create_opf_session(
+    case_file: str,
+    formulation: str = "dc",
+    solver: Optional[str] = None,
+    solver_options: Optional[Dict[str, Any]] = None,
+    session_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build an OPF model once, solve it and keep it in memory for re-solves
+    
+    Args:
+        case_file: Path to the case file (can be Matpower or Egret JSON format)
+        formulation: "dc" (PTDF DC OPF) or "ac" (polar AC OPF) (default: dc)
+        solver: Solver to use (default: gurobi for dc, ipopt for ac). Persistent
+            interfaces such as gurobi_persistent or appsi_highs also keep the
+            solver instance between re-solves
+        solver_options: Options passed to the solver
+        session_id: Name of the session (default: <case file name>:<formulation>)
+    
+    Returns:
+        Dict containing the session id, build and solve times and the solution
+    """
+    try:
+        if formulation not in _OPF_MODEL_GENERATORS:
+            raise ValueError(f"Unknown formulation '{formulation}', expected 'dc' or 'ac'")
+        session_id = session_id or f"{os.path.basename(case_file)}:{formulation}"
+        f_out = io.StringIO()
+        f_err = io.StringIO()
+
+        with redirect_stdout(f_out), redirect_stderr(f_err):
+            md, case_cache = _read_case(case_file)
+            start_time = time.perf_counter()
+            model, md_pu = _OPF_MODEL_GENERATORS[formulation](md)
+            model.dual = pe.Suffix(direction=pe.Suffix.IMPORT)
+            build_time = time.perf_counter() - start_time
+            session = _new_session(case_file, formulation, model, md_pu,
+                                   solver or _DEFAULT_OPF_SOLVERS[formulation], solver_options)
+            start_time = time.perf_counter()
+            termination = _solve_session_model(session)
+            solve_time = time.perf_counter() - start_time
+            session["solves"] = 1
+        _opf_sessions[session_id] = session
+
+        return {
+            "status": "success",
+            "session_id": session_id,
+            "termination_condition": termination,
+            "build_time_s": build_time,
+            "solve_time_s": solve_time,
+            "persistent_solver": not isinstance(session["solver"], str),
+            "case_cache": case_cache,
+            **_session_results(session),
+            "stdout": f_out.getvalue(),
+            "stderr": f_err.getvalue()
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+@mcp.tool()
+def resolve_opf_session(
+    session_id: str,
+    loads: Optional[Dict[str, Any]] = None,
+    generators: Optional[Dict[str, Dict[str, float]]] = None
+) -> Dict[str, Any]:
+    """Update loads and generator limits of an OPF session and re-solve its model
+    
+    Args:
+        session_id: Session created by create_opf_session
+        loads: New loads by load name, in MW ({"load_2": 25.0}) or as
+            {"p_load": MW, "q_load": MVAr}
+        generators: New limits by generator name, e.g. {"1": {"p_max": 200.0}}
+            (p_min, p_max, q_min, q_max in MW/MVAr)
+    
+    Returns:
+        Dict containing the update and solve times and the solution
+    """
+    try:
+        session = _opf_sessions.get(session_id)
+        if session is None:
+            raise KeyError(f"No OPF session '{session_id}'. Open sessions: {sorted(_opf_sessions)}")
+        f_out = io.StringIO()
+        f_err = io.StringIO()
+
+        with redirect_stdout(f_out), redirect_stderr(f_err):
+            start_time = time.perf_counter()
+            changed = _update_session_model(session, loads, generators)
+            update_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            termination = _solve_session_model(session)
+            solve_time = time.perf_counter() - start_time
+            session["solves"] += 1
+
+        return {
+            "status": "success",
+            "session_id": session_id,
+            "termination_condition": termination,
+            "changed_variables": changed,
+            "update_time_s": update_time,
+            "solve_time_s": solve_time,
+            "solves": session["solves"],
+            **_session_results(session),
+            "stdout": f_out.getvalue(),
+            "stderr": f_err.getvalue()
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+@mcp.tool()
+def close_opf_session(session_id: str) -> Dict[str, Any]:
+    """Close an OPF session and release its model and solver
+    
+    Args:
+        session_id: Session created by create_opf_session
+    
+    Returns:
+        Dict containing the number of solves of the session
+    """
+    session = _opf_sessions.pop(session_id, None)
+    if session is None:
+        return {
+            "status": "error",
+            "message": f"No OPF session '{session_id}'"
+        }
+    return {
+        "status": "success",
+        "session_id": session_id,
+        "solves": session["solves"]
+    }
+
+# Scenario session of the batch DC OPF workers, built once per worker process
+_worker_scenario_state = None
+
+
+def _scenario_state(md: ModelData, solver: str, ptdf_options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Lazy PTDF DC OPF session of a base case with its loads and generator limits in MW.
+
+    Scenarios are applied as differences from the values currently in the model,
+    so flow limits added for one scenario stay available to the next.
+    """
+    session = _lazy_ptdf_session(md, solver, ptdf_options)
+    md_pu, base_mva = session["md"], session["base_mva"]
+    loads = {name: load['p_load'] * base_mva for name, load in md_pu.elements(element_type='load')}
+    generators = {name: {"p_min": gen['p_min'] * base_mva, "p_max": gen['p_max'] * base_mva}
+                  for name, gen in md_pu.elements(element_type='generator') if name in session["model"].pg}
+    return {
+        "session": session,
+        "load_buses": {name: load['bus'] for name, load in md_pu.elements(element_type='load')},
+        "base_loads": loads,
+        "base_generators": generators,
+        "loads": dict(loads),
+        "generators": {name: dict(limits) for name, limits in generators.items()}
+    }
+
+
+def _solve_scenario(state: Dict[str, Any], scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a scenario to the base case of a scenario session, re-solve it and summarize the solution."""
+    try:
+        session = state["session"]
+        scale = scenario.get("load_scale", 1.0)
+        loads = {name: load * scale for name, load in state["base_loads"].items()}
+        for name, load in (scenario.get("loads") or {}).items():
+            if name not in loads:
+                raise KeyError(f"Unknown load '{name}'")
+            if state["load_buses"][name] not in session["loaded_buses"]:
+                raise ValueError(f"Load '{name}' is at a bus without load in the base case")
+            loads[name] = load
+        generators = {name: dict(limits) for name, limits in state["base_generators"].items()}
+        for name, update in (scenario.get("generators") or {}).items():
+            if name not in generators:
+                raise KeyError(f"Unknown generator '{name}'")
+            for attr, val in update.items():
+                if attr not in ("p_min", "p_max"):
+                    raise ValueError(f"Unsupported generator attribute '{attr}', expected p_min or p_max")
+                generators[name][attr] = val
+
+        # Only changes with respect to the previous scenario touch the model
+        _update_session_model(
+            session,
+            {name: load for name, load in loads.items() if load != state["loads"][name]},
+            {name: {attr: val for attr, val in limits.items() if val != state["generators"][name][attr]}
+             for name, limits in generators.items() if limits != state["generators"][name]})
+        state["loads"], state["generators"] = loads, generators
+
+        start_time = time.perf_counter()
+        termination = _solve_session_model(session)
+        solve_time = time.perf_counter() - start_time
+
+        model = session["model"]
+        PFV, _, _ = model._PTDF.calculate_PFV(model)
+        lmp = np.array(list(_session_results(session)["lmp"].values()))
+        return {
+            "name": scenario["name"],
+            "status": "success",
+            "termination_condition": termination,
+            "total_cost": pe.value(model.obj),
+            "lmp_min": float(lmp.min()),
+            "lmp_mean": float(lmp.mean()),
+            "lmp_max": float(lmp.max()),
+            "binding_branches": _branches_at_limit(model._PTDF, PFV),
+            "rounds": session["rounds"],
+            "added_constraints": session["added_constraints"],
+            "solve_time_s": solve_time
+        }
+
+    except Exception as e:
+        return {
+            "name": scenario["name"],
+            "status": "error",
+            "message": str(e)
+        }
+
+
+def _init_scenario_worker(case_data: bytes, solver: str, ptdf_options: Optional[Dict[str, Any]]) -> None:
+    """Build the scenario session (and its PTDF matrix) once per worker process."""
+    global _worker_scenario_state
+    # Worker output must not reach the server's stdout, which carries the MCP transport
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    _worker_scenario_state = _scenario_state(ModelData(pickle.loads(case_data)), solver, ptdf_options)
+
+
+def _solve_scenario_chunk(scenarios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Solve a chunk of scenarios on the session of the current worker process."""
+    return [_solve_scenario(_worker_scenario_state, scenario) for scenario in scenarios]
+
+
+@mcp.tool()
+def solve_dc_opf_scenarios(
+    case_file: str,
+    scenarios: List[Dict[str, Any]],
+    solver: str = "gurobi",
+    workers: int = 1,
+    ptdf_options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Solve DC OPF scenarios of a base case with a shared PTDF model
+    
+    The lazy PTDF model of the base case is built once (per worker process) and
+    every scenario only updates its loads and generator limits before being
+    re-solved, keeping the flow limits found for earlier scenarios.
+    
+    Args:
+        case_file: Path to the base case file (can be Matpower or Egret JSON format)
+        scenarios: Scenario deltas with respect to the base case, e.g.
+            {"name": "peak", "load_scale": 1.1, "loads": {"load_2": 25.0},
+            "generators": {"wind_1": {"p_max": 40.0}}}. Loads are in MW and
+            override the scaled load; generator p_min/p_max (MW) can model
+            renewable availability
+        solver: Solver to use (default: gurobi); its persistent interface is used if available
+        workers: Number of worker processes, each building the model once (0 uses all cores)
+        ptdf_options: Options for Egret's PTDF model, e.g. {"rel_ptdf_tol": 1e-6}
+    
+    Returns:
+        Dict containing per scenario the cost, LMP minimum/mean/maximum, the
+        branches at their flow limit and the constraint generation rounds
+    """
+    try:
+        if workers < 0:
+            raise ValueError("workers must be 0 (all cores) or a positive number")
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        scenarios = [{"name": f"scenario_{i}", **scenario} for i, scenario in enumerate(scenarios)]
+        start_time = time.perf_counter()
+        f_out = io.StringIO()
+        f_err = io.StringIO()
+
+        with redirect_stdout(f_out), redirect_stderr(f_err):
+            md, case_cache = _read_case(case_file)
+            if workers > 1 and len(scenarios) > 1:
+                # The PTDF factorization cannot be pickled, so every worker builds its own model
+                chunk_size = max(1, math.ceil(len(scenarios) / (workers * 4)))
+                chunks = [scenarios[i:i + chunk_size] for i in range(0, len(scenarios), chunk_size)]
+                case_data = _case_cache[os.path.abspath(case_file)]["data"]
+                ctx = multiprocessing.get_context("spawn")
+                with ctx.Pool(min(workers, len(chunks)), initializer=_init_scenario_worker,
+                              initargs=(case_data, solver, ptdf_options)) as pool:
+                    table = [row for rows in pool.map(_solve_scenario_chunk, chunks) for row in rows]
+                build_time = None
+            else:
+                workers = 1
+                build_start = time.perf_counter()
+                state = _scenario_state(md, solver, ptdf_options)
+                build_time = time.perf_counter() - build_start
+                table = [_solve_scenario(state, scenario) for scenario in scenarios]
+
+        return {
+            "status": "success",
+            "scenarios": table,
+            "failed": sum(row["status"] != "success" for row in table),
+            "workers": workers,
+            "build_time_s": build_time,
+            "total_time_s": time.perf_counter() - start_time,
+            "case_cache": case_cache,
+            "stdout": f_out.getvalue(),
+            "stderr": f_err.getvalue()
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
 if __name__ == "__main__":
     mcp.run(transport="stdio") 
\ No newline at end of file
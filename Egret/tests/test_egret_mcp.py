@@ -0,0 +1,267 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import egret_mcp
+import pyomo.environ as pe
+from egret.data import ptdf_utils
+from egret.data.model_data import ModelData
+from egret.models.acopf import create_psv_acopf_model
+from egret.models.dcopf import solve_dcopf, create_ptdf_dcopf_model
+
+CASE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pglib_opf_case14_ieee.m")
+
+
+class TestCaseCache(unittest.TestCase):
+    """
+    Check that case files are parsed once and every request gets a private copy.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, os.path.basename(CASE_FILE))
+        shutil.copy(CASE_FILE, self.path)
+        egret_mcp._case_cache.clear()
+
+    def tearDown(self):
+        egret_mcp._case_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def test_parse_once(self):
+        md, first = egret_mcp._read_case(self.path)
+        self.assertFalse(first["hit"])
+        self.assertEqual(len(md.data["elements"]["bus"]), 14)
+        _, second = egret_mcp._read_case(self.path)
+        self.assertTrue(second["hit"])
+        self.assertEqual(second["hits"] - first["hits"], 1)
+        self.assertEqual(second["misses"], first["misses"])
+
+    def test_private_copies(self):
+        md, _ = egret_mcp._read_case(self.path)
+        md.data["elements"]["load"]["load_2"]["p_load"] = 0.0
+        md, _ = egret_mcp._read_case(self.path)
+        self.assertEqual(md.data["elements"]["load"]["load_2"]["p_load"], 21.7)
+
+    def test_touched_and_modified_file(self):
+        egret_mcp._read_case(self.path)
+        # Same contents with a new mtime is still a hit
+        os.utime(self.path, ns=(0, 0))
+        _, info = egret_mcp._read_case(self.path)
+        self.assertTrue(info["hit"])
+        with open(self.path) as f:
+            contents = f.read()
+        with open(self.path, "w") as f:
+            f.write(contents.replace("2\t 2\t 21.7", "2\t 2\t 31.7"))
+        md, info = egret_mcp._read_case(self.path)
+        self.assertFalse(info["hit"])
+        self.assertEqual(md.data["elements"]["load"]["load_2"]["p_load"], 31.7)
+
+
+@unittest.skipUnless(pe.SolverFactory("appsi_highs").available(exception_flag=False), "HiGHS is not available")
+class TestOpfSession(unittest.TestCase):
+    """
+    Check that re-solving a session matches a DC OPF built from the updated case.
+    """
+
+    def setUp(self):
+        egret_mcp._opf_sessions.clear()
+
+    def tearDown(self):
+        egret_mcp._opf_sessions.clear()
+
+    def test_resolve_matches_rebuild(self):
+        result = egret_mcp.create_opf_session(CASE_FILE, "dc", solver="appsi_highs", session_id="case14")
+        self.assertEqual(result["status"], "success")
+        self.assertTrue(result["persistent_solver"])
+
+        result = egret_mcp.resolve_opf_session("case14", loads={"load_2": 21.7 * 1.1},
+                                               generators={"1": {"p_max": 250.0}})
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["changed_variables"], 2)
+
+        md = ModelData.read(CASE_FILE)
+        md.data["elements"]["load"]["load_2"]["p_load"] = 21.7 * 1.1
+        md.data["elements"]["generator"]["1"]["p_max"] = 250.0
+        md = solve_dcopf(md, "highs", dcopf_model_generator=create_ptdf_dcopf_model, solver_tee=False)
+        self.assertAlmostEqual(result["total_cost"], md.data["system"]["total_cost"], places=4)
+        for name, gen in md.elements(element_type="generator"):
+            self.assertAlmostEqual(result["dispatch"][name], gen["pg"], places=4)
+        for name, bus in md.elements(element_type="bus"):
+            self.assertAlmostEqual(result["lmp"][name], bus["lmp"], places=4)
+
+    def test_errors_and_close(self):
+        egret_mcp.create_opf_session(CASE_FILE, "dc", solver="appsi_highs", session_id="case14")
+        self.assertEqual(egret_mcp.resolve_opf_session("case14", loads={"load_99": 1.0})["status"], "error")
+        self.assertEqual(egret_mcp.resolve_opf_session("case14", generators={"1": {"cost": 1.0}})["status"], "error")
+        self.assertEqual(egret_mcp.close_opf_session("case14")["status"], "success")
+        self.assertEqual(egret_mcp.resolve_opf_session("case14")["status"], "error")
+
+
+@unittest.skipUnless(pe.SolverFactory("highs").available(exception_flag=False), "HiGHS is not available")
+class TestLazyDcOpf(unittest.TestCase):
+    """
+    Check the lazy PTDF DC OPF against the full model and the reuse of its topology cache.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "case14_congested.json")
+        md = ModelData.read(CASE_FILE)
+        md.data["elements"]["branch"]["1"]["rating_long_term"] = 150.0
+        md.write(self.path)
+        egret_mcp._ptdf_cache.clear()
+
+    def tearDown(self):
+        egret_mcp._ptdf_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def test_matches_full_model(self):
+        lazy = egret_mcp.solve_dc_opf(self.path, "highs", return_results=False)
+        full = egret_mcp.solve_dc_opf(self.path, "highs", return_results=False, lazy=False)
+        self.assertEqual(lazy["status"], "success")
+        self.assertAlmostEqual(lazy["solution"]["system"]["total_cost"],
+                               full["solution"]["system"]["total_cost"], places=4)
+        for name, bus in full["solution"]["elements"]["bus"].items():
+            self.assertAlmostEqual(lazy["solution"]["elements"]["bus"][name]["lmp"], bus["lmp"], places=4)
+        self.assertEqual(lazy["lazy"]["rounds"], 2)
+        self.assertEqual(lazy["lazy"]["added_constraints"], lazy["lazy"]["monitored_branches"])
+        self.assertFalse(lazy["lazy"]["ptdf_cache_hit"])
+
+    def test_binding_branches_seed_next_solve(self):
+        first = egret_mcp.solve_dc_opf(self.path, "highs", return_results=False)
+        second = egret_mcp.solve_dc_opf(self.path, "highs", return_results=False)
+        self.assertTrue(second["lazy"]["ptdf_cache_hit"])
+        self.assertEqual(second["lazy"]["initial_constraints"], first["lazy"]["binding_branches"])
+        self.assertEqual(second["lazy"]["rounds"], 1)
+        self.assertAlmostEqual(second["solution"]["system"]["total_cost"],
+                               first["solution"]["system"]["total_cost"], places=6)
+        self.assertFalse(any("lazy" in branch for branch in second["solution"]["elements"]["branch"].values()))
+
+    def test_model_on_cached_ptdf_matches_egret_model(self):
+        md = ModelData.read(self.path)
+        ptdf_options = {"lazy": True}
+        reference, _ = create_ptdf_dcopf_model(md, ptdf_options=ptdf_options)
+        model, _ = egret_mcp._create_lazy_ptdf_dcopf_model(md, ptdf_options, reference._PTDF)
+        self.assertIs(model._PTDF, reference._PTDF)
+        self.assertEqual(model._ptdf_options, reference._ptdf_options)
+        for ctype in (pe.Var, pe.Constraint, pe.Expression, pe.Objective):
+            self.assertEqual({c.name: len(c) for c in reference.component_objects(ctype)},
+                             {c.name: len(c) for c in model.component_objects(ctype)})
+        self.assertEqual(str(reference.obj.expr), str(model.obj.expr))
+
+    def test_cache_hit_does_not_factorize(self):
+        factorize = ptdf_utils.VirtualPTDFMatrix._calculate_ptdf_factorization
+        with patch.object(ptdf_utils.VirtualPTDFMatrix, "_calculate_ptdf_factorization",
+                          autospec=True, side_effect=factorize) as counter:
+            first = egret_mcp.solve_dc_opf(self.path, "highs", return_results=False)
+            self.assertEqual(counter.call_count, 1)
+            second = egret_mcp.solve_dc_opf(self.path, "highs", return_results=False)
+            self.assertEqual(counter.call_count, 1)
+        self.assertTrue(second["lazy"]["ptdf_cache_hit"])
+        self.assertIsInstance(ptdf_utils.VirtualPTDFMatrix, type)
+        self.assertAlmostEqual(second["solution"]["system"]["total_cost"],
+                               first["solution"]["system"]["total_cost"], places=6)
+
+
+@unittest.skipUnless(pe.SolverFactory("appsi_highs").available(exception_flag=False), "HiGHS is not available")
+@unittest.skipUnless(pe.SolverFactory("highs").available(exception_flag=False), "HiGHS is not available")
+class TestDcOpfScenarios(unittest.TestCase):
+    """
+    Check batch DC OPF scenarios against solves of the modified cases.
+    """
+
+    SCENARIOS = [
+        {"name": "base"},
+        {"name": "gen_1_derated", "generators": {"1": {"p_max": 200.0}}},
+        {"name": "load_2_up", "load_scale": 0.95, "loads": {"load_2": 40.0}},
+        {"name": "unknown_load", "loads": {"load_x": 10.0}},
+    ]
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "case14_congested.json")
+        md = ModelData.read(CASE_FILE)
+        md.data["elements"]["branch"]["1"]["rating_long_term"] = 150.0
+        md.write(self.path)
+        egret_mcp._ptdf_cache.clear()
+
+    def tearDown(self):
+        egret_mcp._ptdf_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def _solve_modified_case(self, scenario):
+        md = ModelData.read(self.path)
+        for name, load in md.elements(element_type="load"):
+            load["p_load"] = scenario.get("loads", {}).get(name, load["p_load"] * scenario.get("load_scale", 1.0))
+        for name, limits in scenario.get("generators", {}).items():
+            md.data["elements"]["generator"][name].update(limits)
+        path = os.path.join(self.tmp_dir.name, scenario["name"] + ".json")
+        md.write(path)
+        return egret_mcp.solve_dc_opf(path, "highs", return_results=False, lazy=False)["solution"]
+
+    def _check_table(self, result):
+        self.assertEqual(result["status"], "success")
+        self.assertEqual([row["name"] for row in result["scenarios"]], [s["name"] for s in self.SCENARIOS])
+        self.assertEqual(result["failed"], 1)
+        for scenario, row in zip(self.SCENARIOS[:-1], result["scenarios"]):
+            solution = self._solve_modified_case(scenario)
+            lmps = [bus["lmp"] for bus in solution["elements"]["bus"].values()]
+            self.assertEqual(row["status"], "success")
+            self.assertAlmostEqual(row["total_cost"], solution["system"]["total_cost"], places=4)
+            self.assertAlmostEqual(row["lmp_min"], min(lmps), places=4)
+            self.assertAlmostEqual(row["lmp_max"], max(lmps), places=4)
+        self.assertEqual(result["scenarios"][0]["binding_branches"], ["1"])
+        self.assertEqual(result["scenarios"][1]["binding_branches"], [])
+        self.assertEqual(result["scenarios"][-1]["status"], "error")
+        self.assertIn("load_x", result["scenarios"][-1]["message"])
+
+    def test_scenarios_match_modified_cases(self):
+        self._check_table(egret_mcp.solve_dc_opf_scenarios(self.path, self.SCENARIOS, "appsi_highs"))
+
+    def test_worker_processes(self):
+        result = egret_mcp.solve_dc_opf_scenarios(self.path, self.SCENARIOS, "appsi_highs", workers=2)
+        self.assertEqual(result["workers"], 2)
+        self._check_table(result)
+
+
+class TestAcWarmStart(unittest.TestCase):
+    """
+    Check the initial points of warm-started AC OPF solves.
+    """
+
+    def setUp(self):
+        egret_mcp._ac_solutions.clear()
+
+    def tearDown(self):
+        egret_mcp._ac_solutions.clear()
+
+    @unittest.skipUnless(pe.SolverFactory("highs").available(exception_flag=False), "HiGHS is not available")
+    def test_dc_start_is_consistent(self):
+        md, _ = egret_mcp._read_case(CASE_FILE)
+        model, _ = create_psv_acopf_model(md)
+        egret_mcp._set_dc_start(model, md, "highs")
+        # Power flows from the slack bus to the loads
+        self.assertTrue(all(model.va[bus].value <= 0.0 for bus in model.va))
+        self.assertGreater(model.pf["1"].value, 0.0)
+        for _, con_name in egret_mcp._AC_DEFINED_VARS:
+            for con in getattr(model, con_name).values():
+                self.assertAlmostEqual(pe.value(con.body), pe.value(con.upper), places=8)
+
+    @unittest.skipUnless(pe.SolverFactory("ipopt").available(exception_flag=False), "ipopt is not available")
+    def test_warm_start_from_ac_solution(self):
+        cold = egret_mcp.solve_ac_opf(CASE_FILE, return_results=False)
+        self.assertEqual(cold["status"], "success")
+        warm = egret_mcp.solve_ac_opf(CASE_FILE, return_results=False, warm_start="ac")
+        self.assertEqual(warm["warm_start"]["start"], "ac")
+        self.assertAlmostEqual(warm["objective_value"], cold["objective_value"], places=2)
+        self.assertLess(warm["warm_start"]["iterations"], cold["warm_start"]["iterations"])
+        self.assertEqual(warm["warm_start"]["cold_start"]["iterations"], cold["warm_start"]["iterations"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,29 @@
 import sys
 import os
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import tempfile
+import time
+from collections import OrderedDict
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from mcp.server.fastmcp import FastMCP
 from pypsa import Network
+from pypsa.clustering.spatial import busmap_by_hac, busmap_by_kmeans, get_clustering_from_busmap
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Union, Any
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+import xarray as xr
+from typing import Dict, List, Optional, Tuple, Union, Any
+
+try:
+    from sklearn.cluster import KMeans
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
 
 
 def _to_serializable(obj: Any) -> Any:
@@ -25,6 +43,101 @@ def _to_serializable(obj: Any) -> Any:
     return obj
 
 
+logger = logging.getLogger(__name__)
+
+# Networks read from NetCDF files, keyed by absolute path, least recently used first.
+# Entries are reused while the file's mtime and size are unchanged.
+_network_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0}
+
+# Memory budget of the network cache in MB
+_MAX_CACHE_MB = float(os.environ.get("PYPSA_MCP_CACHE_MB", 2048))
+
+
+def _network_memory_bytes(network: Network) -> int:
+    """Estimate the memory used by the static and time-varying tables of a network."""
+    total = 0
+    for component in network.iterate_components():
+        total += component.df.memory_usage(deep=True).sum()
+        total += sum(df.memory_usage(deep=True).sum() for df in component.pnl.values())
+    return int(total)
+
+
+def _cache_network(path: str, network: Network, load_time: float = 0.0) -> None:
+    """Store a network as the current version of the file at path and evict old entries."""
+    stat = os.stat(path)
+    _network_cache[path] = {
+        "network": network,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "memory_bytes": _network_memory_bytes(network),
+        "load_time_s": load_time
+    }
+    _network_cache.move_to_end(path)
+    total = sum(entry["memory_bytes"] for entry in _network_cache.values())
+    # The newest entry is always kept, even if it exceeds the budget on its own
+    while total > _MAX_CACHE_MB * 1024 ** 2 and len(_network_cache) > 1:
+        _, evicted = _network_cache.popitem(last=False)
+        total -= evicted["memory_bytes"]
+
+
+def _get_network(network_name: str, copy: bool = False) -> Network:
+    """Get a network from the cache, reading the NetCDF file only if it changed.
+
+    The cached network is shared between tool calls and must not be modified.
+    Tools that modify the network (including running power flows or
+    optimizations, which write results) pass copy=True to get a private copy.
+    """
+    path = os.path.abspath(network_name)
+    stat = os.stat(path)
+    entry = _network_cache.get(path)
+    if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+        _cache_stats["misses"] += 1
+        start_time = time.perf_counter()
+        network = Network(path)
+        _cache_network(path, network, time.perf_counter() - start_time)
+        entry = _network_cache[path]
+    else:
+        _cache_stats["hits"] += 1
+        _network_cache.move_to_end(path)
+    return entry["network"].copy() if copy else entry["network"]
+
+
+def _save_network(network: Network, network_name: str) -> None:
+    """Write a network to NetCDF and keep it in the cache as the new version of the file."""
+    network.export_to_netcdf(network_name)
+    _cache_network(os.path.abspath(network_name), network)
+
+
+# Open edit sessions, keyed by absolute path. Changes are applied to the
+# session's network and written to the file once on commit.
+_edit_sessions: Dict[str, Dict[str, Any]] = {}
+
+
+def _open_for_edit(network_name: str) -> Tuple[Network, bool]:
+    """Get the network to modify: the open edit session's network or a copy of the cached one."""
+    session = _edit_sessions.get(os.path.abspath(network_name))
+    if session is not None:
+        return session["network"], True
+    return _get_network(network_name, copy=True), False
+
+
+def _finish_edit(network: Network, network_name: str, in_session: bool, changes: int = 1) -> str:
+    """Write an edited network, or record the changes if an edit session is open."""
+    if in_session:
+        _edit_sessions[os.path.abspath(network_name)]["changes"] += changes
+        return " (pending commit)"
+    _save_network(network, network_name)
+    return ""
+
+
+def _add_many(network: Network, class_name: str, names: List[str], **attrs) -> None:
+    """Add several components of one class in a single vectorized call."""
+    # madd was folded into add in PyPSA 1.0, which accepts lists of names
+    add = network.madd if hasattr(network, "madd") else network.add
+    add(class_name, names, **attrs)
+
+
 # Create an MCP server
 mcp = FastMCP("PyPSA-MCP")
 
@@ -34,7 +147,7 @@ mcp = FastMCP("PyPSA-MCP")
 @mcp.tool()
 def get_network_info(network_name: str) -> Dict[str, Any]:
     """Get basic information about the network"""
-    network = Network(network_name)
+    network = _get_network(network_name)
     info = {
         "buses": len(network.buses),
         "generators": len(network.generators),
@@ -51,7 +164,7 @@ def get_network_info(network_name: str) -> Dict[str, Any]:
 def load_network(file_path: str) -> Dict[str, Any]:
     """Load a PyPSA network from a NetCDF (.nc) file"""
     try:
-        network = Network(file_path)
+        network = _get_network(file_path)
         info = {
             "buses": len(network.buses),
             "generators": len(network.generators),
@@ -71,21 +184,224 @@ def load_network(file_path: str) -> Dict[str, Any]:
             "message": f"Failed to load network: {str(e)}"
         }
 
+# Snapshots returned per get_results page by default
+_RESULT_PAGE_SIZE = 100
+
+
+def _write_result_store(network: Network, output_dir: str) -> Dict[str, Any]:
+    """Write the non-empty output time series of all components to NetCDF.
+
+    Each series is written to <output_dir>/<component>/<attr>.nc as a
+    compressed (snapshot x id) array, chunked along snapshots so that
+    get_results reads only the chunks of the requested page. Returns the
+    file, shape and summary statistics of each series.
+    """
+    store: Dict[str, Any] = {}
+    snapshots = network.snapshots
+    if isinstance(snapshots, pd.MultiIndex):
+        snapshots = pd.Index([" ".join(map(str, s)) for s in snapshots])
+    for component in network.iterate_components():
+        outputs = component.attrs.index[component.attrs.status.str.startswith("Output")]
+        for attr, df in component.pnl.items():
+            if attr not in outputs or df.empty:
+                continue
+            values = df.to_numpy(dtype=np.float64)
+            path = os.path.join(output_dir, component.list_name, f"{attr}.nc")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = xr.DataArray(values, dims=("snapshot", "id"), name=attr,
+                                coords={"snapshot": snapshots.values, "id": df.columns.astype(str).values})
+            chunks = (min(len(snapshots), _RESULT_PAGE_SIZE), max(1, min(values.shape[1], 1024)))
+            data.to_netcdf(path, encoding={attr: {"zlib": True, "complevel": 4, "chunksizes": chunks}})
+            finite = values[np.isfinite(values)]
+            store.setdefault(component.list_name, {})[attr] = {
+                "file": path,
+                "shape": list(values.shape),
+                "min": float(finite.min()) if finite.size else None,
+                "max": float(finite.max()) if finite.size else None,
+                "mean": float(finite.mean()) if finite.size else None,
+            }
+    return store
+
+
+# Network solved by the power flow batch workers, loaded once per worker process
+_worker_pf_network = None
+
+# Snapshots per AC power flow call within a batch. Every call has a fixed
+# overhead, so seeding each snapshot individually is slower than a flat start.
+_PF_SEED_BLOCK = 16
+
+
+def _init_pf_worker(network_name: str) -> None:
+    """Load the network once per worker process."""
+    global _worker_pf_network
+    # Worker output must not reach the server's stdout, which carries the MCP transport
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    _worker_pf_network = Network(network_name)
+
+
+def _solve_pf_batch(network: Network, start: int, stop: int, linear: bool) -> Dict[str, Any]:
+    """Solve the power flow of a contiguous batch of snapshots.
+
+    AC snapshots are solved in blocks of _PF_SEED_BLOCK, each block seeded
+    with the voltages of the solved snapshot just before it; only the first
+    block of the batch starts flat. Returns the output series of the batch as
+    arrays with per-snapshot convergence, iteration counts and mismatch.
+    """
+    snapshots = network.snapshots[start:stop]
+    n_iter = np.zeros(len(snapshots), dtype=np.int64)
+    error = np.zeros(len(snapshots))
+    converged = np.ones(len(snapshots), dtype=bool)
+    if linear:
+        network.lpf(snapshots=snapshots)
+    else:
+        for first in range(0, len(snapshots), _PF_SEED_BLOCK):
+            block = snapshots[first:first + _PF_SEED_BLOCK]
+            if first > 0:
+                previous = snapshots[first - 1]
+                for attr in ("v_mag_pu", "v_ang"):
+                    seed = network.buses_t[attr].loc[previous].to_numpy()
+                    network.buses_t[attr].loc[block] = np.tile(seed, (len(block), 1))
+            info = network.pf(snapshots=block, skip_pre=first > 0, use_seed=first > 0)
+            # Worst value over the sub-networks of each snapshot
+            rows = slice(first, first + len(block))
+            n_iter[rows] = info["n_iter"].to_numpy(dtype=np.int64).max(axis=1)
+            error[rows] = info["error"].to_numpy(dtype=np.float64).max(axis=1)
+            converged[rows] = info["converged"].to_numpy(dtype=bool).all(axis=1)
+    return {
+        "start": start,
+        "stop": stop,
+        "series": {key: (df.columns, df.to_numpy(dtype=np.float64))
+                   for key, df in _output_series(network, snapshots).items()},
+        "n_iter": n_iter,
+        "error": error,
+        "converged": converged
+    }
+
+
+def _solve_pf_batch_worker(start: int, stop: int, linear: bool) -> Dict[str, Any]:
+    """Solve a batch of snapshots on the network of the current worker process."""
+    return _solve_pf_batch(_worker_pf_network, start, stop, linear)
+
+
+def _run_power_flow_batches(network: Network, network_name: str, linear: bool, workers: int,
+                            batch_size: Optional[int]) -> Dict[str, Any]:
+    """Solve the power flow in contiguous snapshot batches, in a process pool if workers > 1.
+
+    The batch results are assembled into one (snapshot x id) array per output
+    series, which is written back to the network's time series.
+    """
+    n_snapshots = len(network.snapshots)
+    batch_size = batch_size or math.ceil(n_snapshots / max(workers, 1))
+    bounds = [(start, min(start + batch_size, n_snapshots)) for start in range(0, n_snapshots, batch_size)]
+    start_time = time.perf_counter()
+    if workers > 1 and len(bounds) > 1:
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(min(workers, len(bounds)), initializer=_init_pf_worker,
+                      initargs=(os.path.abspath(network_name),)) as pool:
+            batches = pool.starmap(_solve_pf_batch_worker, [(start, stop, linear) for start, stop in bounds])
+    else:
+        batches = [_solve_pf_batch(network, start, stop, linear) for start, stop in bounds]
+
+    n_iter = np.zeros(n_snapshots, dtype=np.int64)
+    error = np.zeros(n_snapshots)
+    converged = np.ones(n_snapshots, dtype=bool)
+    arrays: Dict[Tuple[str, str], Tuple[pd.Index, np.ndarray]] = {}
+    for batch in batches:
+        rows = slice(batch["start"], batch["stop"])
+        n_iter[rows], error[rows], converged[rows] = batch["n_iter"], batch["error"], batch["converged"]
+        for key, (columns, values) in batch["series"].items():
+            if key not in arrays:
+                arrays[key] = (columns, np.empty((n_snapshots, values.shape[1])))
+            arrays[key][1][rows] = values
+    for (list_name, attr), (columns, values) in arrays.items():
+        getattr(network, f"{list_name}_t")[attr] = pd.DataFrame(values, index=network.snapshots, columns=columns)
+    return {
+        "n_iter": n_iter,
+        "error": error,
+        "converged": converged,
+        "batches": len(bounds),
+        "batch_size": batch_size,
+        "workers": min(workers, len(bounds)),
+        "time_s": time.perf_counter() - start_time
+    }
+
+
 @mcp.tool()
-def run_power_flow(network_name: str, linear: bool = False) -> Dict[str, Any]:
-    """Run a non-linear (AC) or linear (DC) power flow on the network"""
+def run_power_flow(
+    network_name: str,
+    linear: bool = False,
+    output_dir: Optional[str] = None,
+    workers: int = 1,
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Run a non-linear (AC) or linear (DC) power flow on the network.
+
+    With output_dir the result time series are written to a NetCDF result
+    store and only file paths, shapes and summary statistics are returned;
+    read them with get_results.
+
+    With workers > 1 or batch_size the snapshots are split into contiguous
+    batches (of batch_size snapshots, default one batch per worker) solved in
+    a process pool. Within a batch the AC snapshots are seeded with the
+    solution of the neighbouring solved snapshot instead of a flat start.
+    Results are then returned as
+    (snapshot x id) arrays per attribute with per-snapshot convergence and
+    iteration counts under "convergence".
+    """
     try:
-        network = Network(network_name)
-        
+        network = _get_network(network_name, copy=True)
+        message = f"{'Linear' if linear else 'Non-linear'} power flow completed successfully."
+
+        if workers > 1 or batch_size:
+            batches = _run_power_flow_batches(network, network_name, linear, workers, batch_size)
+            converged = batches.pop("converged")
+            n_iter = batches.pop("n_iter")
+            error = batches.pop("error")
+            results = {
+                "status": "success",
+                "message": message,
+                "convergence": {
+                    "all_converged": bool(converged.all()),
+                    "not_converged": [str(s) for s in network.snapshots[~converged]],
+                    "max_iter": int(n_iter.max()),
+                    "mean_iter": float(n_iter.mean()),
+                    "converged": converged.tolist(),
+                    "n_iter": n_iter.tolist(),
+                    "error": error.tolist()
+                },
+                "batches": batches
+            }
+            if output_dir:
+                results["result_dir"] = output_dir
+                results["results"] = _write_result_store(network, output_dir)
+                return results
+            results["snapshots"] = [str(s) for s in network.snapshots]
+            for list_name, attrs in (("buses", ("v_mag_pu", "v_ang")), ("lines", ("p0", "q0"))):
+                pnl = getattr(network, f"{list_name}_t")
+                results[list_name] = {"ids": getattr(network, list_name).index.tolist()}
+                for attr in attrs:
+                    if not pnl[attr].empty:
+                        values = pnl[attr].reindex(columns=getattr(network, list_name).index)
+                        results[list_name][attr] = values.to_numpy(dtype=np.float64).tolist()
+            return results
+
         if linear:
             network.lpf()
         else:
             network.pf()
+
+        if output_dir:
+            return {
+                "status": "success",
+                "message": message,
+                "result_dir": output_dir,
+                "results": _write_result_store(network, output_dir)
+            }
             
         # Get basic results
         results = {
             "status": "success",
-            "message": f"{'Linear' if linear else 'Non-linear'} power flow completed successfully.",
+            "message": message,
             "buses": {},
             "lines": {}
         }
@@ -113,6 +429,299 @@ def run_power_flow(network_name: str, linear: bool = False) -> Dict[str, Any]:
             "message": f"Power flow failed: {str(e)}"
         }
 
+@mcp.tool()
+def get_results(
+    result_dir: str,
+    component: str,
+    attr: str,
+    snapshot_slice: Optional[List[int]] = None,
+    ids: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Read a page of a stored result time series, e.g. component="buses", attr="v_mag_pu".
+
+    snapshot_slice is [start, stop) by snapshot position (default: the first
+    100 snapshots); ids selects components (default: all). The response
+    gives the next slice to request while more snapshots remain.
+    """
+    try:
+        path = os.path.join(result_dir, component, f"{attr}.nc")
+        if not os.path.exists(path):
+            stored = sorted(
+                f"{name}.{os.path.splitext(file)[0]}"
+                for name in os.listdir(result_dir) if os.path.isdir(os.path.join(result_dir, name))
+                for file in os.listdir(os.path.join(result_dir, name))
+            ) if os.path.isdir(result_dir) else []
+            return {
+                "status": "error",
+                "message": f"No stored results for {component}.{attr}. Available: {stored}"
+            }
+        start, stop = snapshot_slice if snapshot_slice else (0, _RESULT_PAGE_SIZE)
+        with xr.open_dataarray(path) as data:
+            total = data.sizes["snapshot"]
+            page = data.isel(snapshot=slice(start, stop))
+            if ids is not None:
+                page = page.sel(id=ids)
+            values = page.values
+            snapshots = page.snapshot.values
+            page_ids = page.id.values
+        stop = min(stop, total)
+        return {
+            "status": "success",
+            "component": component,
+            "attr": attr,
+            "snapshots": pd.Index(snapshots).astype(str).tolist(),
+            "ids": page_ids.tolist(),
+            "data": np.where(np.isnan(values), None, values).T.tolist(),
+            "total_snapshots": total,
+            "next_slice": [stop, stop + (stop - start)] if stop < total else None
+        }
+    except KeyError as e:
+        return {
+            "status": "error",
+            "message": f"Unknown ids: {str(e)}"
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to read results: {str(e)}"
+        }
+
+
+def _select_snapshots(network: Network, snapshots: Optional[List[str]]) -> pd.Index:
+    """Resolve a list of snapshot labels to a subset of the network snapshots (None selects all)."""
+    if snapshots is None:
+        return network.snapshots
+    if isinstance(network.snapshots, pd.DatetimeIndex):
+        requested = pd.DatetimeIndex(snapshots)
+        selected = network.snapshots[network.snapshots.isin(requested)]
+    else:
+        requested = pd.Index([str(s) for s in snapshots])
+        selected = network.snapshots[network.snapshots.astype(str).isin(requested)]
+    if len(selected) != len(requested):
+        raise ValueError(f"{len(requested) - len(selected)} of the requested snapshots are not in the network")
+    return selected
+
+
+def _line_loading(n: Network, snapshots: pd.Index) -> np.ndarray:
+    """Apparent power loading of all lines in percent of s_nom (snapshots x lines)."""
+    p0 = n.lines_t.p0.reindex(index=snapshots, columns=n.lines.index).values
+    q0 = n.lines_t.q0.reindex(index=snapshots, columns=n.lines.index).values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        loading = np.hypot(p0, q0) / n.lines.s_nom.values * 100
+    loading[~np.isfinite(loading)] = 0.0
+    return loading
+
+
+def _run_outage(
+    n: Network,
+    elem_type: str,
+    elem_id: str,
+    snapshots: pd.Index,
+    base_v_mag: pd.DataFrame,
+    base_v_ang: pd.DataFrame,
+    v_min_pu: float,
+    v_max_pu: float,
+    line_max_loading_pct: float,
+    cube_threshold_pct: float,
+) -> Dict[str, Any]:
+    """Take one branch out of service, run AC power flow, check violations and restore it.
+
+    Violations are checked over all studied snapshots and reported per element
+    with their worst value and the number of violating snapshots. Line loadings
+    at or above cube_threshold_pct are returned as sparse (snapshot, line,
+    loading) entries under "_cube".
+    """
+    component_df = n.lines if elem_type == "line" else n.transformers
+    was_active = component_df.at[elem_id, "active"]
+    component_df.at[elem_id, "active"] = False
+    # Seed every outage from the base case solution
+    n.buses_t.v_mag_pu = base_v_mag.copy()
+    n.buses_t.v_ang = base_v_ang.copy()
+
+    try:
+        pf_result = n.pf(snapshots=snapshots, use_seed=True)
+        converged = bool(pf_result["converged"].loc[snapshots].values.all())
+    except Exception:
+        converged = False
+    finally:
+        component_df.at[elem_id, "active"] = was_active
+
+    if not converged:
+        return {
+            "id": elem_id,
+            "element_type": elem_type,
+            "converged": False,
+            "voltage_violations": [],
+            "loading_violations": [],
+        }
+
+    # Check voltage violations
+    v_mag = n.buses_t.v_mag_pu.loc[snapshots]
+    v = v_mag.values
+    deviation = np.maximum(v_min_pu - v, v - v_max_pu)
+    v_violated = deviation > 0
+    v_count = v_violated.sum(axis=0)
+    v_worst = v[deviation.argmax(axis=0), np.arange(v.shape[1])]
+    voltage_violations = [
+        {"bus": bus, "vm_pu": round(float(vm), 4), "snapshots": int(count)}
+        for bus, vm, count in zip(v_mag.columns[v_count > 0], v_worst[v_count > 0], v_count[v_count > 0])
+    ]
+
+    # Check thermal violations
+    loading = _line_loading(n, snapshots)
+    if elem_type == "line":
+        # Flows of the inactive line are left over from the previous solve
+        loading[:, n.lines.index.get_loc(elem_id)] = 0.0
+    l_violated = loading > line_max_loading_pct
+    l_count = l_violated.sum(axis=0)
+    l_worst = loading.max(axis=0) if loading.size else np.zeros(len(n.lines))
+    loading_violations = [
+        {"line": line_id, "loading_pct": round(float(pct), 2), "snapshots": int(count)}
+        for line_id, pct, count in zip(n.lines.index[l_count > 0], l_worst[l_count > 0], l_count[l_count > 0])
+    ]
+
+    snap_rows, line_cols = np.nonzero(loading >= cube_threshold_pct)
+    return {
+        "id": elem_id,
+        "element_type": elem_type,
+        "converged": True,
+        "voltage_violations": voltage_violations,
+        "loading_violations": loading_violations,
+        "max_loading_pct": round(float(l_worst.max()), 2) if l_worst.size else 0.0,
+        "_violated_snapshots": np.flatnonzero(v_violated.any(axis=1) | l_violated.any(axis=1)),
+        "_cube": (snap_rows.astype(np.int32), line_cols.astype(np.int32),
+                  loading[snap_rows, line_cols].astype(np.float32)),
+    }
+
+
+def _screen_outages_bodf(
+    network: Network,
+    elements: List[Tuple[str, str]],
+    snapshots: pd.Index,
+    screen_margin: float,
+    line_max_loading_pct: float,
+    cube_threshold_pct: float,
+) -> Tuple[List[bool], Dict[str, Optional[float]], Dict[Tuple[str, str], Tuple[np.ndarray, ...]]]:
+    """Estimate post-outage line loading of all outages and snapshots with BODF matrices.
+
+    Uses the solved base case flows of ``network``. Post-outage active power
+    flows are p + BODF[:, k] * p_k for all snapshots and outages at once, with
+    the reactive flows kept at their base case values. Outages that split a
+    sub-network (non-finite BODF) are always flagged. Estimated line loadings
+    at or above cube_threshold_pct are returned as sparse (snapshot, line,
+    loading) entries per outage.
+    """
+    flags = {elem: True for elem in elements}
+    estimates: Dict[str, Optional[float]] = {}
+    cube: Dict[Tuple[str, str], Tuple[np.ndarray, ...]] = {}
+    for sub_network in network.sub_networks.obj:
+        branches = sub_network.branches_i()
+        if len(branches) == 0:
+            continue
+        sub_network.calculate_BODF()
+        bodf = sub_network.BODF
+
+        # Base case flows (snapshots x branches) and line ratings
+        p = np.empty((len(snapshots), len(branches)))
+        q = np.zeros((len(snapshots), len(branches)))
+        rating = np.full(len(branches), np.inf)
+        is_line = branches.get_level_values(0) == "Line"
+        names = branches.get_level_values(1)
+        p[:, is_line] = network.lines_t.p0.loc[snapshots, names[is_line]].values
+        p[:, ~is_line] = network.transformers_t.p0.loc[snapshots, names[~is_line]].values
+        q[:, is_line] = network.lines_t.q0.loc[snapshots, names[is_line]].values
+        rating[is_line] = network.lines.s_nom.loc[names[is_line]].values
+        line_pos = network.lines.index.get_indexer(names[is_line]).astype(np.int32)
+
+        position = {("line" if kind == "Line" else "transformer", name): i
+                    for i, (kind, name) in enumerate(branches)}
+        outages = [elem for elem in elements if elem in position]
+        cols = np.array([position[elem] for elem in outages], dtype=np.int64)
+        # Bound the snapshots x branches x outages block to about 20 million values
+        chunk = max(1, int(2e7 // max(1, len(snapshots) * len(branches))))
+        for start in range(0, len(cols), chunk):
+            block = cols[start:start + chunk]
+            with np.errstate(invalid="ignore", over="ignore"):
+                p_post = p[:, :, None] + p[:, None, block] * bodf[None, :, block]
+                loading = np.hypot(p_post, q[:, :, None]) / rating[None, :, None] * 100
+            # The outaged branch itself carries no flow
+            loading[:, block, np.arange(len(block))] = 0.0
+            islanding = ~np.isfinite(bodf[:, block]).all(axis=0)
+            loading = np.nan_to_num(loading, nan=np.inf)
+            max_loading = loading.max(axis=(0, 1))
+            line_loading = loading[:, is_line, :]
+            for k, (elem, split, est) in enumerate(zip(outages[start:start + chunk], islanding, max_loading)):
+                estimates[elem[1]] = round(float(est), 2) if np.isfinite(est) else None
+                flags[elem] = bool(split or est > line_max_loading_pct * screen_margin)
+                snap_rows, cols_k = np.nonzero(line_loading[:, :, k] >= cube_threshold_pct)
+                cube[elem] = (snap_rows.astype(np.int32), line_pos[cols_k],
+                              line_loading[snap_rows, cols_k, k].astype(np.float32))
+    return [flags[elem] for elem in elements], estimates, cube
+
+
+def _write_loading_cube(
+    path: str,
+    snapshots: pd.Index,
+    elements: List[Tuple[str, str]],
+    lines: pd.Index,
+    entries: List[Tuple[int, Tuple[np.ndarray, ...], bool]],
+    threshold_pct: float,
+) -> int:
+    """Write the sparse snapshot x outage x line loading cube to a compressed NetCDF file."""
+    snap_idx, line_idx, loading, outage_idx, estimated = [], [], [], [], []
+    for outage_pos, (rows, cols, values), is_estimate in entries:
+        snap_idx.append(rows)
+        line_idx.append(cols)
+        loading.append(values)
+        outage_idx.append(np.full(len(rows), outage_pos, dtype=np.int32))
+        estimated.append(np.full(len(rows), is_estimate, dtype=np.int8))
+    empty_int = np.empty(0, dtype=np.int32)
+    data = xr.Dataset(
+        {
+            "snapshot_index": ("entry", np.concatenate(snap_idx) if snap_idx else empty_int),
+            "outage_index": ("entry", np.concatenate(outage_idx) if outage_idx else empty_int),
+            "line_index": ("entry", np.concatenate(line_idx) if line_idx else empty_int),
+            "loading_pct": ("entry", np.concatenate(loading) if loading else np.empty(0, dtype=np.float32)),
+            "estimated": ("entry", np.concatenate(estimated) if estimated else np.empty(0, dtype=np.int8)),
+        },
+        coords={
+            "snapshot": ("snapshot", snapshots.astype(str).values),
+            "outage": ("outage", np.array([elem_id for _, elem_id in elements], dtype=str)),
+            "outage_type": ("outage", np.array([elem_type for elem_type, _ in elements], dtype=str)),
+            "line": ("line", lines.astype(str).values),
+        },
+        attrs={
+            "threshold_pct": threshold_pct,
+            "description": "Line loadings (% of s_nom) at or above threshold_pct per snapshot and outage; "
+                           "estimated=1 marks BODF estimates of screened out outages",
+        },
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data.to_netcdf(path, encoding={name: {"zlib": True, "complevel": 4} for name in data.data_vars})
+    return int(data.sizes["entry"])
+
+
+# Network and base case seed loaded once per worker process
+_worker_network = None
+_worker_seed = None
+
+
+def _init_contingency_worker(network_name: str, base_v_mag: pd.DataFrame, base_v_ang: pd.DataFrame) -> None:
+    """Load the network once per worker process."""
+    global _worker_network, _worker_seed
+    # Worker output must not reach the server's stdout, which carries the MCP transport
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    _worker_network = Network(network_name)
+    _worker_seed = (base_v_mag, base_v_ang)
+
+
+def _run_outage_chunk(chunk: List[Tuple[str, str]], snapshots: pd.Index,
+                      limits: Tuple[float, ...]) -> List[Dict[str, Any]]:
+    """Solve a chunk of outages on the network of the current worker process."""
+    return [_run_outage(_worker_network, elem_type, elem_id, snapshots, *_worker_seed, *limits)
+            for elem_type, elem_id in chunk]
+
+
 @mcp.tool()
 def run_contingency_analysis(
     network_name: str,
@@ -120,29 +729,53 @@ def run_contingency_analysis(
     v_min_pu: float = 0.95,
     v_max_pu: float = 1.05,
     line_max_loading_pct: float = 100.0,
+    mode: str = "full",
+    screen_margin: float = 0.9,
+    workers: int = 1,
+    snapshots: Optional[List[str]] = None,
+    output_dir: Optional[str] = None,
+    cube_threshold_pct: float = 90.0,
 ) -> Dict[str, Any]:
     """Run N-1 contingency analysis on the network.
 
     Outages each line/transformer one at a time, runs AC power flow,
-    and checks for voltage and thermal violations.
+    and checks for voltage and thermal violations in all snapshots (or the
+    given subset); violations report the worst value and the number of
+    violating snapshots. With mode="screen" all outages are first screened
+    with BODF estimates and only outages estimated above screen_margin of the
+    loading limit (or splitting the network) are confirmed with AC power flow;
+    voltage violations are then only reported for the confirmed outages.
+    workers > 1 runs the AC power flows in a process pool (0 uses all cores).
+    With output_dir, line loadings at or above cube_threshold_pct are written
+    as a sparse snapshot x outage x line cube to contingency_loading.nc.
     """
     try:
+        if mode not in ("full", "screen"):
+            return {
+                "status": "error",
+                "message": "Unsupported mode. Use 'full' or 'screen'.",
+            }
+        if workers < 0:
+            return {
+                "status": "error",
+                "message": "workers must be 0 (all cores) or a positive number.",
+            }
+        start_time = time.perf_counter()
+
         # --- Base case ---
-        network = Network(network_name)
-        network.pf(use_seed=True)
+        # One working copy, outages are toggled in place and restored
+        network = _get_network(network_name, copy=True)
+        snapshots = _select_snapshots(network, snapshots)
+        network.pf(snapshots=snapshots, use_seed=True)
 
-        base_v = network.buses_t.v_mag_pu.iloc[0]
-        base_p0 = network.lines_t.p0.iloc[0]
-        base_q0 = network.lines_t.q0.iloc[0]
-        base_s_nom = network.lines.s_nom
-        base_loading = np.sqrt(base_p0**2 + base_q0**2) / base_s_nom * 100
-        base_loading = base_loading.replace([np.inf, -np.inf], np.nan).fillna(0.0)
+        base_v = network.buses_t.v_mag_pu.loc[snapshots]
+        base_loading = _line_loading(network, snapshots)
 
         base_case = {
             "converged": True,
-            "min_voltage_pu": float(base_v.min()),
-            "max_voltage_pu": float(base_v.max()),
-            "max_line_loading_pct": float(base_loading.max()),
+            "min_voltage_pu": float(base_v.values.min()),
+            "max_voltage_pu": float(base_v.values.max()),
+            "max_line_loading_pct": float(base_loading.max()) if base_loading.size else 0.0,
         }
 
         # --- Determine contingency elements ---
@@ -165,75 +798,72 @@ def run_contingency_analysis(
                         "message": f"Element '{elem_id}' not found in lines or transformers",
                     }
 
+        # --- Screen outages ---
+        screening = None
+        screen_cube = {}
+        ac_elements = elements
+        if mode == "screen":
+            flags, estimates, screen_cube = _screen_outages_bodf(
+                network, elements, snapshots, screen_margin, line_max_loading_pct, cube_threshold_pct)
+            ac_elements = [elem for elem, flag in zip(elements, flags) if flag]
+            screening = {
+                "screened_out": [elem_id for (_, elem_id), flag in zip(elements, flags) if not flag],
+                "estimated_max_loading_pct": estimates,
+                "time_s": round(time.perf_counter() - start_time, 4),
+            }
+
         # --- Run contingencies ---
-        contingencies = []
-        non_converged = 0
-        with_violations = 0
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        base_v_mag = network.buses_t.v_mag_pu.copy()
+        base_v_ang = network.buses_t.v_ang.copy()
+        limits = (v_min_pu, v_max_pu, line_max_loading_pct, cube_threshold_pct)
 
-        for elem_type, elem_id in elements:
-            n = Network(network_name)
+        ac_start = time.perf_counter()
+        if workers > 1 and len(ac_elements) > 1:
+            chunk_size = max(1, math.ceil(len(ac_elements) / (workers * 4)))
+            chunks = [ac_elements[i:i + chunk_size] for i in range(0, len(ac_elements), chunk_size)]
+            # Spawn avoids forking the running server; workers read the network file once
+            ctx = multiprocessing.get_context("spawn")
+            with ctx.Pool(min(workers, len(chunks)), initializer=_init_contingency_worker,
+                          initargs=(os.path.abspath(network_name), base_v_mag, base_v_ang)) as pool:
+                contingencies = [result for chunk_results in pool.starmap(
+                    _run_outage_chunk, [(chunk, snapshots, limits) for chunk in chunks])
+                    for result in chunk_results]
+        else:
+            contingencies = [_run_outage(network, elem_type, elem_id, snapshots, base_v_mag, base_v_ang, *limits)
+                             for elem_type, elem_id in ac_elements]
+        ac_time = time.perf_counter() - ac_start
 
-            if elem_type == "line":
-                n.lines.at[elem_id, "active"] = False
-            else:
-                n.transformers.at[elem_id, "active"] = False
-
-            try:
-                pf_result = n.pf(use_seed=True)
-                converged = bool(pf_result["converged"].iloc[0, 0])
-            except Exception:
-                converged = False
-
-            if not converged:
-                non_converged += 1
-                contingencies.append({
-                    "id": elem_id,
-                    "element_type": elem_type,
-                    "converged": False,
-                    "voltage_violations": [],
-                    "loading_violations": [],
-                })
-                with_violations += 1
-                continue
+        # --- Aggregate over snapshots ---
+        cube_entries = []
+        outage_pos = {elem: i for i, elem in enumerate(elements)}
+        violating_outages = np.zeros(len(snapshots), dtype=np.int64)
+        for elem, c in zip(ac_elements, contingencies):
+            violating_outages[c.pop("_violated_snapshots", [])] += 1
+            if "_cube" in c:
+                cube_entries.append((outage_pos[elem], c.pop("_cube"), False))
+        solved = set(ac_elements)
+        cube_entries += [(outage_pos[elem], entries, True) for elem, entries in screen_cube.items()
+                         if elem not in solved]
 
-            # Check voltage violations
-            v_mag = n.buses_t.v_mag_pu.iloc[0]
-            voltage_violations = []
-            for bus in v_mag.index:
-                v = float(v_mag[bus])
-                if v < v_min_pu or v > v_max_pu:
-                    voltage_violations.append({"bus": bus, "vm_pu": round(v, 4)})
-
-            # Check thermal violations
-            p0 = n.lines_t.p0.iloc[0]
-            q0 = n.lines_t.q0.iloc[0]
-            s_nom = n.lines.s_nom
-            loading = np.sqrt(p0**2 + q0**2) / s_nom * 100
-            loading = loading.replace([np.inf, -np.inf], np.nan).fillna(0.0)
-
-            loading_violations = []
-            for line_id_inner in loading.index:
-                pct = float(loading[line_id_inner])
-                if pct > line_max_loading_pct:
-                    loading_violations.append({
-                        "line": line_id_inner,
-                        "loading_pct": round(pct, 2),
-                    })
-
-            has_violations = len(voltage_violations) > 0 or len(loading_violations) > 0
-            if has_violations:
-                with_violations += 1
-
-            contingencies.append({
-                "id": elem_id,
-                "element_type": elem_type,
-                "converged": True,
-                "voltage_violations": voltage_violations,
-                "loading_violations": loading_violations,
-            })
+        non_converged = sum(not c["converged"] for c in contingencies)
+        with_violations = sum(
+            not c["converged"] or bool(c["voltage_violations"]) or bool(c["loading_violations"])
+            for c in contingencies
+        )
+        worst_snapshots = np.argsort(-violating_outages, kind="stable")[:10]
+        ranked = sorted((c for c in contingencies if c["converged"]),
+                        key=lambda c: c["max_loading_pct"], reverse=True)[:10]
 
         total = len(elements)
-        return _to_serializable({
+        timing = {
+            "total_s": round(time.perf_counter() - start_time, 4),
+            "ac_solve_s": round(ac_time, 4),
+            "ac_solves": len(ac_elements),
+            "workers": workers,
+        }
+        response = {
             "status": "success",
             "message": f"N-1 contingency analysis completed. {with_violations} of {total} contingencies have violations.",
             "base_case": base_case,
@@ -242,8 +872,28 @@ def run_contingency_analysis(
                 "total_contingencies": total,
                 "with_violations": with_violations,
                 "non_converged": non_converged,
+                "snapshots": len(snapshots),
+                "snapshots_with_violations": int((violating_outages > 0).sum()),
+                "worst_snapshots": [
+                    {"snapshot": str(snapshots[i]), "violating_outages": int(violating_outages[i])}
+                    for i in worst_snapshots if violating_outages[i] > 0
+                ],
+                "worst_outages": [{"id": c["id"], "max_loading_pct": c["max_loading_pct"]} for c in ranked],
             },
-        })
+            "timing": timing,
+        }
+        if screening is not None:
+            response["screening"] = screening
+        if output_dir:
+            cube_path = os.path.join(output_dir, "contingency_loading.nc")
+            response["cube"] = {
+                "path": cube_path,
+                "entries": _write_loading_cube(cube_path, snapshots, elements, network.lines.index,
+                                               cube_entries, cube_threshold_pct),
+                "threshold_pct": cube_threshold_pct,
+                "shape": [len(snapshots), len(elements), len(network.lines)],
+            }
+        return _to_serializable(response)
     except Exception as e:
         return {
             "status": "error",
@@ -258,7 +908,7 @@ def get_component_details(
     component_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """Get detailed information about a specific component or all components of a type"""
-    network = Network(network_name)
+    network = _get_network(network_name)
     
     if not hasattr(network, component_type):
         return {
@@ -280,6 +930,25 @@ def get_component_details(
 
     return _to_serializable(result)
 
+@mcp.tool()
+def get_network_cache_info() -> Dict[str, Any]:
+    """List the networks held in the in-memory cache with their memory usage"""
+    networks = {
+        path: {
+            "memory_mb": round(entry["memory_bytes"] / 1024 ** 2, 2),
+            "load_time_s": round(entry["load_time_s"], 4)
+        }
+        for path, entry in _network_cache.items()
+    }
+    return {
+        "status": "success",
+        "networks": networks,
+        "total_memory_mb": round(sum(entry["memory_bytes"] for entry in _network_cache.values()) / 1024 ** 2, 2),
+        "max_memory_mb": _MAX_CACHE_MB,
+        "hits": _cache_stats["hits"],
+        "misses": _cache_stats["misses"]
+    }
+
 # ============= Network Construction =============
 
 @mcp.tool()
@@ -292,7 +961,7 @@ def create_network(
     if snapshots:
         snapshots = pd.DatetimeIndex(snapshots)
     network = Network(name=name, snapshots=snapshots, crs=crs)
-    network.export_to_netcdf(f"{name}.nc")
+    _save_network(network, f"{name}.nc")
     return {
         "status": "success",
         "message": f"Network '{name}' created and saved to {name}.nc"
@@ -308,12 +977,12 @@ def add_bus(
     carrier: str = "AC"
 ) -> Dict[str, Any]:
     """Add a bus to the network"""
-    network = Network(network_name)
+    network, in_session = _open_for_edit(network_name)
     network.add("Bus", bus_id, v_nom=v_nom, x=x, y=y, carrier=carrier)
-    network.export_to_netcdf(network_name)
+    pending = _finish_edit(network, network_name, in_session)
     return {
         "status": "success",
-        "message": f"Bus '{bus_id}' added to network"
+        "message": f"Bus '{bus_id}' added to network{pending}"
     }
 
 @mcp.tool()
@@ -328,7 +997,7 @@ def add_generator(
     p_max_pu: float = 1.0
 ) -> Dict[str, Any]:
     """Add a generator to the network"""
-    network = Network(network_name)
+    network, in_session = _open_for_edit(network_name)
     network.add(
         "Generator",
         gen_id,
@@ -339,10 +1008,10 @@ def add_generator(
         p_min_pu=p_min_pu,
         p_max_pu=p_max_pu
     )
-    network.export_to_netcdf(network_name)
+    pending = _finish_edit(network, network_name, in_session)
     return {
         "status": "success",
-        "message": f"Generator '{gen_id}' added to network"
+        "message": f"Generator '{gen_id}' added to network{pending}"
     }
 
 @mcp.tool()
@@ -353,12 +1022,12 @@ def add_load(
     p_set: float
 ) -> Dict[str, Any]:
     """Add a load to the network"""
-    network = Network(network_name)
+    network, in_session = _open_for_edit(network_name)
     network.add("Load", load_id, bus=bus, p_set=p_set)
-    network.export_to_netcdf(network_name)
+    pending = _finish_edit(network, network_name, in_session)
     return {
         "status": "success",
-        "message": f"Load '{load_id}' added to network"
+        "message": f"Load '{load_id}' added to network{pending}"
     }
 
 @mcp.tool()
@@ -373,7 +1042,7 @@ def add_line(
     length: float = 1.0
 ) -> Dict[str, Any]:
     """Add a transmission line to the network"""
-    network = Network(network_name)
+    network, in_session = _open_for_edit(network_name)
     network.add(
         "Line",
         line_id,
@@ -384,10 +1053,10 @@ def add_line(
         s_nom=s_nom,
         length=length
     )
-    network.export_to_netcdf(network_name)
+    pending = _finish_edit(network, network_name, in_session)
     return {
         "status": "success",
-        "message": f"Line '{line_id}' added to network"
+        "message": f"Line '{line_id}' added to network{pending}"
     }
 
 @mcp.tool()
@@ -402,7 +1071,7 @@ def add_storage_unit(
     cyclic_state_of_charge: bool = True
 ) -> Dict[str, Any]:
     """Add a storage unit to the network"""
-    network = Network(network_name)
+    network, in_session = _open_for_edit(network_name)
     network.add(
         "StorageUnit",
         storage_id,
@@ -413,36 +1082,432 @@ def add_storage_unit(
         efficiency_dispatch=efficiency_dispatch,
         cyclic_state_of_charge=cyclic_state_of_charge
     )
-    network.export_to_netcdf(network_name)
+    pending = _finish_edit(network, network_name, in_session)
+    return {
+        "status": "success",
+        "message": f"Storage unit '{storage_id}' added to network{pending}"
+    }
+
+@mcp.tool()
+def add_components(network_name: str, components: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Add many components in one call and write the network file once.
+
+    Each entry names the component class and id and gives its attributes, e.g.
+    {"component": "Generator", "id": "Gen 1", "bus": "Bus 1", "p_nom": 100}.
+    Components of the same class and attributes are added in one vectorized call.
+    """
+    try:
+        groups: Dict[Tuple[str, Tuple[str, ...]], List[Dict[str, Any]]] = {}
+        for entry in components:
+            if "component" not in entry or "id" not in entry:
+                raise ValueError(f"Component entry {entry} needs 'component' and 'id' keys")
+            attrs = tuple(sorted(key for key in entry if key not in ("component", "id")))
+            groups.setdefault((entry["component"], attrs), []).append(entry)
+
+        network, in_session = _open_for_edit(network_name)
+        added = {}
+        # Groups keep the order in which their classes first appear (e.g. buses before lines)
+        for (class_name, attrs), entries in groups.items():
+            _add_many(network, class_name, [entry["id"] for entry in entries],
+                      **{attr: [entry[attr] for entry in entries] for attr in attrs})
+            added[class_name] = added.get(class_name, 0) + len(entries)
+        pending = _finish_edit(network, network_name, in_session, len(components))
+        return {
+            "status": "success",
+            "message": f"{len(components)} components added to network{pending}",
+            "added": added
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to add components: {str(e)}"
+        }
+
+@mcp.tool()
+def begin_edit_session(network_name: str) -> Dict[str, Any]:
+    """Open an edit session: construction tools modify the network in memory until commit_edit_session"""
+    try:
+        path = os.path.abspath(network_name)
+        if path in _edit_sessions:
+            return {
+                "status": "error",
+                "message": f"An edit session is already open for {network_name}"
+            }
+        _edit_sessions[path] = {"network": _get_network(network_name, copy=True), "changes": 0}
+        return {
+            "status": "success",
+            "message": f"Edit session opened for {network_name}"
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to open edit session: {str(e)}"
+        }
+
+@mcp.tool()
+def commit_edit_session(network_name: str) -> Dict[str, Any]:
+    """Write the changes of an edit session to the network file and close the session"""
+    path = os.path.abspath(network_name)
+    if path not in _edit_sessions:
+        return {
+            "status": "error",
+            "message": f"No edit session open for {network_name}"
+        }
+    try:
+        session = _edit_sessions[path]
+        _save_network(session["network"], network_name)
+        del _edit_sessions[path]
+        return {
+            "status": "success",
+            "message": f"{session['changes']} changes written to {network_name}"
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to commit edit session: {str(e)}"
+        }
+
+@mcp.tool()
+def discard_edit_session(network_name: str) -> Dict[str, Any]:
+    """Close an edit session without writing its changes"""
+    session = _edit_sessions.pop(os.path.abspath(network_name), None)
+    if session is None:
+        return {
+            "status": "error",
+            "message": f"No edit session open for {network_name}"
+        }
     return {
         "status": "success",
-        "message": f"Storage unit '{storage_id}' added to network"
+        "message": f"{session['changes']} changes discarded"
     }
 
 # ============= Optimization =============
 
+def _optimize(network: Network, snapshots: Optional[pd.Index], solver_name: str,
+              solver_options: Dict, **kwargs: Any) -> Tuple[str, str]:
+    """Optimize the given snapshots with Network.optimize (linopy) or, on older PyPSA, Network.lopf.
+
+    Extra keyword arguments are passed to the optimization call.
+    """
+    if hasattr(network, "optimize"):
+        return network.optimize(snapshots=snapshots, solver_name=solver_name, solver_options=solver_options,
+                                **kwargs)
+    return network.lopf(snapshots=snapshots, solver_name=solver_name, solver_options=solver_options, **kwargs)
+
+
+def _output_series(network: Network, snapshots: pd.Index) -> Dict[Tuple[str, str], pd.DataFrame]:
+    """Collect the non-empty output time series of all components for the given snapshots."""
+    series = {}
+    for component in network.iterate_components():
+        outputs = component.attrs.index[component.attrs.status.str.startswith("Output")]
+        for attr, df in component.pnl.items():
+            if attr in outputs and not df.empty:
+                series[(component.list_name, attr)] = df.loc[snapshots]
+    return series
+
+
+def _snapshot_opex(network: Network, snapshots: pd.Index) -> float:
+    """Operational cost of the given snapshots of a solved network, weighted as in the objective."""
+    opex = network.statistics.opex(groupby_time=False).fillna(0.0)[snapshots].sum()
+    return float((opex * network.snapshot_weightings.objective[snapshots]).sum())
+
+
+# Network solved by the window workers, loaded once per worker process
+_worker_window_network = None
+
+
+def _init_window_worker(network_name: str) -> None:
+    """Load the network once per worker process."""
+    global _worker_window_network
+    # Worker output must not reach the server's stdout, which carries the MCP transport
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    _worker_window_network = Network(network_name)
+
+
+def _solve_window(start: int, stop: int, solver_name: str, solver_options: Dict) -> Dict[str, Any]:
+    """Optimize one window of snapshots on the network of the current worker process."""
+    network = _worker_window_network
+    snapshots = network.snapshots[start:stop]
+    start_time = time.perf_counter()
+    status, condition = _optimize(network, snapshots, solver_name, solver_options)
+    solve_time = time.perf_counter() - start_time
+    return {
+        "status": status,
+        "condition": condition,
+        "objective": float(network.objective) if status == "ok" else None,
+        "time_s": solve_time,
+        "series": _output_series(network, snapshots) if status == "ok" else {}
+    }
+
+
+def _optimize_rolling_horizon(network: Network, network_name: str, horizon: int, overlap: int,
+                              workers: int, solver_name: str, solver_options: Dict) -> Dict[str, Any]:
+    """Optimize the network in windows of horizon snapshots that overlap by overlap snapshots.
+
+    The storage state of charge (and store energy) at the last snapshot
+    before each window is handed to the next window as its initial value, so
+    cyclic state of charge is disabled. Each window commits its first
+    horizon - overlap snapshots (the last window all of them), and the total
+    objective only counts the operational cost of committed snapshots. Ramp
+    limits and unit commitment of generators and links also couple the
+    windows; PyPSA constrains the first snapshot of each window by the
+    dispatch and status at the snapshot before it. Without any of these the
+    windows are independent; they are then solved without overlap and, with
+    workers > 1, in a process pool whose workers read the network file once.
+    """
+    if horizon < 1 or not 0 <= overlap < horizon:
+        raise ValueError("horizon must be positive and overlap between 0 and horizon - 1")
+    snapshots = network.snapshots
+    coupled = not network.storage_units.empty or not network.stores.empty or any(
+        df[attr].notna().any() for df in (network.generators, network.links)
+        for attr in ("ramp_limit_up", "ramp_limit_down")
+    ) or network.generators.committable.any() or network.links.committable.any()
+    parallel = workers > 1 and not coupled
+    step = horizon - overlap if coupled else horizon
+
+    starts = [0]
+    while starts[-1] + horizon < len(snapshots):
+        starts.append(starts[-1] + step)
+    bounds = [(start, min(start + horizon, len(snapshots))) for start in starts]
+
+    windows = []
+    if parallel:
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(min(workers, len(bounds)), initializer=_init_window_worker,
+                      initargs=(os.path.abspath(network_name),)) as pool:
+            pending = [pool.apply_async(_solve_window, (start, stop, solver_name, solver_options))
+                       for start, stop in bounds]
+            solved = []
+            for i, result in enumerate(pending):
+                solved.append(result.get())
+                logger.info(f"Window {i + 1}/{len(bounds)} solved in {solved[-1]['time_s']:.2f} s")
+        merged: Dict[Tuple[str, str], List[pd.DataFrame]] = {}
+        for result in solved:
+            result["committed_objective"] = result["objective"]
+            for key, df in result.pop("series").items():
+                merged.setdefault(key, []).append(df)
+            windows.append(result)
+        for (list_name, attr), frames in merged.items():
+            getattr(network, f"{list_name}_t")[attr] = pd.concat(frames).reindex(snapshots)
+    else:
+        if not network.storage_units.empty:
+            network.storage_units["cyclic_state_of_charge"] = False
+        if not network.stores.empty:
+            network.stores["e_cyclic"] = False
+        for i, (start, stop) in enumerate(bounds):
+            initial = {}
+            if i:
+                handoff = snapshots[start - 1]
+                if not network.storage_units.empty:
+                    network.storage_units["state_of_charge_initial"] = \
+                        network.storage_units_t.state_of_charge.loc[handoff, network.storage_units.index].values
+                    initial["state_of_charge_initial"] = network.storage_units["state_of_charge_initial"].to_dict()
+                if not network.stores.empty:
+                    network.stores["e_initial"] = network.stores_t.e.loc[handoff, network.stores.index].values
+                    initial["e_initial"] = network.stores["e_initial"].to_dict()
+            start_time = time.perf_counter()
+            status, condition = _optimize(network, snapshots[start:stop], solver_name, solver_options)
+            committed = None
+            if status == "ok":
+                # The overlap is optimized again by the next window, which overwrites its results
+                overlap_snapshots = snapshots[start + step:stop] if i < len(bounds) - 1 else snapshots[:0]
+                committed = float(network.objective) - (_snapshot_opex(network, overlap_snapshots)
+                                                        if len(overlap_snapshots) else 0.0)
+            windows.append({
+                "status": status,
+                "condition": condition,
+                "objective": float(network.objective) if status == "ok" else None,
+                "committed_objective": committed,
+                "time_s": time.perf_counter() - start_time,
+                **initial
+            })
+            logger.info(f"Window {i + 1}/{len(bounds)} solved in {windows[-1]['time_s']:.2f} s")
+            if status != "ok":
+                break
+
+    for window, (start, stop) in zip(windows, bounds):
+        window.update({"start": str(snapshots[start]), "end": str(snapshots[stop - 1]),
+                       "snapshots": stop - start, "time_s": round(window["time_s"], 4)})
+    failed = [window for window in windows if window["status"] != "ok"]
+    return {
+        "status": failed[0]["status"] if failed else "ok",
+        "objective": sum(window["committed_objective"] or 0.0 for window in windows),
+        "horizon": horizon,
+        "overlap": overlap if coupled else 0,
+        "parallel": parallel,
+        "windows_solved": len(windows) - len(failed),
+        "windows_total": len(bounds),
+        "windows": windows
+    }
+
+
+# Solved networks of optimize_network, keyed by a hash of the network contents and
+# the solver options, least recently used first
+_solution_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_solution_stats = {"hits": 0, "misses": 0, "warm_starts": 0}
+
+# Memory budget of the solution cache in MB
+_MAX_SOLUTION_CACHE_MB = float(os.environ.get("PYPSA_MCP_SOLUTION_CACHE_MB", 1024))
+
+# Solvers whose linopy interface reads and writes basis files for warm starts
+_WARMSTART_SOLVERS = ("highs", "gurobi", "cplex")
+_BASIS_DIR = os.environ.get("PYPSA_MCP_BASIS_DIR", os.path.join(tempfile.gettempdir(), "pypsa_mcp_bases"))
+
+
+def _network_hash(network: Network, structure: bool = False) -> str:
+    """Hash the snapshots, component tables and time series of a network.
+
+    With structure=True only what fixes the shape of the optimization problem
+    is hashed: snapshots, component names, boolean flags (extendable,
+    committable, active) and which time series are set.
+    """
+    digest = hashlib.sha256()
+
+    def update(obj: Union[pd.Index, pd.DataFrame]) -> None:
+        digest.update(pd.util.hash_pandas_object(obj).to_numpy().tobytes())
+
+    update(network.snapshots)
+    if not structure:
+        update(network.snapshot_weightings)
+    # Components are iterated in set order, which differs between processes
+    for component in sorted(network.iterate_components(), key=lambda c: c.name):
+        static = component.df
+        digest.update(f"{component.name}:{list(static.columns)}".encode())
+        update(static.index)
+        values = static.select_dtypes(bool) if structure else static
+        if not values.columns.empty:
+            update(values)
+        for attr, df in sorted(component.pnl.items()):
+            if not df.empty:
+                digest.update(f"{attr}:{list(df.columns)}".encode())
+                if not structure:
+                    update(df)
+    return digest.hexdigest()
+
+
+def _cache_solution(key: str, entry: Dict[str, Any]) -> None:
+    """Store a solved network and evict the least recently used ones over the memory budget."""
+    entry["memory_bytes"] = _network_memory_bytes(entry["network"])
+    _solution_cache[key] = entry
+    _solution_cache.move_to_end(key)
+    total = sum(entry["memory_bytes"] for entry in _solution_cache.values())
+    # The newest entry is always kept, even if it exceeds the budget on its own
+    while total > _MAX_SOLUTION_CACHE_MB * 1024 ** 2 and len(_solution_cache) > 1:
+        _, evicted = _solution_cache.popitem(last=False)
+        total -= evicted["memory_bytes"]
+
+
+def _content_hash(network_name: str, network: Network) -> str:
+    """Hash the cached network of a file, once per version of the file."""
+    entry = _network_cache[os.path.abspath(network_name)]
+    if "content_hash" not in entry:
+        entry["content_hash"] = _network_hash(network)
+    return entry["content_hash"]
+
+
 @mcp.tool()
 def optimize_network(
     network_name: str,
     solver_name: str = "highs",
     formulation: str = "kirchhoff",
     pyomo: bool = False,
-    solver_options: Optional[Dict] = None
+    solver_options: Optional[Dict] = None,
+    output_dir: Optional[str] = None,
+    horizon: Optional[int] = None,
+    overlap: int = 0,
+    workers: int = 1
 ) -> Dict[str, Any]:
-    """Run a linear optimal power flow (LOPF) on the network"""
-    network = Network(network_name)
-    
+    """Run a linear optimal power flow (LOPF) on the network.
+
+    With output_dir the result time series are written to a NetCDF result
+    store (see run_power_flow) instead of being returned inline. With horizon
+    the snapshots are optimized in rolling windows of that many snapshots,
+    overlapping by overlap snapshots, with the storage state of charge handed
+    from window to window; without storage the windows are independent and
+    workers > 1 solves them in parallel. Per-window status and timing are
+    returned under "rolling_horizon".
+
+    Solutions are cached by a hash of the network contents and the options, so
+    repeated runs return immediately; runs that change only values (costs,
+    loads, capacities) start from the basis of the last run of the same
+    problem shape where the solver supports it. Statistics are returned under
+    "solution_cache".
+    """
     try:
-        status = network.lopf(
-                    solver_name=solver_name,
-                    pyomo=pyomo,
-                    solver_options=solver_options or {}
-                )
+        solver_options = solver_options or {}
+        options = json.dumps({"solver_name": solver_name, "formulation": formulation, "pyomo": pyomo,
+                              "solver_options": solver_options, "horizon": horizon, "overlap": overlap},
+                             sort_keys=True, default=str)
+        network = _get_network(network_name)
+        key = hashlib.sha256((_content_hash(network_name, network) + options).encode()).hexdigest()
+        entry = _solution_cache.get(key)
+        warm_start = False
+        start_time = time.perf_counter()
+        # Only a run that is solved needs a private copy of the shared network
+        network = entry["network"] if entry is not None else network.copy()
+        if entry is not None:
+            _solution_stats["hits"] += 1
+            _solution_cache.move_to_end(key)
+            status, objective = entry["status"], entry["objective"]
+            rolling = dict(entry["rolling"]) if entry["rolling"] is not None else None
+        elif horizon:
+            _solution_stats["misses"] += 1
+            rolling = _optimize_rolling_horizon(network, network_name, horizon, overlap, workers,
+                                                solver_name, solver_options)
+            status = rolling.pop("status")
+            objective = rolling.pop("objective")
+            if status != "ok":
+                return {
+                    "status": "error",
+                    "message": f"Optimization failed in window {rolling['windows_solved'] + 1}: {status}",
+                    "rolling_horizon": rolling
+                }
+            _cache_solution(key, {"network": network, "status": status, "objective": objective,
+                                  "rolling": dict(rolling)})
+        else:
+            _solution_stats["misses"] += 1
+            rolling = None
+            if hasattr(network, "optimize"):
+                kwargs = {}
+                if solver_name in _WARMSTART_SOLVERS:
+                    # Runs with the same problem shape share a basis file: the
+                    # last basis found is the warm start for the next run
+                    os.makedirs(_BASIS_DIR, exist_ok=True)
+                    structure = hashlib.sha256((_network_hash(network, structure=True) + options).encode())
+                    kwargs["basis_fn"] = os.path.join(_BASIS_DIR, structure.hexdigest() + ".bas")
+                    if os.path.exists(kwargs["basis_fn"]):
+                        kwargs["warmstart_fn"] = kwargs["basis_fn"]
+                        warm_start = True
+                        _solution_stats["warm_starts"] += 1
+            else:
+                kwargs = {"pyomo": pyomo, "formulation": formulation}
+            status = _optimize(network, None, solver_name, solver_options, **kwargs)
+            objective = float(network.objective)
+            _cache_solution(key, {"network": network, "status": status, "objective": objective,
+                                  "rolling": None})
+        solution_cache = dict(_solution_stats, hit=entry is not None, warm_start=warm_start,
+                              key=key[:16], solve_time_s=time.perf_counter() - start_time,
+                              memory_mb=round(sum(cached["memory_bytes"] for cached in _solution_cache.values())
+                                              / 1024 ** 2, 2),
+                              max_memory_mb=_MAX_SOLUTION_CACHE_MB)
+
+        if output_dir:
+            results = {
+                "status": status,
+                "objective": objective,
+                "solver": solver_name,
+                "result_dir": output_dir,
+                "results": _write_result_store(network, output_dir),
+                "solution_cache": solution_cache
+            }
+            if rolling is not None:
+                results["rolling_horizon"] = rolling
+            return results
         
         # Get optimization results
         results = {
             "status": status,
-            "objective": float(network.objective),
+            "objective": objective,
             "solver": solver_name,
             "generators": {
                 gen: {
@@ -464,8 +1529,11 @@ def optimize_network(
                                      else float(network.buses_t.marginal_price[bus].iloc[0])
                 }
                 for bus in network.buses.index
-            }
+            },
+            "solution_cache": solution_cache
         }
+        if rolling is not None:
+            results["rolling_horizon"] = rolling
         return results
     except Exception as e:
         return {
@@ -473,31 +1541,459 @@ def optimize_network(
             "message": f"Optimization failed: {str(e)}"
         }
 
+# Clustered networks from aggregate_time_series/optimize_investment, keyed by
+# (path, mtime_ns, size, method, n_periods, period_length), least recently used first
+_aggregation_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_MAX_AGGREGATIONS = 8
+
+_AGGREGATION_METHODS = ("kmeans", "kmedoids", "segments")
+
+
+def _input_profiles(network: Network) -> Dict[Tuple[str, str], pd.DataFrame]:
+    """Collect the non-empty input time series (loads, availabilities, inflows, ...) of all components."""
+    profiles = {}
+    for component in network.iterate_components():
+        inputs = component.attrs.index[component.attrs.status.str.startswith("Input")]
+        for attr, df in component.pnl.items():
+            if attr in inputs and not df.empty:
+                profiles[(component.list_name, attr)] = df
+    return profiles
+
+
+def _kmedoids(features: np.ndarray, n_clusters: int, max_iter: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+    """Cluster the rows of features with alternating k-medoids, seeded with k-means++.
+
+    Returns the cluster label of every row and the row index of every medoid.
+    """
+    squared = (features ** 2).sum(axis=1)
+    dist = np.maximum(squared[:, None] + squared[None, :] - 2 * features @ features.T, 0.0)
+    rng = np.random.default_rng(0)
+    medoids = [int(rng.integers(len(features)))]
+    while len(medoids) < n_clusters:
+        nearest = dist[:, medoids].min(axis=1)
+        if nearest.sum() == 0:
+            medoids.append(int(np.setdiff1d(np.arange(len(features)), medoids)[0]))
+        else:
+            medoids.append(int(rng.choice(len(features), p=nearest / nearest.sum())))
+    medoids = np.array(medoids)
+    for _ in range(max_iter):
+        labels = dist[:, medoids].argmin(axis=1)
+        updated = medoids.copy()
+        for cluster in range(n_clusters):
+            members = np.flatnonzero(labels == cluster)
+            if len(members):
+                updated[cluster] = members[dist[np.ix_(members, members)].sum(axis=1).argmin()]
+        if np.array_equal(updated, medoids):
+            break
+        medoids = updated
+    return dist[:, medoids].argmin(axis=1), medoids
+
+
+def _segment(features: np.ndarray, weights: np.ndarray, n_segments: int) -> np.ndarray:
+    """Merge adjacent snapshots into n_segments, always merging the pair with the
+    smallest increase in weighted squared error (Ward linkage on a chain).
+
+    Returns the position of the first snapshot of every segment.
+    """
+    n = len(features)
+    means = features.astype(float).copy()
+    mass = weights.astype(float).copy()
+    nxt = np.arange(1, n + 1)
+    prv = np.arange(-1, n - 1)
+
+    def merge_cost(a: int) -> float:
+        b = nxt[a]
+        return mass[a] * mass[b] / (mass[a] + mass[b]) * float(((means[a] - means[b]) ** 2).sum())
+
+    # cost[a] is the cost of merging segment a with the segment after it
+    cost = np.full(n, np.inf)
+    for a in range(n - 1):
+        cost[a] = merge_cost(a)
+    for _ in range(n - n_segments):
+        a = int(cost.argmin())
+        b = nxt[a]
+        means[a] = (mass[a] * means[a] + mass[b] * means[b]) / (mass[a] + mass[b])
+        mass[a] += mass[b]
+        nxt[a] = nxt[b]
+        if nxt[a] < n:
+            prv[nxt[a]] = a
+        cost[b] = np.inf
+        cost[a] = merge_cost(a) if nxt[a] < n else np.inf
+        if prv[a] >= 0:
+            cost[prv[a]] = merge_cost(prv[a])
+    starts = [0]
+    while nxt[starts[-1]] < n:
+        starts.append(int(nxt[starts[-1]]))
+    return np.array(starts)
+
+
+def _aggregate_time_series(network: Network, method: str, n_periods: int,
+                           period_length: int) -> Tuple[Network, Dict[str, Any]]:
+    """Reduce the snapshots of a network to weighted representative periods or segments.
+
+    kmeans and kmedoids cluster consecutive periods of period_length snapshots
+    on their normalized input profiles and keep one representative period per
+    cluster (the cluster mean for kmeans, the medoid period for kmedoids).
+    segments merges adjacent snapshots into n_periods segments represented by
+    their mean, which keeps the chronology intact for storage.
+    """
+    if method not in _AGGREGATION_METHODS:
+        raise ValueError(f"Unknown aggregation method '{method}', expected one of {list(_AGGREGATION_METHODS)}")
+    if method == "kmeans" and not SKLEARN_AVAILABLE:
+        raise ImportError("kmeans aggregation requires scikit-learn (pip install scikit-learn)")
+    profiles = _input_profiles(network)
+    if not profiles:
+        raise ValueError("The network has no time-varying inputs to aggregate")
+
+    snapshots = network.snapshots
+    values = np.hstack([df.to_numpy(dtype=float) for df in profiles.values()])
+    scale = np.abs(values).max(axis=0)
+    scale[scale == 0] = 1.0
+    normed = values / scale
+    weightings = network.snapshot_weightings.to_numpy(dtype=float)
+    weights = network.snapshot_weightings.objective.to_numpy(dtype=float)
+
+    if method == "segments":
+        if not 1 <= n_periods <= len(snapshots):
+            raise ValueError(f"n_periods must be between 1 and the number of snapshots ({len(snapshots)})")
+        starts = _segment(normed, weights, n_periods)
+        stops = np.append(starts[1:], len(snapshots))
+        positions = starts
+        rep_values = np.vstack([np.average(values[a:b], axis=0, weights=weights[a:b])
+                                for a, b in zip(starts, stops)])
+        # All weightings, including the storage one, span the whole segment
+        rep_weightings = np.vstack([weightings[a:b].sum(axis=0) for a, b in zip(starts, stops)])
+        reconstructed = np.repeat(rep_values, stops - starts, axis=0)
+    else:
+        if len(snapshots) % period_length:
+            raise ValueError(f"The number of snapshots ({len(snapshots)}) is not a multiple of "
+                             f"period_length ({period_length})")
+        n_total = len(snapshots) // period_length
+        if not 1 <= n_periods <= n_total:
+            raise ValueError(f"n_periods must be between 1 and the number of periods ({n_total})")
+        features = normed.reshape(n_total, -1)
+        period_values = values.reshape(n_total, period_length, -1)
+        period_weights = weights.reshape(n_total, period_length)
+        if method == "kmeans":
+            labels = KMeans(n_clusters=n_periods, n_init=10, random_state=0).fit_predict(features)
+        else:
+            labels, medoids = _kmedoids(features, n_periods)
+        clusters = [np.flatnonzero(labels == cluster) for cluster in range(n_periods)]
+        clusters = [(cluster, members) for cluster, members in enumerate(clusters) if len(members)]
+        rep_periods, rep_blocks = [], {}
+        for cluster, members in clusters:
+            if method == "kmeans":
+                centroid = features[members].mean(axis=0)
+                rep_periods.append(members[((features[members] - centroid) ** 2).sum(axis=1).argmin()])
+                rep_blocks[cluster] = np.average(period_values[members], axis=0,
+                                                 weights=period_weights[members].sum(axis=1))
+            else:
+                rep_periods.append(medoids[cluster])
+                rep_blocks[cluster] = period_values[medoids[cluster]]
+        # Keep the representative periods in chronological order
+        order = np.argsort(rep_periods)
+        clusters = [clusters[i] for i in order]
+        rep_periods = [rep_periods[i] for i in order]
+        positions = np.concatenate([np.arange(p * period_length, (p + 1) * period_length) for p in rep_periods])
+        rep_values = np.vstack([rep_blocks[cluster] for cluster, _ in clusters])
+        rep_weightings = weightings[positions].copy()
+        # Objective and generator weightings count every member period; the
+        # storage weighting keeps the original duration of each snapshot
+        for column in ("objective", "generators"):
+            if column in network.snapshot_weightings.columns:
+                j = network.snapshot_weightings.columns.get_loc(column)
+                rep_weightings[:, j] = np.concatenate([
+                    weightings[:, j].reshape(n_total, period_length)[members].sum(axis=0)
+                    for _, members in clusters
+                ])
+        reconstructed = np.vstack([rep_blocks[cluster] for cluster in labels])
+
+    rep_snapshots = snapshots[positions]
+    clustered = network.copy()
+    clustered.set_snapshots(rep_snapshots)
+    clustered.snapshot_weightings = pd.DataFrame(rep_weightings, index=rep_snapshots,
+                                                 columns=network.snapshot_weightings.columns)
+    error = (reconstructed - values) / scale
+    rep_weights = clustered.snapshot_weightings.objective.to_numpy(dtype=float)
+    report = {"method": method, "snapshots_full": len(snapshots), "snapshots_reduced": len(rep_snapshots),
+              "normalized_rmse": float(np.sqrt(np.mean(error ** 2))), "profiles": {}}
+    column = 0
+    for (list_name, attr), df in profiles.items():
+        width = df.shape[1]
+        block = slice(column, column + width)
+        getattr(clustered, f"{list_name}_t")[attr] = pd.DataFrame(
+            rep_values[:, block], index=rep_snapshots, columns=df.columns)
+        full_sum = float(weights @ values[:, block].sum(axis=1))
+        reduced_sum = float(rep_weights @ rep_values[:, block].sum(axis=1))
+        report["profiles"][f"{list_name}.{attr}"] = {
+            "normalized_rmse": float(np.sqrt(np.mean(error[:, block] ** 2))),
+            "max_abs_error": float(np.abs(error[:, block]).max()),
+            "weighted_sum_error_pct": 100 * (reduced_sum - full_sum) / full_sum if full_sum else 0.0
+        }
+        column += width
+    return clustered, report
+
+
+def _get_aggregated_network(network_name: str, method: str, n_periods: int,
+                            period_length: int) -> Tuple[Network, Dict[str, Any]]:
+    """Get a copy of the clustered network for the file's current version, clustering it only once."""
+    path = os.path.abspath(network_name)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size, method, n_periods, period_length)
+    entry = _aggregation_cache.get(key)
+    if entry is None:
+        start_time = time.perf_counter()
+        clustered, report = _aggregate_time_series(_get_network(network_name), method, n_periods, period_length)
+        report["aggregation_time_s"] = time.perf_counter() - start_time
+        entry = {"network": clustered, "report": report}
+        _aggregation_cache[key] = entry
+        while len(_aggregation_cache) > _MAX_AGGREGATIONS:
+            _aggregation_cache.popitem(last=False)
+        cached = False
+    else:
+        _aggregation_cache.move_to_end(key)
+        cached = True
+    return entry["network"].copy(), dict(entry["report"], cached=cached)
+
+
+@mcp.tool()
+def aggregate_time_series(
+    network_name: str,
+    method: str = "kmeans",
+    n_periods: int = 12,
+    period_length: int = 24,
+    output_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """Reduce the snapshots to weighted representative periods ("kmeans", "kmedoids") or
+    chronological segments ("segments") and report the error against the full series.
+
+    The clustered network is cached for optimize_investment and, if output_path
+    is given, written to NetCDF.
+    """
+    try:
+        clustered, report = _get_aggregated_network(network_name, method, n_periods, period_length)
+        if output_path:
+            clustered.export_to_netcdf(output_path)
+            report["output_path"] = output_path
+        return {
+            "status": "success",
+            "message": f"Reduced {report['snapshots_full']} snapshots to {report['snapshots_reduced']}",
+            "aggregation": report
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Time series aggregation failed: {str(e)}"
+        }
+
+
+# Busmaps from cluster_network, keyed by (path, mtime_ns, size, method, n_clusters,
+# weighting), least recently used first
+_busmap_cache: "OrderedDict[Tuple, pd.Series]" = OrderedDict()
+_MAX_BUSMAPS = 16
+
+_CLUSTERING_METHODS = ("kmeans", "electrical")
+
+
+def _bus_weightings(network: Network, weighting: str) -> pd.Series:
+    """Integer bus weights for k-means: mean load plus generator capacity, or uniform."""
+    if weighting == "uniform":
+        return pd.Series(1, index=network.buses.index)
+    if weighting != "load":
+        raise ValueError(f"Unknown weighting '{weighting}', expected 'load' or 'uniform'")
+    load = network.loads.p_set.copy()
+    if not network.loads_t.p_set.empty:
+        load.update(network.loads_t.p_set.mean())
+    weights = (load.groupby(network.loads.bus).sum()
+               .add(network.generators.p_nom.groupby(network.generators.bus).sum(), fill_value=0)
+               .reindex(network.buses.index, fill_value=0).clip(lower=0))
+    if weights.max() > 0:
+        weights = weights / weights.max() * 100
+    return weights.round().astype(int).clip(lower=1)
+
+
+def _electrical_embedding(network: Network, buses: pd.Index, dimensions: int) -> pd.DataFrame:
+    """Embed buses so that euclidean distances approximate their electrical (resistance)
+    distance, using the smallest eigenpairs of the branch susceptance Laplacian.
+    """
+    rows, cols, susceptance = [], [], []
+    # Line reactances in ohm and transformer reactances in p.u. of s_nom, both on a 1 MVA base
+    lines = network.lines[network.lines.bus0.isin(buses) & network.lines.bus1.isin(buses)]
+    v_nom = network.buses.v_nom.reindex(lines.bus0).to_numpy()
+    branches = [(lines.bus0, lines.bus1, lines.x.to_numpy() / v_nom ** 2)]
+    transformers = network.transformers[network.transformers.bus0.isin(buses) &
+                                        network.transformers.bus1.isin(buses)]
+    branches.append((transformers.bus0, transformers.bus1,
+                     transformers.x.to_numpy() / transformers.s_nom.clip(lower=1e-3).to_numpy()))
+    for bus0, bus1, x_pu in branches:
+        rows.append(buses.get_indexer(bus0))
+        cols.append(buses.get_indexer(bus1))
+        susceptance.append(1.0 / np.clip(np.abs(x_pu), 1e-6, None))
+    i, j, b = np.concatenate(rows), np.concatenate(cols), np.concatenate(susceptance)
+    adjacency = sp.coo_matrix((np.concatenate([b, b]), (np.concatenate([i, j]), np.concatenate([j, i]))),
+                              shape=(len(buses), len(buses))).tocsr()
+    laplacian = sp.diags(np.asarray(adjacency.sum(axis=1)).ravel()) - adjacency
+    k = min(dimensions + 1, len(buses) - 1)
+    if len(buses) <= 1000:
+        values, vectors = np.linalg.eigh(laplacian.toarray())
+        values, vectors = values[:k], vectors[:, :k]
+    else:
+        # Shift-invert around a small negative value: the Laplacian itself is singular
+        values, vectors = spla.eigsh(laplacian.tocsc(), k=k, sigma=-1e-8 * b.max(), which="LM")
+        order = np.argsort(values)
+        values, vectors = values[order], vectors[:, order]
+    # Drop the constant eigenvector; near-zero eigenvalues (islands) are clamped
+    values = np.clip(values[1:], 1e-6 * max(values[-1], 1e-12), None)
+    return pd.DataFrame(vectors[:, 1:] / np.sqrt(values), index=buses)
+
+
+def _allocate_clusters(counts: pd.Series, n_clusters: int) -> pd.Series:
+    """Share n_clusters among groups of buses in proportion to their size, at least one each."""
+    if n_clusters < len(counts):
+        raise ValueError(f"n_clusters ({n_clusters}) is smaller than the number of bus carriers ({len(counts)})")
+    n_clusters = min(n_clusters, int(counts.sum()))
+    share = counts / counts.sum() * (n_clusters - len(counts))
+    allocation = (1 + np.floor(share)).astype(int).clip(upper=counts)
+    # Hand out the remaining clusters by largest remainder
+    for group in (share - np.floor(share)).sort_values(ascending=False).index.tolist() * 2:
+        if allocation.sum() >= n_clusters:
+            break
+        if allocation[group] < counts[group]:
+            allocation[group] += 1
+    return allocation
+
+
+def _busmap(network: Network, n_clusters: int, method: str, weighting: str) -> pd.Series:
+    """Map every bus to a cluster; buses of different carriers are never merged."""
+    if method not in _CLUSTERING_METHODS:
+        raise ValueError(f"Unknown clustering method '{method}', expected one of {list(_CLUSTERING_METHODS)}")
+    if not SKLEARN_AVAILABLE:
+        raise ImportError("Network clustering requires scikit-learn (pip install scikit-learn)")
+    groups = network.buses.groupby("carrier").groups
+    allocation = _allocate_clusters(pd.Series({c: len(b) for c, b in groups.items()}), n_clusters)
+    weights = _bus_weightings(network, weighting) if method == "kmeans" else None
+    busmap = []
+    for carrier, buses in groups.items():
+        buses = pd.Index(buses)
+        if allocation[carrier] >= len(buses):
+            labels = pd.Series(np.arange(len(buses)), index=buses)
+        elif method == "kmeans":
+            if (network.buses.loc[buses, ["x", "y"]] == 0).all().all():
+                raise ValueError("kmeans clustering needs bus coordinates x, y; use method='electrical'")
+            labels = busmap_by_kmeans(network, weights, allocation[carrier], buses_i=buses,
+                                      n_init=10, random_state=0)
+        else:
+            labels = busmap_by_hac(network, allocation[carrier], buses_i=buses,
+                                   feature=_electrical_embedding(network, buses, allocation[carrier]))
+        prefix = f"{carrier} " if len(groups) > 1 else ""
+        busmap.append(labels.astype(str).radd(prefix))
+    return pd.concat(busmap).reindex(network.buses.index).rename("busmap")
+
+
+@mcp.tool()
+def cluster_network(
+    network_name: str,
+    n_clusters: int,
+    output_path: str,
+    method: str = "kmeans",
+    weighting: str = "load",
+    line_length_factor: float = 1.0
+) -> Dict[str, Any]:
+    """Reduce a network to n_clusters buses and save it as NetCDF.
+
+    Buses are clustered by k-means on their coordinates weighted by load and
+    generation ("kmeans", weighting="uniform" for equal weights) or by
+    connectivity-constrained hierarchical clustering on electrical distance
+    ("electrical"). Lines between clusters are aggregated, generators are
+    grouped by carrier and loads and storage units per cluster. The busmap is
+    cached and written next to the reduced network as <output>_busmap.csv.
+    """
+    try:
+        network = _get_network(network_name)
+        path = os.path.abspath(network_name)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size, method, n_clusters, weighting)
+        start_time = time.perf_counter()
+        busmap = _busmap_cache.get(key)
+        busmap_cached = busmap is not None
+        if busmap_cached:
+            _busmap_cache.move_to_end(key)
+        else:
+            busmap = _busmap(network, n_clusters, method, weighting)
+            _busmap_cache[key] = busmap
+            while len(_busmap_cache) > _MAX_BUSMAPS:
+                _busmap_cache.popitem(last=False)
+        busmap_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        clustering = get_clustering_from_busmap(network, busmap, line_length_factor=line_length_factor,
+                                                aggregate_generators_weighted=True,
+                                                aggregate_one_ports={"Load", "StorageUnit"})
+        reduced = clustering.n if hasattr(clustering, "n") else clustering.network
+        aggregation_time = time.perf_counter() - start_time
+
+        _save_network(reduced, output_path)
+        busmap_path = os.path.splitext(output_path)[0] + "_busmap.csv"
+        busmap.to_csv(busmap_path, header=True)
+        sizes = busmap.value_counts()
+        return {
+            "status": "success",
+            "message": f"Reduced {len(network.buses)} buses to {len(reduced.buses)}",
+            "output_path": output_path,
+            "busmap_path": busmap_path,
+            "busmap_cached": busmap_cached,
+            "components": {
+                name: {"original": len(getattr(network, name)), "reduced": len(getattr(reduced, name))}
+                for name in ("buses", "lines", "links", "generators", "loads", "storage_units")
+            },
+            "buses_per_cluster": {"min": int(sizes.min()), "max": int(sizes.max()), "mean": float(sizes.mean())},
+            "timing": {"busmap_s": busmap_time, "aggregation_s": aggregation_time}
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Network clustering failed: {str(e)}"
+        }
+
+
 @mcp.tool()
 def optimize_investment(
     network_name: str,
     solver_name: str = "highs",
     carriers: Optional[List[str]] = None,
-    multi_investment_periods: bool = False
+    multi_investment_periods: bool = False,
+    aggregation: Optional[str] = None,
+    n_periods: int = 12,
+    period_length: int = 24
 ) -> Dict[str, Any]:
-    """Run investment optimization to determine optimal capacity expansion"""
-    network = Network(network_name)
-    
+    """Run investment optimization to determine optimal capacity expansion.
+
+    With aggregation ("kmeans", "kmedoids" or "segments") the snapshots are first
+    reduced to n_periods weighted representative periods of period_length
+    snapshots (or n_periods segments), see aggregate_time_series.
+    """
     try:
+        aggregation_report = None
+        if aggregation:
+            network, aggregation_report = _get_aggregated_network(network_name, aggregation, n_periods, period_length)
+        else:
+            network = _get_network(network_name, copy=True)
+
         # Set components as extendable if carriers specified
         if carriers:
             network.generators.loc[
                 network.generators.carrier.isin(carriers), "p_nom_extendable"
             ] = True
         
-        status = network.lopf(
-                    solver_name=solver_name
-                )
+        start_time = time.perf_counter()
+        status = _optimize(network, None, solver_name, {})
+        solve_time = time.perf_counter() - start_time
         
         # Extract investment results
         results = {
             "status": status,
             "objective": float(network.objective),
+            "solve_time_s": solve_time,
             "investments": {
                 "generators": {
                     gen: {
@@ -522,6 +2018,8 @@ def optimize_investment(
                 }
             }
         }
+        if aggregation_report is not None:
+            results["aggregation"] = aggregation_report
         return results
     except Exception as e:
         return {
@@ -536,7 +2034,7 @@ def import_from_csv_folder(folder_path: str) -> Dict[str, Any]:
         network = Network()
         network.import_from_csv_folder(folder_path)
         network_name = os.path.basename(folder_path) + ".nc"
-        network.export_to_netcdf(network_name)
+        _save_network(network, network_name)
         return {
             "status": "success",
             "message": f"Network imported from {folder_path} and saved to {network_name}"
@@ -551,7 +2049,7 @@ def import_from_csv_folder(folder_path: str) -> Dict[str, Any]:
 def export_to_csv_folder(network_name: str, folder_path: str) -> Dict[str, Any]:
     """Export network to CSV files"""
     try:
-        network = Network(network_name)
+        network = _get_network(network_name)
         network.export_to_csv_folder(folder_path)
         return {
             "status": "success",
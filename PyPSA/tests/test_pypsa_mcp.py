@@ -0,0 +1,551 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pypsa_mcp
+import xarray as xr
+
+
+class TestNetworkCache(unittest.TestCase):
+    """
+    Check that networks are read once and kept in sync with their files.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "test.nc")
+        pypsa_mcp._network_cache.clear()
+        network = pypsa.Network()
+        network.add("Bus", "Bus 1")
+        network.export_to_netcdf(self.path)
+
+    def tearDown(self):
+        pypsa_mcp._network_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def test_read_once(self):
+        first = pypsa_mcp._get_network(self.path)
+        misses = pypsa_mcp._cache_stats["misses"]
+        second = pypsa_mcp._get_network(self.path)
+        self.assertIs(first, second)
+        self.assertEqual(pypsa_mcp._cache_stats["misses"], misses)
+
+    def test_copy_does_not_modify_cache(self):
+        network = pypsa_mcp._get_network(self.path, copy=True)
+        network.add("Bus", "Bus 2")
+        self.assertEqual(len(pypsa_mcp._get_network(self.path).buses), 1)
+
+    def test_tool_writes_update_cache(self):
+        pypsa_mcp.add_bus(self.path, "Bus 2")
+        self.assertEqual(pypsa_mcp.get_network_info(self.path)["buses"], 2)
+
+    def test_changed_file_is_reloaded(self):
+        network = pypsa_mcp._get_network(self.path, copy=True)
+        network.add("Bus", "Bus 2")
+        network.export_to_netcdf(self.path)
+        # Make sure the mtime differs on coarse grained file systems
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(len(pypsa_mcp._get_network(self.path).buses), 2)
+
+    def test_eviction(self):
+        other = os.path.join(self.tmp_dir.name, "other.nc")
+        pypsa.Network().export_to_netcdf(other)
+        pypsa_mcp._get_network(other)
+        original = pypsa_mcp._MAX_CACHE_MB
+        pypsa_mcp._MAX_CACHE_MB = 0
+        try:
+            pypsa_mcp._get_network(self.path)
+        finally:
+            pypsa_mcp._MAX_CACHE_MB = original
+        self.assertEqual(list(pypsa_mcp._network_cache), [self.path])
+
+
+class TestBatchedConstruction(unittest.TestCase):
+    """
+    Check batched component additions and edit sessions.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "test.nc")
+        pypsa.Network().export_to_netcdf(self.path)
+
+    def tearDown(self):
+        pypsa_mcp._edit_sessions.clear()
+        pypsa_mcp._network_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def test_add_components(self):
+        components = [{"component": "Bus", "id": f"Bus {i}", "v_nom": 380.0} for i in range(3)]
+        components += [{"component": "Line", "id": "Line 0-1", "bus0": "Bus 0", "bus1": "Bus 1", "x": 0.1},
+                       {"component": "Load", "id": "Load 1", "bus": "Bus 1", "p_set": 10.0}]
+        result = pypsa_mcp.add_components(self.path, components)
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["added"], {"Bus": 3, "Line": 1, "Load": 1})
+
+        network = pypsa.Network(self.path)
+        self.assertEqual(len(network.buses), 3)
+        self.assertEqual(network.lines.at["Line 0-1", "bus1"], "Bus 1")
+        self.assertEqual(network.loads.at["Load 1", "p_set"], 10.0)
+
+    def test_edit_session_writes_on_commit(self):
+        pypsa_mcp.begin_edit_session(self.path)
+        pypsa_mcp.add_bus(self.path, "Bus 1")
+        pypsa_mcp.add_components(self.path, [{"component": "Bus", "id": "Bus 2"}])
+        self.assertEqual(len(pypsa.Network(self.path).buses), 0)
+
+        result = pypsa_mcp.commit_edit_session(self.path)
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(len(pypsa.Network(self.path).buses), 2)
+
+    def test_discard_edit_session(self):
+        pypsa_mcp.begin_edit_session(self.path)
+        pypsa_mcp.add_bus(self.path, "Bus 1")
+        pypsa_mcp.discard_edit_session(self.path)
+        self.assertEqual(pypsa_mcp.commit_edit_session(self.path)["status"], "error")
+        self.assertEqual(pypsa_mcp.get_network_info(self.path)["buses"], 0)
+
+
+class TestContingencyAnalysis(unittest.TestCase):
+    """
+    Check that BODF screening keeps every outage with a thermal violation.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "ring.nc")
+        network = pypsa.Network()
+        network.set_snapshots(pd.date_range("2030-01-01", periods=3, freq="h"))
+        buses = [f"Bus {i}" for i in range(6)]
+        network.add("Bus", buses, v_nom=380.0)
+        for i in range(6):
+            network.add("Line", f"Line {i}", bus0=buses[i], bus1=buses[(i + 1) % 6],
+                        x=0.1, r=0.01, s_nom=400.0)
+        # Parallel path between Bus 1 and Bus 2 whose outages do not overload anything
+        network.add("Bus", "Bus 6", v_nom=380.0)
+        network.add("Line", "Line 6", bus0="Bus 1", bus1="Bus 6", x=0.1, r=0.01, s_nom=400.0)
+        network.add("Line", "Line 7", bus0="Bus 6", bus1="Bus 2", x=0.1, r=0.01, s_nom=400.0)
+        network.add("Generator", "Gen 0", bus="Bus 0", p_nom=2000.0, control="Slack")
+        # Outages of the ring only overload it in the two high load snapshots
+        network.add("Load", "Load 3", bus="Bus 3", p_set=pd.Series([200.0, 500.0, 500.0], network.snapshots),
+                    q_set=50.0)
+        network.export_to_netcdf(self.path)
+
+    def tearDown(self):
+        pypsa_mcp._network_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def test_screen_matches_full(self):
+        full = pypsa_mcp.run_contingency_analysis(self.path)
+        screen = pypsa_mcp.run_contingency_analysis(self.path, mode="screen")
+        self.assertEqual(full["status"], "success")
+        self.assertEqual(screen["status"], "success")
+
+        full_results = {c["id"]: c for c in full["contingencies"]}
+        for contingency in screen["contingencies"]:
+            self.assertEqual(contingency, full_results[contingency["id"]])
+        for elem_id in screen["screening"]["screened_out"]:
+            self.assertEqual(full_results[elem_id]["loading_violations"], [])
+        self.assertLess(screen["timing"]["ac_solves"], len(full_results))
+
+    def test_all_snapshots_and_cube(self):
+        result = pypsa_mcp.run_contingency_analysis(self.path, output_dir=self.tmp_dir.name)
+        self.assertEqual(result["status"], "success")
+        violations = {c["id"]: c["loading_violations"] for c in result["contingencies"]}
+        self.assertEqual({v["snapshots"] for v in violations["Line 0"]}, {2})
+        self.assertEqual(result["summary"]["snapshots_with_violations"], 2)
+
+        with xr.open_dataset(result["cube"]["path"]) as cube:
+            self.assertEqual(cube.sizes["entry"], result["cube"]["entries"])
+            self.assertTrue((cube.loading_pct >= result["cube"]["threshold_pct"]).all())
+
+    def test_snapshot_subset(self):
+        result = pypsa_mcp.run_contingency_analysis(self.path, snapshots=["2030-01-01 00:00"])
+        self.assertEqual(result["summary"]["snapshots"], 1)
+        self.assertEqual(result["summary"]["with_violations"], 0)
+
+
+class TestPowerFlowBatches(unittest.TestCase):
+    """
+    Check the batched power flow against a single power flow over all snapshots.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "test.nc")
+        buses = [f"Bus {i}" for i in range(4)]
+        network = pypsa.Network()
+        network.set_snapshots(pd.date_range("2030-01-01", periods=20, freq="h"))
+        network.add("Bus", buses, v_nom=110.0)
+        network.add("Line", [f"Line {i}" for i in range(4)], bus0=buses, bus1=buses[1:] + buses[:1],
+                    x=2.0, r=0.5, s_nom=200.0)
+        network.add("Generator", "Gen 1", bus="Bus 0", p_nom=500.0, control="Slack")
+        network.add("Load", ["Load 1", "Load 2"], bus=["Bus 2", "Bus 3"],
+                    p_set=pd.DataFrame({"Load 1": np.linspace(20.0, 80.0, 20), "Load 2": np.linspace(60.0, 10.0, 20)},
+                                       index=network.snapshots),
+                    q_set=10.0)
+        network.export_to_netcdf(self.path)
+        self.network = network
+
+    def tearDown(self):
+        pypsa_mcp._network_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def assert_matches_power_flow(self, result):
+        self.assertEqual(result["status"], "success")
+        ids = result["buses"]["ids"]
+        np.testing.assert_allclose(result["buses"]["v_mag_pu"], self.network.buses_t.v_mag_pu[ids].to_numpy(),
+                                   atol=1e-8)
+        np.testing.assert_allclose(result["lines"]["p0"],
+                                   self.network.lines_t.p0[result["lines"]["ids"]].to_numpy(), atol=1e-6)
+
+    def test_seeded_batch(self):
+        self.network.pf()
+        result = pypsa_mcp.run_power_flow(self.path, batch_size=20)
+        self.assert_matches_power_flow(result)
+        convergence = result["convergence"]
+        self.assertTrue(convergence["all_converged"])
+        self.assertEqual(len(convergence["n_iter"]), 20)
+        # Snapshots after the first seed block start from their neighbour's solution
+        self.assertLessEqual(max(convergence["n_iter"][16:]), max(convergence["n_iter"][:16]))
+
+    def test_parallel_batches(self):
+        self.network.pf()
+        result = pypsa_mcp.run_power_flow(self.path, workers=2)
+        self.assert_matches_power_flow(result)
+        self.assertEqual(result["batches"]["batches"], 2)
+
+    def test_linear_batches(self):
+        self.network.lpf()
+        result = pypsa_mcp.run_power_flow(self.path, linear=True, batch_size=7)
+        self.assertEqual(result["batches"]["batches"], 3)
+        np.testing.assert_allclose(result["lines"]["p0"],
+                                   self.network.lines_t.p0[result["lines"]["ids"]].to_numpy(), atol=1e-6)
+
+
+class TestResultStore(unittest.TestCase):
+    """
+    Check that stored power flow results can be read back page by page.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "test.nc")
+        self.store = os.path.join(self.tmp_dir.name, "results")
+        network = pypsa.Network()
+        network.set_snapshots(pd.date_range("2030-01-01", periods=5, freq="h"))
+        network.add("Bus", ["Bus 1", "Bus 2"], v_nom=380.0)
+        network.add("Line", "Line 1", bus0="Bus 1", bus1="Bus 2", x=0.1, r=0.01, s_nom=1000.0)
+        network.add("Generator", "Gen 1", bus="Bus 1", p_nom=1000.0, control="Slack")
+        network.add("Load", "Load 1", bus="Bus 2", p_set=pd.Series(range(100, 600, 100), network.snapshots, dtype=float))
+        network.export_to_netcdf(self.path)
+
+    def tearDown(self):
+        pypsa_mcp._network_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def test_store_and_read_pages(self):
+        result = pypsa_mcp.run_power_flow(self.path, linear=True, output_dir=self.store)
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["results"]["lines"]["p0"]["shape"], [5, 1])
+        self.assertAlmostEqual(result["results"]["lines"]["p0"]["max"], 500.0)
+
+        page = pypsa_mcp.get_results(self.store, "lines", "p0", snapshot_slice=[0, 3])
+        self.assertEqual(page["ids"], ["Line 1"])
+        self.assertEqual(len(page["snapshots"]), 3)
+        self.assertEqual(page["next_slice"], [3, 6])
+        last = pypsa_mcp.get_results(self.store, "lines", "p0", snapshot_slice=page["next_slice"])
+        for value, expected in zip(page["data"][0] + last["data"][0], range(100, 600, 100)):
+            self.assertAlmostEqual(value, expected)
+        self.assertIsNone(last["next_slice"])
+
+    def test_missing_series(self):
+        pypsa_mcp.run_power_flow(self.path, linear=True, output_dir=self.store)
+        self.assertEqual(pypsa_mcp.get_results(self.store, "lines", "missing")["status"], "error")
+
+
+@unittest.skipUnless(pypsa_mcp.SKLEARN_AVAILABLE, "scikit-learn not available")
+class TestNetworkClustering(unittest.TestCase):
+    """
+    Check the spatial reduction of a network to cluster buses.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "test.nc")
+        self.output = os.path.join(self.tmp_dir.name, "reduced.nc")
+        pypsa_mcp._busmap_cache.clear()
+        buses = [f"Bus {i}" for i in range(8)]
+        network = pypsa.Network()
+        network.set_snapshots(pd.date_range("2030-01-01", periods=2, freq="h"))
+        # Two groups of four buses far apart, joined by a single weak line
+        network.add("Bus", buses, v_nom=380.0, x=[0, 1, 0, 1, 10, 11, 10, 11], y=[0, 0, 1, 1, 0, 0, 1, 1])
+        network.add("Line", [f"Line {i}" for i in range(8)], bus0=buses, bus1=buses[1:] + buses[:1],
+                    x=[1.0, 1.0, 1.0, 50.0, 1.0, 1.0, 1.0, 50.0], r=0.1, s_nom=500.0)
+        network.add("Load", [f"Load {i}" for i in range(8)], bus=buses, p_set=50.0)
+        network.add("Generator", ["Gas 1", "Gas 2", "Wind 1", "Wind 2"], bus=["Bus 0", "Bus 1", "Bus 0", "Bus 5"],
+                    carrier=["gas", "gas", "wind", "wind"], p_nom=200.0)
+        network.export_to_netcdf(self.path)
+
+    def tearDown(self):
+        pypsa_mcp._busmap_cache.clear()
+        pypsa_mcp._network_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def test_kmeans_reduction(self):
+        result = pypsa_mcp.cluster_network(self.path, 2, self.output)
+        self.assertEqual(result["status"], "success")
+        self.assertFalse(result["busmap_cached"])
+        self.assertEqual(result["components"]["buses"]["reduced"], 2)
+        # Gas 1 and Gas 2 share a cluster and carrier
+        self.assertEqual(result["components"]["generators"]["reduced"], 3)
+        reduced = pypsa.Network(self.output)
+        self.assertAlmostEqual(reduced.loads.p_set.sum(), 400.0)
+        self.assertAlmostEqual(reduced.generators.p_nom.sum(), 800.0)
+        busmap = pd.read_csv(result["busmap_path"], index_col=0).busmap
+        self.assertEqual(busmap["Bus 0"], busmap["Bus 3"])
+        self.assertNotEqual(busmap["Bus 0"], busmap["Bus 4"])
+        self.assertTrue(pypsa_mcp.cluster_network(self.path, 2, self.output)["busmap_cached"])
+
+    def test_electrical_reduction(self):
+        result = pypsa_mcp.cluster_network(self.path, 2, self.output, method="electrical")
+        self.assertEqual(result["status"], "success")
+        busmap = pd.read_csv(result["busmap_path"], index_col=0).busmap
+        # The weak lines 3 and 7 separate buses 0-3 from buses 4-7
+        self.assertEqual(busmap.iloc[:4].nunique(), 1)
+        self.assertEqual(busmap.iloc[4:].nunique(), 1)
+        self.assertEqual(result["components"]["lines"]["reduced"], 1)
+
+
+try:
+    import linopy
+    HIGHS_AVAILABLE = "highs" in linopy.available_solvers
+except ImportError:
+    HIGHS_AVAILABLE = False
+
+
+class TestTimeSeriesAggregation(unittest.TestCase):
+    """
+    Check the representative period and segment aggregation of snapshots.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "test.nc")
+        pypsa_mcp._aggregation_cache.clear()
+        snapshots = pd.date_range("2030-01-01", periods=6 * 24, freq="h")
+        hours = np.arange(len(snapshots)) % 24
+        days = np.arange(len(snapshots)) // 24
+        network = pypsa.Network()
+        network.set_snapshots(snapshots)
+        network.add("Bus", "Bus 1")
+        network.add("Load", "Load 1", bus="Bus 1",
+                    p_set=pd.Series(100.0 + 20.0 * np.sin(hours / 24 * 2 * np.pi) + 10.0 * (days % 2), snapshots))
+        network.add("Generator", "Solar", bus="Bus 1", p_nom_extendable=True, capital_cost=1000.0,
+                    p_max_pu=pd.Series(np.clip(np.sin((hours - 6) / 12 * np.pi), 0.0, None), snapshots))
+        network.add("Generator", "Gas", bus="Bus 1", p_nom_extendable=True, capital_cost=500.0,
+                    marginal_cost=50.0)
+        network.export_to_netcdf(self.path)
+
+    def tearDown(self):
+        pypsa_mcp._aggregation_cache.clear()
+        pypsa_mcp._network_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def test_representative_periods_keep_weightings(self):
+        for method in ("kmeans", "kmedoids"):
+            if method == "kmeans" and not pypsa_mcp.SKLEARN_AVAILABLE:
+                continue
+            clustered, report = pypsa_mcp._get_aggregated_network(self.path, method, 2, 24)
+            self.assertEqual(len(clustered.snapshots), 48)
+            self.assertAlmostEqual(clustered.snapshot_weightings.objective.sum(), 144.0)
+            self.assertTrue((clustered.snapshot_weightings.stores == 1.0).all())
+            # Every other day is identical, so two periods reproduce the series exactly
+            self.assertAlmostEqual(report["normalized_rmse"], 0.0)
+
+    def test_segments_and_cache(self):
+        result = pypsa_mcp.aggregate_time_series(self.path, "segments", 20)
+        self.assertEqual(result["status"], "success")
+        report = result["aggregation"]
+        self.assertEqual(report["snapshots_reduced"], 20)
+        self.assertFalse(report["cached"])
+        self.assertAlmostEqual(report["profiles"]["loads.p_set"]["weighted_sum_error_pct"], 0.0)
+        clustered, report = pypsa_mcp._get_aggregated_network(self.path, "segments", 20, 24)
+        self.assertTrue(report["cached"])
+        self.assertTrue(clustered.snapshots.is_monotonic_increasing)
+        self.assertAlmostEqual(clustered.snapshot_weightings.stores.sum(), 144.0)
+
+    def test_invalid_period_length(self):
+        result = pypsa_mcp.aggregate_time_series(self.path, "kmedoids", 2, 25)
+        self.assertEqual(result["status"], "error")
+
+    @unittest.skipUnless(HIGHS_AVAILABLE, "HiGHS solver not available")
+    def test_aggregated_investment_matches_full(self):
+        full = pypsa_mcp.optimize_investment(self.path)
+        reduced = pypsa_mcp.optimize_investment(self.path, aggregation="kmedoids", n_periods=2)
+        self.assertEqual(reduced["aggregation"]["snapshots_reduced"], 48)
+        self.assertAlmostEqual(reduced["objective"], full["objective"], places=2)
+
+
+@unittest.skipUnless(HIGHS_AVAILABLE, "HiGHS solver not available")
+class TestSolutionCache(unittest.TestCase):
+    """
+    Check that repeated optimizations are served from the solution cache.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "test.nc")
+        self.basis_dir = pypsa_mcp._BASIS_DIR
+        pypsa_mcp._BASIS_DIR = os.path.join(self.tmp_dir.name, "bases")
+        pypsa_mcp._solution_cache.clear()
+        network = pypsa.Network()
+        network.set_snapshots(pd.date_range("2030-01-01", periods=4, freq="h"))
+        network.add("Bus", ["Bus 1", "Bus 2"], v_nom=380.0)
+        network.add("Line", "Line 1", bus0="Bus 1", bus1="Bus 2", x=0.1, r=0.01, s_nom=300.0)
+        network.add("Generator", "Cheap", bus="Bus 1", p_nom=1000.0, marginal_cost=10.0)
+        network.add("Generator", "Expensive", bus="Bus 2", p_nom=1000.0, marginal_cost=50.0)
+        network.add("Load", "Load 1", bus="Bus 2", p_set=pd.Series([100.0, 400.0, 500.0, 200.0], network.snapshots))
+        network.export_to_netcdf(self.path)
+        self.network = network
+
+    def tearDown(self):
+        pypsa_mcp._BASIS_DIR = self.basis_dir
+        pypsa_mcp._solution_cache.clear()
+        pypsa_mcp._network_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def test_repeated_run_hits(self):
+        first = pypsa_mcp.optimize_network(self.path)
+        second = pypsa_mcp.optimize_network(self.path)
+        self.assertFalse(first["solution_cache"]["hit"])
+        self.assertTrue(second["solution_cache"]["hit"])
+        self.assertEqual(second["solution_cache"]["hits"] - first["solution_cache"]["hits"], 1)
+        self.assertEqual(first["objective"], second["objective"])
+        self.assertEqual(first["generators"], second["generators"])
+        # Different solver options are a different run
+        third = pypsa_mcp.optimize_network(self.path, solver_options={"threads": 1})
+        self.assertFalse(third["solution_cache"]["hit"])
+
+    def test_hit_does_not_copy_network(self):
+        pypsa_mcp.optimize_network(self.path)
+        with patch.object(pypsa.Network, "copy", autospec=True, side_effect=pypsa.Network.copy) as copy:
+            result = pypsa_mcp.optimize_network(self.path)
+        self.assertTrue(result["solution_cache"]["hit"])
+        copy.assert_not_called()
+
+    def test_changed_file_is_rehashed(self):
+        first = pypsa_mcp.optimize_network(self.path)
+        self.network.loads_t.p_set.iloc[0] = 150.0
+        self.network.export_to_netcdf(self.path)
+        second = pypsa_mcp.optimize_network(self.path)
+        self.assertFalse(second["solution_cache"]["hit"])
+        self.assertNotEqual(first["solution_cache"]["key"], second["solution_cache"]["key"])
+
+    def test_memory_budget_evicts_oldest(self):
+        pypsa_mcp.optimize_network(self.path)
+        memory_mb = next(iter(pypsa_mcp._solution_cache.values()))["memory_bytes"] / 1024 ** 2
+        with patch.object(pypsa_mcp, "_MAX_SOLUTION_CACHE_MB", 1.5 * memory_mb):
+            result = pypsa_mcp.optimize_network(self.path, solver_options={"threads": 1})
+            self.assertEqual(len(pypsa_mcp._solution_cache), 1)
+            self.assertLessEqual(result["solution_cache"]["memory_mb"], result["solution_cache"]["max_memory_mb"])
+            # The newest solution is kept
+            self.assertTrue(pypsa_mcp.optimize_network(self.path, solver_options={"threads": 1})
+                            ["solution_cache"]["hit"])
+
+    def test_changed_costs_warm_start(self):
+        pypsa_mcp.optimize_network(self.path)
+        self.network.generators.loc["Expensive", "marginal_cost"] = 40.0
+        self.network.export_to_netcdf(self.path)
+        result = pypsa_mcp.optimize_network(self.path)
+        self.assertFalse(result["solution_cache"]["hit"])
+        self.assertTrue(result["solution_cache"]["warm_start"])
+        self.network.optimize(solver_name="highs")
+        self.assertAlmostEqual(result["objective"], float(self.network.objective), places=4)
+
+
+@unittest.skipUnless(HIGHS_AVAILABLE, "HiGHS solver not available")
+class TestRollingHorizon(unittest.TestCase):
+    """
+    Check the rolling horizon optimization against a single optimization.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "test.nc")
+        network = pypsa.Network()
+        network.set_snapshots(pd.date_range("2030-01-01", periods=6, freq="h"))
+        network.add("Bus", ["Bus 1", "Bus 2"], v_nom=380.0)
+        network.add("Line", "Line 1", bus0="Bus 1", bus1="Bus 2", x=0.1, r=0.01, s_nom=300.0)
+        network.add("Generator", "Cheap", bus="Bus 1", p_nom=1000.0, marginal_cost=10.0)
+        network.add("Generator", "Expensive", bus="Bus 2", p_nom=1000.0, marginal_cost=50.0)
+        network.add("Load", "Load 1", bus="Bus 2",
+                    p_set=pd.Series([100.0, 200.0, 400.0, 500.0, 300.0, 100.0], network.snapshots))
+        network.export_to_netcdf(self.path)
+        self.network = network
+
+    def tearDown(self):
+        pypsa_mcp._solution_cache.clear()
+        pypsa_mcp._network_cache.clear()
+        self.tmp_dir.cleanup()
+
+    def test_independent_windows_match_full_objective(self):
+        self.network.optimize(solver_name="highs")
+        result = pypsa_mcp.optimize_network(self.path, horizon=2)
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(result["rolling_horizon"]["windows_total"], 3)
+        self.assertAlmostEqual(result["objective"], float(self.network.objective), places=4)
+
+    def _optimize_with_storage(self):
+        network = pypsa.Network(self.path)
+        network.add("StorageUnit", "Battery", bus="Bus 2", p_nom=100.0, max_hours=4.0)
+        network.export_to_netcdf(self.path)
+        result = pypsa_mcp.optimize_network(self.path, horizon=3, overlap=1)
+        self.assertEqual(result["status"], "ok")
+        solved = next(iter(pypsa_mcp._solution_cache.values()))["network"]
+        return result, solved
+
+    def test_storage_state_of_charge_handoff(self):
+        result, solved = self._optimize_with_storage()
+        windows = result["rolling_horizon"]["windows"]
+        self.assertEqual([w["start"] for w in windows], ["2030-01-01 00:00:00", "2030-01-01 02:00:00",
+                                                         "2030-01-01 04:00:00"])
+        self.assertFalse(result["rolling_horizon"]["parallel"])
+        state_of_charge = solved.storage_units_t.state_of_charge["Battery"]
+        self.assertGreater(state_of_charge.max(), 0.0)
+        for window in windows[1:]:
+            previous = state_of_charge.index[state_of_charge.index.get_loc(pd.Timestamp(window["start"])) - 1]
+            self.assertAlmostEqual(window["state_of_charge_initial"]["Battery"], state_of_charge[previous],
+                                   places=4)
+
+    def test_overlap_objective_counts_committed_snapshots(self):
+        result, solved = self._optimize_with_storage()
+        windows = result["rolling_horizon"]["windows"]
+        # The solved network holds the committed dispatch of every snapshot
+        committed_cost = (solved.generators_t.p * solved.generators.marginal_cost).sum().sum()
+        self.assertAlmostEqual(result["objective"], committed_cost, places=4)
+        self.assertLess(result["objective"], sum(w["objective"] for w in windows) - 1.0)
+
+    def test_ramp_limits_couple_windows(self):
+        network = pypsa.Network(self.path)
+        network.generators.loc["Cheap", "ramp_limit_up"] = 0.05
+        network.export_to_netcdf(self.path)
+        result = pypsa_mcp.optimize_network(self.path, horizon=2, workers=2)
+        self.assertEqual(result["status"], "ok")
+        self.assertFalse(result["rolling_horizon"]["parallel"])
+        solved = next(iter(pypsa_mcp._solution_cache.values()))["network"]
+        # The ramp limit also holds across the boundaries between windows
+        self.assertLessEqual(solved.generators_t.p["Cheap"].diff().max(), 50.0 + 1e-6)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
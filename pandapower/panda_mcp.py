@@ -1,8 +1,35 @@
 from typing import Dict, List, Optional, Tuple, Any, Union
+from collections import OrderedDict
+import copy
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import time
+import numpy as np
+import pandas as pd
 import pandapower as pp
+import pandapower.shortcircuit as sc
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import splu
+from pandapower.pypower.idx_brch import F_BUS, T_BUS, PF, QF, PT, QT
+from pandapower.pypower.idx_bus import VM
+from pandapower.pypower.makePTDF import makePTDF
+from pandapower.pypower.makeLODF import makeLODF
 from mcp.server.fastmcp import FastMCP
 import logging
 
+# Parquet export availability check
+try:
+    import pyarrow
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -12,40 +39,309 @@ logger = logging.getLogger(__name__)
 logger.info("Initializing Pandapower Analysis Server")
 mcp = FastMCP("Pandapower Analysis Server")
 
-# Global variable to store the current network
-_current_net = None
+# Loaded networks by id, least recently used first. Each entry holds the net,
+# its source file (path and mtime), the bus results of its last converged power
+# flow, its cached short-circuit results and the violation index of its last
+# contingency analysis.
+_networks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_current_network_id = None
+
+# Memory budget of the network registry, least recently used networks are evicted beyond it
+_MAX_REGISTRY_MB = float(os.environ.get("PANDAPOWER_MCP_REGISTRY_MB", 2048))
+
+# On-disk cache of parsed .json networks, keyed by file path, mtime and content hash
+_PARSE_CACHE_DIR = os.environ.get(
+    "PANDAPOWER_MCP_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "pandapower_mcp"))
+
+# Network (and warm start bus results) shipped once to each worker process, and the
+# queue on which workers report the chunks they start
+_worker_net = None
+_worker_res_bus = None
+_worker_started = None
+
+# Profile targets (element, column) that only change bus injections, so the
+# internal power flow model can be recycled between time steps
+_RECYCLE_BUS_PQ_TARGETS = {("load", "p_mw"), ("load", "q_mvar"), ("load", "scaling"),
+                           ("sgen", "p_mw"), ("sgen", "q_mvar"), ("sgen", "scaling"),
+                           ("storage", "p_mw"), ("storage", "q_mvar")}
+_RECYCLE_GEN_TARGETS = {("gen", "p_mw"), ("gen", "vm_pu")}
+
+# Result variables written by run_timeseries by default
+_DEFAULT_TIMESERIES_OUTPUTS = ["res_bus.vm_pu", "res_line.loading_percent", "res_trafo.loading_percent"]
+
+# Metrics available to run_scenario_sweep
+_SWEEP_METRICS = ["min_vm_pu", "max_vm_pu", "max_line_loading_percent",
+                  "max_trafo_loading_percent", "losses_mw"]
 
-def _get_network() -> pp.pandapowerNet:
-    """Get the current pandapower network instance.
+# Scenario count from which run_scenario_sweep uses all cores by default
+_PARALLEL_SWEEP_MIN_SCENARIOS = 64
+
+# Voltage margin (pu) inside the limits at which screened outages are flagged for AC re-solve
+_SCREEN_VOLTAGE_MARGIN_PU = 0.01
+
+# Result columns checked for contingency violations and the default limits
+_VIOLATION_TABLES = (("bus", "vm_pu"), ("line", "loading_percent"), ("trafo", "loading_percent"))
+_DEFAULT_VIOLATION_LIMITS = {
+    "vm_min_pu": 0.95,
+    "vm_max_pu": 1.05,
+    "line_max_loading_percent": 100.0,
+    "trafo_max_loading_percent": 100.0
+}
+
+def _net_memory_bytes(net: pp.pandapowerNet) -> int:
+    """Estimate the memory used by the tables of a network."""
+    return int(sum(df.memory_usage(deep=True).sum() for df in net.values()
+                   if isinstance(df, pd.DataFrame)))
+
+
+def _register_network(network_id: str, net: pp.pandapowerNet,
+                      file_path: Optional[str] = None) -> Dict[str, Any]:
+    """Add a network to the registry, make it current and evict old networks.
     
+    Args:
+        network_id: Name of the network in the registry
+        net: Network to register
+        file_path: File the network was loaded from (optional)
+        
     Returns:
-        pp.pandapowerNet: The current network or raises error if none loaded
+        The registry entry of the network
     """
-    global _current_net
+    global _current_network_id
+    _networks[network_id] = {
+        "net": net,
+        "file_path": os.path.abspath(file_path) if file_path else None,
+        "file_mtime_ns": os.stat(file_path).st_mtime_ns if file_path else None,
+        "last_converged_res_bus": None,
+        "sc_cache": None,
+        "violation_index": None
+    }
+    _networks.move_to_end(network_id)
+    _current_network_id = network_id
+    _evict_networks()
+    return _networks[network_id]
+
+
+def _evict_networks() -> None:
+    """Drop least recently used networks until the registry fits its memory budget."""
+    max_bytes = _MAX_REGISTRY_MB * 1024 ** 2
+    sizes = {network_id: _net_memory_bytes(entry["net"]) for network_id, entry in _networks.items()}
+    total = sum(sizes.values())
+    for network_id in list(_networks):
+        if total <= max_bytes:
+            break
+        if network_id == _current_network_id:
+            continue
+        logger.info(f"Evicting network '{network_id}' from the registry")
+        del _networks[network_id]
+        total -= sizes[network_id]
+
+
+def _get_entry(network_id: Optional[str] = None) -> Dict[str, Any]:
+    """Get the registry entry of a network and mark it as most recently used.
     
-    if _current_net is None:
+    Args:
+        network_id: Name of the network (default: the current network)
+        
+    Returns:
+        Dict with the network and its cached state, or raises error if not loaded
+    """
+    if network_id is None:
+        network_id = _current_network_id
+    if network_id is None:
         raise RuntimeError("No pandapower network is currently loaded. Please create or load a network first.")
-    return _current_net
+    if network_id not in _networks:
+        raise RuntimeError(f"Network '{network_id}' is not loaded. Please create or load it first.")
+    _networks.move_to_end(network_id)
+    return _networks[network_id]
+
+
+def _get_network(network_id: Optional[str] = None) -> pp.pandapowerNet:
+    """Get a pandapower network instance from the registry.
+    
+    Args:
+        network_id: Name of the network (default: the current network)
+    
+    Returns:
+        pp.pandapowerNet: The network or raises error if none loaded
+    """
+    return _get_entry(network_id)["net"]
+
+
+def _encode_table(df, fields: Optional[List[str]] = None,
+                  float32: bool = False) -> Dict[str, Any]:
+    """Encode a DataFrame as column names plus one value array per column.
+    
+    Args:
+        df: Table to encode
+        fields: Columns to keep (columns missing from the table are skipped)
+        float32: Round float columns to float32 precision
+        
+    Returns:
+        Dict with the index, the column names and the column value arrays
+    """
+    if fields is not None:
+        df = df[[col for col in fields if col in df.columns]]
+    data = []
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype.kind == 'f':
+            if float32:
+                # Shortest decimal repr at float32 precision keeps the JSON small
+                values = values.astype(np.float32).astype(str).astype(np.float64)
+            values = np.where(np.isnan(values), None, values)
+        data.append(values.tolist())
+    return {
+        "index": df.index.tolist(),
+        "columns": [str(col) for col in df.columns],
+        "data": data
+    }
+
+
+def _summarize_table(df) -> Dict[str, Any]:
+    """Get row count and min/max/mean of the numeric columns of a table."""
+    numeric = df.select_dtypes(include='number')
+    stats = numeric.agg(['min', 'max', 'mean']) if len(numeric.columns) else None
+    return {
+        "rows": len(df),
+        "stats": _encode_table(stats) if stats is not None else None
+    }
+
+
+def _export_tables(tables: Dict[str, Any], output_dir: str) -> Dict[str, Any]:
+    """Write full tables to Parquet files and summarize them.
+    
+    Args:
+        tables: Tables to write, keyed by name
+        output_dir: Directory for the Parquet files (created if missing)
+        
+    Returns:
+        Dict containing the output directory, the file per table and summary statistics
+    """
+    if not PYARROW_AVAILABLE:
+        raise ValueError("pyarrow package not installed. Install it to export Parquet files.")
+    os.makedirs(output_dir, exist_ok=True)
+    files = {}
+    summary = {}
+    for name, df in tables.items():
+        path = os.path.join(output_dir, f"{name}.parquet")
+        df.to_parquet(path)
+        files[name] = os.path.abspath(path)
+        summary[name] = _summarize_table(df)
+    return {
+        "output_dir": os.path.abspath(output_dir),
+        "files": files,
+        "summary": summary
+    }
+
+
+def _file_hash(file_path: str) -> str:
+    """Get the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_cache_index() -> Dict[str, Any]:
+    """Read the parse cache index mapping file paths to mtime, size and cache key."""
+    index_path = os.path.join(_PARSE_CACHE_DIR, "index.json")
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path) as f:
+        return json.load(f)
+
+
+def _write_cache_index(index: Dict[str, Any]) -> None:
+    """Atomically write the parse cache index."""
+    os.makedirs(_PARSE_CACHE_DIR, exist_ok=True)
+    index_path = os.path.join(_PARSE_CACHE_DIR, "index.json")
+    with open(index_path + ".tmp", 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(index_path + ".tmp", index_path)
+
+
+def _load_json_cached(file_path: str) -> Tuple[pp.pandapowerNet, bool]:
+    """Load a .json network through the on-disk parse cache.
+    
+    The content hash is only recomputed when the file's mtime or size differ
+    from the cache index. Cached networks are pickles, which load much faster
+    than ``pp.from_json``, and are tied to the installed pandapower version.
+    
+    Args:
+        file_path: Path to the .json network file
+        
+    Returns:
+        Tuple of the network and whether it came from the cache
+    """
+    abs_path = os.path.abspath(file_path)
+    stat = os.stat(abs_path)
+    index = _read_cache_index()
+    record = index.get(abs_path)
+    if record is None or record["mtime_ns"] != stat.st_mtime_ns or record["size"] != stat.st_size:
+        content_hash = _file_hash(abs_path)
+    else:
+        content_hash = record["content_hash"]
+    key = hashlib.sha256(f"{content_hash}:{pp.__version__}".encode()).hexdigest()
+    cache_path = os.path.join(_PARSE_CACHE_DIR, f"{key}.p")
+
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                net = pickle.load(f)
+            hit = True
+        except Exception as e:
+            logger.warning(f"Discarding unreadable parse cache entry {cache_path}: {e}")
+            net = None
+    else:
+        net = None
+    if net is None:
+        net = pp.from_json(abs_path)
+        hit = False
+
+    # The cache is only an optimization, so a cache directory that cannot be written
+    # must not fail the load
+    try:
+        if not hit:
+            os.makedirs(_PARSE_CACHE_DIR, exist_ok=True)
+            with open(cache_path + ".tmp", 'wb') as f:
+                pickle.dump(net, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(cache_path + ".tmp", cache_path)
+        index[abs_path] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "content_hash": content_hash,
+            "cache_file": os.path.basename(cache_path),
+            "pandapower_version": pp.__version__
+        }
+        _write_cache_index(index)
+    except OSError as e:
+        logger.warning(f"Could not write parse cache {_PARSE_CACHE_DIR}: {e}")
+    return net, hit
 
 
 @mcp.tool()
-def create_empty_network() -> Dict[str, Any]:
+def create_empty_network(network_id: str = "network") -> Dict[str, Any]:
     """Create an empty pandapower network.
     
+    Args:
+        network_id: Name of the new network in the registry (replaces an existing one)
+    
     Returns:
         Dict containing status and network information
     """
     logger.info("Creating an empty pandapower network")
-    global _current_net
     try:
-        _current_net = pp.create_empty_network()
+        net = _register_network(network_id, pp.create_empty_network())["net"]
         return {
             "status": "success",
             "message": "Empty network created successfully",
+            "network_id": network_id,
             "network_info": {
-                "buses": len(_current_net.bus),
-                "lines": len(_current_net.line),
-                "trafos": len(_current_net.trafo)
+                "buses": len(net.bus),
+                "lines": len(net.line),
+                "trafos": len(net.trafo)
             }
         }
     except Exception as e:
@@ -55,32 +351,66 @@ def create_empty_network() -> Dict[str, Any]:
         }
 
 @mcp.tool()
-def load_network(file_path: str) -> Dict[str, Any]:
+def load_network(file_path: str, network_id: Optional[str] = None,
+                 reload: bool = False, use_cache: bool = True) -> Dict[str, Any]:
     """Load a pandapower network from a file.
     
+    Networks are kept in a registry and made current when loaded. Loading an
+    unchanged file that is already registered under the same id only switches
+    to it, without parsing the file again. Parsed .json files are also kept in
+    an on-disk cache so that unchanged files load quickly in new sessions.
+    
     Args:
         file_path: Path to the network file (.json, .p)
+        network_id: Name of the network in the registry (default: file name without extension)
+        reload: Read the file again even if it is already loaded
+        use_cache: Use the on-disk parse cache for .json files
         
     Returns:
         Dict containing status and network information
     """
     logger.info(f"Loading network from file: {file_path}")
-    global _current_net
+    global _current_network_id
     try:
-        if file_path.endswith('.json'):
-            _current_net = pp.from_json(file_path)
-        elif file_path.endswith('.p'):
-            _current_net = pp.from_pickle(file_path)
+        if network_id is None:
+            network_id = os.path.splitext(os.path.basename(file_path))[0]
+
+        entry = _networks.get(network_id)
+        cached = (not reload and entry is not None
+                  and entry["file_path"] == os.path.abspath(file_path)
+                  and entry["file_mtime_ns"] == os.stat(file_path).st_mtime_ns)
+        parse_cache = None
+        start_time = time.perf_counter()
+        if cached:
+            _networks.move_to_end(network_id)
+            _current_network_id = network_id
         else:
-            raise ValueError("Unsupported file format. Use .json or .p files.")
+            if file_path.endswith('.json'):
+                if use_cache:
+                    net, hit = _load_json_cached(file_path)
+                    parse_cache = "hit" if hit else "miss"
+                else:
+                    net = pp.from_json(file_path)
+            elif file_path.endswith('.p'):
+                net = pp.from_pickle(file_path)
+            else:
+                raise ValueError("Unsupported file format. Use .json or .p files.")
+            entry = _register_network(network_id, net, file_path)
+        net = entry["net"]
             
         return {
             "status": "success",
-            "message": f"Network loaded successfully from {file_path}",
+            "message": (f"Network '{network_id}' already loaded from {file_path}" if cached
+                        else f"Network loaded successfully from {file_path}"),
+            "network_id": network_id,
+            "cached": cached,
+            "parse_cache": parse_cache,
+            "load_time_s": round(time.perf_counter() - start_time, 4),
             "network_info": {
-                "buses": len(_current_net.bus),
-                "lines": len(_current_net.line),
-                "trafos": len(_current_net.trafo)
+                "buses": len(net.bus),
+                "lines": len(net.line),
+                "trafos": len(net.trafo),
+                "memory_mb": round(_net_memory_bytes(net) / 1024 ** 2, 3)
             }
         }
     except FileNotFoundError:
@@ -99,38 +429,218 @@ def load_network(file_path: str) -> Dict[str, Any]:
             "message": f"Failed to load network: {str(e)}"
         }
 
+@mcp.tool()
+def list_networks() -> Dict[str, Any]:
+    """List the networks in the registry with their estimated memory usage.
+    
+    Returns:
+        Dict containing the loaded networks, least recently used first
+    """
+    logger.info("Listing loaded networks")
+    networks = []
+    for network_id, entry in _networks.items():
+        networks.append({
+            "network_id": network_id,
+            "file_path": entry["file_path"],
+            "current": network_id == _current_network_id,
+            "buses": len(entry["net"].bus),
+            "memory_mb": round(_net_memory_bytes(entry["net"]) / 1024 ** 2, 3)
+        })
+    return {
+        "status": "success",
+        "message": f"{len(networks)} network(s) loaded",
+        "networks": networks,
+        "max_registry_mb": _MAX_REGISTRY_MB
+    }
+
+@mcp.tool()
+def unload_network(network_id: str) -> Dict[str, Any]:
+    """Remove a network from the registry.
+    
+    Args:
+        network_id: Name of the network to remove
+        
+    Returns:
+        Dict containing status information
+    """
+    logger.info(f"Unloading network: {network_id}")
+    global _current_network_id
+    if network_id not in _networks:
+        return {
+            "status": "error",
+            "message": f"Network '{network_id}' is not loaded"
+        }
+    del _networks[network_id]
+    if _current_network_id == network_id:
+        # Fall back to the most recently used remaining network
+        _current_network_id = next(reversed(_networks), None)
+    return {
+        "status": "success",
+        "message": f"Network '{network_id}' unloaded",
+        "current_network_id": _current_network_id
+    }
+
+@mcp.tool()
+def get_parse_cache_info() -> Dict[str, Any]:
+    """Get the entries of the on-disk parse cache for .json networks.
+    
+    Returns:
+        Dict containing the cache directory, its entries and total size
+    """
+    logger.info("Retrieving parse cache information")
+    try:
+        index = _read_cache_index()
+        entries = []
+        for file_path, record in index.items():
+            cache_path = os.path.join(_PARSE_CACHE_DIR, record["cache_file"])
+            exists = os.path.exists(cache_path)
+            entries.append({
+                "file_path": file_path,
+                "content_hash": record["content_hash"],
+                "pandapower_version": record["pandapower_version"],
+                "cache_file": cache_path if exists else None,
+                "size_mb": round(os.path.getsize(cache_path) / 1024 ** 2, 3) if exists else 0.0
+            })
+        return {
+            "status": "success",
+            "message": f"{len(entries)} cached network file(s)",
+            "cache_dir": _PARSE_CACHE_DIR,
+            "entries": entries,
+            "total_size_mb": round(sum(entry["size_mb"] for entry in entries), 3)
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to read parse cache: {str(e)}"
+        }
+
+@mcp.tool()
+def clear_parse_cache(file_path: Optional[str] = None) -> Dict[str, Any]:
+    """Clear the on-disk parse cache for .json networks.
+    
+    Args:
+        file_path: Only remove the cache entry of this network file (optional)
+        
+    Returns:
+        Dict containing the number of removed entries
+    """
+    logger.info("Clearing parse cache")
+    try:
+        index = _read_cache_index()
+        if file_path is not None:
+            abs_path = os.path.abspath(file_path)
+            if abs_path not in index:
+                return {
+                    "status": "error",
+                    "message": f"No parse cache entry for {file_path}"
+                }
+            remove = [abs_path]
+        else:
+            remove = list(index)
+        for path in remove:
+            record = index.pop(path)
+            cache_path = os.path.join(_PARSE_CACHE_DIR, record["cache_file"])
+            # Identical files share a cache file, keep it while still referenced
+            still_used = any(other["cache_file"] == record["cache_file"] for other in index.values())
+            if os.path.exists(cache_path) and not still_used:
+                os.remove(cache_path)
+        if file_path is None and os.path.isdir(_PARSE_CACHE_DIR):
+            # Also drop cache files no longer referenced by the index
+            for name in os.listdir(_PARSE_CACHE_DIR):
+                if name.endswith('.p'):
+                    os.remove(os.path.join(_PARSE_CACHE_DIR, name))
+        _write_cache_index(index)
+        return {
+            "status": "success",
+            "message": f"Removed {len(remove)} parse cache entr{'y' if len(remove) == 1 else 'ies'}",
+            "removed": len(remove)
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to clear parse cache: {str(e)}"
+        }
+
 @mcp.tool()
 def run_power_flow(algorithm: str = 'nr', calculate_voltage_angles: bool = True, 
-                  max_iteration: int = 10, tolerance_mva: float = 1e-8) -> Dict[str, Any]:
+                  max_iteration: int = 10, tolerance_mva: float = 1e-8,
+                  warm_start: bool = True, fields: Optional[List[str]] = None,
+                  float32: bool = False, output_dir: Optional[str] = None,
+                  network_id: Optional[str] = None) -> Dict[str, Any]:
     """Run power flow analysis on the current network.
     
+    By default the solve starts from the voltages of the last converged power
+    flow on the current network. If no such solution exists, the bus set has
+    changed or the warm start fails to converge, the default initialization
+    is used.
+    
+    Result tables are returned in a columnar form (column names plus one value
+    array per column). With ``output_dir`` the full tables are written to
+    Parquet files and only their paths and summary statistics are returned.
+    
     Args:
         algorithm: Power flow algorithm ('nr' for Newton-Raphson, 'bfsw' for backward/forward sweep)
         calculate_voltage_angles: Consider voltage angles in calculation
         max_iteration: Maximum number of iterations
         tolerance_mva: Convergence tolerance in MVA
+        warm_start: Start from the last converged solution (False forces a flat start)
+        fields: Result columns to return, e.g. ["vm_pu", "loading_percent"] (optional)
+        float32: Round float results to float32 precision
+        output_dir: Directory to write the full result tables to as Parquet (optional)
+        network_id: Name of the network to solve (default: the current network)
         
     Returns:
         Dict containing power flow results
     """
     logger.info("Running power flow analysis")
     try:
-        net = _get_network()
-        pp.runpp(net, algorithm=algorithm, calculate_voltage_angles=calculate_voltage_angles,
-                max_iteration=max_iteration, tolerance_mva=tolerance_mva)
+        entry = _get_entry(network_id)
+        net = entry["net"]
+        last_res_bus = entry["last_converged_res_bus"]
+        init = "auto"
+        if (warm_start and last_res_bus is not None
+                and last_res_bus.index.equals(net.bus.index)):
+            net.res_bus = last_res_bus.copy()
+            init = "results"
+        elif not warm_start:
+            init = "flat"
+
+        start_time = time.perf_counter()
+        try:
+            pp.runpp(net, algorithm=algorithm, calculate_voltage_angles=calculate_voltage_angles,
+                    max_iteration=max_iteration, tolerance_mva=tolerance_mva, init=init)
+        except pp.LoadflowNotConverged:
+            if init != "results":
+                raise
+            # Stale warm start, solve again with the default initialization
+            init = "auto"
+            pp.runpp(net, algorithm=algorithm, calculate_voltage_angles=calculate_voltage_angles,
+                    max_iteration=max_iteration, tolerance_mva=tolerance_mva, init=init)
+        solve_time = time.perf_counter() - start_time
+        if net.converged:
+            entry["last_converged_res_bus"] = net.res_bus.copy()
         
         # Extract key results
-        results = {
-            "bus_results": net.res_bus.to_dict(),
-            "line_results": net.res_line.to_dict(),
-            "trafo_results": net.res_trafo.to_dict(),
-            "converged": net.converged
+        tables = {
+            "bus_results": net.res_bus,
+            "line_results": net.res_line,
+            "trafo_results": net.res_trafo
         }
+        if output_dir is not None:
+            results = _export_tables(tables, output_dir)
+        else:
+            results = {name: _encode_table(df, fields, float32) for name, df in tables.items()}
+        results["converged"] = net.converged
         
         return {
             "status": "success",
             "message": "Power flow calculation completed successfully" if net.converged else "Power flow did not converge",
-            "results": results
+            "results": results,
+            "solver_stats": {
+                "init": init,
+                "iterations": int(net._ppc.get("iterations", 0)),
+                "solve_time_s": round(solve_time, 4)
+            }
         }
     except RuntimeError as re:
         return {
@@ -143,68 +653,493 @@ def run_power_flow(algorithm: str = 'nr', calculate_voltage_angles: bool = True,
             "message": f"Power flow calculation failed: {str(e)}"
         }
 
+def _run_outage(net: pp.pandapowerNet, element_type: str, idx: Any,
+                init: str = "auto", init_res_bus=None) -> Dict[str, Any]:
+    """Take one element out of service, solve the power flow and restore it.
+
+    The element is toggled in place on ``net`` so that no copy of the network
+    is made per outage.
+
+    Args:
+        net: Working network (modified temporarily)
+        element_type: Element table of the outage ('line' or 'trafo')
+        idx: Index of the element in its table
+        init: Power flow initialization passed to ``pp.runpp``
+        init_res_bus: Bus results to warm start from when ``init="results"``
+
+    Returns:
+        Dict containing the contingency result with the raw result values
+        checked for violations
+    """
+    was_in_service = net[element_type].at[idx, 'in_service']
+    net[element_type].at[idx, 'in_service'] = False
+    if init_res_bus is not None:
+        net.res_bus = init_res_bus.copy()
+    try:
+        try:
+            pp.runpp(net, init=init)
+        except pp.LoadflowNotConverged:
+            if init == "auto":
+                raise
+            # Warm start can fail when the outage splits the network, retry from scratch
+            pp.runpp(net)
+
+        # Violations are extracted for all contingencies at once afterwards
+        return {
+            'contingency': f"{element_type}_{idx}",
+            'converged': net.converged,
+            'values': _outage_values(net)
+        }
+    except Exception as e:
+        return {
+            'contingency': f"{element_type}_{idx}",
+            'converged': False,
+            'error': str(e)
+        }
+    finally:
+        net[element_type].at[idx, 'in_service'] = was_in_service
+
+
+def _violation_limits(limits: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """Merge user supplied violation limits with the defaults."""
+    merged = dict(_DEFAULT_VIOLATION_LIMITS)
+    if limits:
+        unknown = set(limits) - set(merged)
+        if unknown:
+            raise ValueError(f"Unknown limits {sorted(unknown)}. Use {list(merged)}.")
+        merged.update({key: float(value) for key, value in limits.items()})
+    return merged
+
+
+def _outage_values(net: pp.pandapowerNet) -> Dict[str, np.ndarray]:
+    """Collect the result columns checked for violations, in element table order."""
+    # Copy, the result tables are reused by the next power flow on the same net
+    return {
+        element_type: (net[f"res_{element_type}"][column].to_numpy(dtype=np.float64, copy=True)
+                       if len(net[element_type]) else np.empty(0))
+        for element_type, column in _VIOLATION_TABLES
+    }
+
+
+def _build_violation_index(net: pp.pandapowerNet, results: List[Dict[str, Any]],
+                           limits: Dict[str, float]) -> Dict[str, Any]:
+    """Extract the violations of all contingencies and index them.
+
+    The raw result values of the contingencies are gathered into one
+    preallocated (contingencies x elements) array per element type and
+    compared against the limits in a single vectorized step. The violations
+    are kept as a sparse index sorted by severity, and the per contingency
+    violation lists are written back into ``results``.
+
+    Args:
+        net: Network the contingencies were run on
+        results: Contingency results holding their raw values (modified in place)
+        limits: Violation limits, see ``_DEFAULT_VIOLATION_LIMITS``
+
+    Returns:
+        Dict of equally long arrays (contingency, element_type, element,
+        value, severity) with one entry per violation, worst first
+    """
+    raw_values = [result.pop('values', None) for result in results]
+    solved = np.array([values is not None for values in raw_values], dtype=bool)
+    names = np.array([result['contingency'] for result in results], dtype=object)
+    violation_lists = {}
+    parts = []
+    for element_type, column in _VIOLATION_TABLES:
+        elements = net[element_type].index.to_numpy()
+        values = np.full((len(results), len(elements)), np.nan)
+        for row, result_values in enumerate(raw_values):
+            if result_values is not None:
+                values[row] = result_values[element_type]
+
+        # Severity: distance beyond the limit in percent (of nominal voltage or of the rating)
+        with np.errstate(invalid='ignore'):
+            if element_type == 'bus':
+                severity = np.maximum(limits["vm_min_pu"] - values,
+                                      values - limits["vm_max_pu"]) * 100
+            else:
+                severity = values - limits[f"{element_type}_max_loading_percent"]
+            rows, cols = np.nonzero(severity > 0)
+
+        counts = np.bincount(rows, minlength=len(results))
+        violation_lists[element_type] = np.split(elements[cols], np.cumsum(counts)[:-1])
+        parts.append((rows, np.full(len(rows), element_type, dtype=object), elements[cols],
+                      values[rows, cols], severity[rows, cols]))
+
+    keys = {'bus': 'voltage_violations', 'line': 'loading_violations',
+            'trafo': 'trafo_loading_violations'}
+    for row in np.flatnonzero(solved):
+        results[row]['violations'] = {
+            keys[element_type]: violation_lists[element_type][row].tolist()
+            for element_type, _ in _VIOLATION_TABLES
+        }
+
+    rows, element_types, elements, values, severity = (np.concatenate(arrays) for arrays in zip(*parts))
+    order = np.argsort(-severity, kind='stable')
+    return {
+        "contingency": names[rows[order]],
+        "element_type": element_types[order],
+        "element": elements[order],
+        "value": values[order],
+        "severity": severity[order],
+        "contingencies": names,
+        "limits": limits
+    }
+
+
+def _screen_outages(net: pp.pandapowerNet, outages: List[Tuple[str, Any]],
+                    screen_margin: float,
+                    limits: Dict[str, float]) -> Tuple[List[bool], Dict[str, float]]:
+    """Screen outages with LODF thermal and Jacobian voltage estimates.
+
+    Uses the internal model of the last converged Newton-Raphson power flow on
+    ``net``. The PTDF/LODF matrices and the LU factorization of the Jacobian
+    are built once, and the post-outage branch loading and bus voltages of
+    all outages are estimated with matrix operations instead of power flows.
+
+    Args:
+        net: Network with a converged Newton-Raphson base case power flow
+        outages: List of (element_type, index) tuples
+        screen_margin: Fraction of the loading limit above which an outage
+            is flagged for an AC re-solve
+        limits: Violation limits, see ``_DEFAULT_VIOLATION_LIMITS``
+
+    Returns:
+        Tuple of a flag per outage and the estimated maximum branch loading
+        in percent per contingency name
+    """
+    ppci = net._ppc["internal"]
+    branch = ppci["branch"]
+    lookup = net._pd2ppc_lookups["branch"]
+
+    # Map pandapower branch elements to rows of the internal (in service) branch matrix
+    ppc_to_ppci = np.full(len(ppci["branch_is"]), -1, dtype=np.int64)
+    ppc_to_ppci[ppci["branch_is"]] = np.arange(branch.shape[0])
+    ppci_row = {}
+    base_loading = np.zeros(branch.shape[0])
+    nominal_mva = np.full(branch.shape[0], np.inf)
+    limit_percent = np.full(branch.shape[0], np.inf)
+    for element_type, res_table in (('line', net.res_line), ('trafo', net.res_trafo)):
+        if element_type not in lookup:
+            continue
+        start, _ = lookup[element_type]
+        rows = ppc_to_ppci[start:start + len(net[element_type])]
+        in_ppci = rows >= 0
+        for idx, row in zip(net[element_type].index[in_ppci], rows[in_ppci]):
+            ppci_row[(element_type, idx)] = row
+        base_loading[rows[in_ppci]] = res_table.loading_percent.values[in_ppci]
+        limit_percent[rows[in_ppci]] = limits[f"{element_type}_max_loading_percent"]
+        if element_type == 'line':
+            vn_kv = net.bus.vn_kv.loc[net.line.from_bus].values
+            rating = net.line.max_i_ka.values * vn_kv * np.sqrt(3) * net.line.parallel.values
+        else:
+            rating = net.trafo.sn_mva.values * net.trafo.parallel.values
+        nominal_mva[rows[in_ppci]] = rating[in_ppci]
+
+    # Only the outaged branches are needed as columns of the estimates
+    cols = np.array(sorted(set(ppci_row.get(outage, -1) for outage in outages) - {-1}),
+                    dtype=np.int64)
+    col_pos = {row: pos for pos, row in enumerate(cols)}
+
+    # Equivalent MVA rating implied by the AC base case loading
+    p_base = branch[:, PF].real
+    q_base = branch[:, QF].real
+    s_base = np.hypot(p_base, q_base)
+    valid = (base_loading > 1e-6) & (s_base > 1e-6)
+    rating_mva = nominal_mva.copy()
+    rating_mva[valid] = s_base[valid] / base_loading[valid] * 100
+
+    # Thermal estimate: post-outage active power flows from LODF (branches x outages)
+    ptdf = makePTDF(ppci["baseMVA"], ppci["bus"], branch, using_sparse_solver=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Radial branches have no LODF (NaN/inf), they are flagged as islanding below
+        lodf = makeLODF(branch, ptdf)[:, cols]
+    f_bus = branch[:, F_BUS].real.astype(np.int64)
+    t_bus = branch[:, T_BUS].real.astype(np.int64)
+    islanding = np.abs(1 - (ptdf[cols, f_bus[cols]] - ptdf[cols, t_bus[cols]])) < 1e-6
+    with np.errstate(invalid='ignore'):
+        p_post = p_base[:, None] + lodf * p_base[cols][None, :]
+        est_loading = np.hypot(p_post, q_base[:, None]) / rating_mva[:, None] * 100
+    est_loading[cols, np.arange(len(cols))] = 0.0
+    est_loading = np.nan_to_num(est_loading, nan=np.inf)
+    est_max_loading = est_loading.max(axis=0)
+    est_max_ratio = (est_loading / limit_percent[:, None]).max(axis=0)
+
+    # Voltage estimate: one Newton step from the base case with the outaged
+    # branch flows removed from the terminal bus injections
+    pv, pq = ppci["pv"], ppci["pq"]
+    n_ang = len(pv) + len(pq)
+    p_row = np.full(ppci["bus"].shape[0], -1, dtype=np.int64)
+    p_row[np.r_[pv, pq]] = np.arange(n_ang)
+    q_row = np.full(ppci["bus"].shape[0], -1, dtype=np.int64)
+    q_row[pq] = n_ang + np.arange(len(pq))
+    rhs = np.zeros((ppci["J"].shape[0], len(cols)))
+    base_mva = ppci["baseMVA"]
+    for side_bus, p_col, q_col in ((f_bus, PF, QF), (t_bus, PT, QT)):
+        bus = side_bus[cols]
+        has_p = p_row[bus] >= 0
+        rhs[p_row[bus[has_p]], np.flatnonzero(has_p)] += branch[cols[has_p], p_col].real / base_mva
+        has_q = q_row[bus] >= 0
+        rhs[q_row[bus[has_q]], np.flatnonzero(has_q)] += branch[cols[has_q], q_col].real / base_mva
+    dx = splu(csc_matrix(ppci["J"])).solve(rhs)
+    vm_base = ppci["bus"][:, VM].real
+    dvm = np.zeros((len(vm_base), len(cols)))
+    dvm[pq] = dx[n_ang:]
+    vm_post = vm_base[:, None] + dvm
+    margin = _SCREEN_VOLTAGE_MARGIN_PU
+    voltage_risk = (((vm_post < limits["vm_min_pu"] + margin) & (dvm < -1e-4)) |
+                    ((vm_post > limits["vm_max_pu"] - margin) & (dvm > 1e-4))).any(axis=0)
+
+    flags = []
+    estimates = {}
+    for element_type, idx in outages:
+        row = ppci_row.get((element_type, idx))
+        if row is None:
+            # Element is already out of service or not part of the DC model
+            flags.append(element_type not in ('line', 'trafo'))
+            continue
+        pos = col_pos[row]
+        estimate = float(est_max_loading[pos])
+        estimates[f"{element_type}_{idx}"] = round(estimate, 2) if np.isfinite(estimate) else None
+        flags.append(bool(
+            islanding[pos]
+            or est_max_ratio[pos] > screen_margin
+            or voltage_risk[pos]
+        ))
+    return flags, estimates
+
+
+def _init_worker(net_bytes: bytes, init_res_bus, started=None) -> None:
+    """Unpickle the base network once per worker process.
+
+    Args:
+        net_bytes: Pickled working network
+        init_res_bus: Bus results to warm start from (or None)
+        started: Queue to report the ids of started chunks on (optional)
+    """
+    global _worker_net, _worker_res_bus, _worker_started
+    _worker_net = pickle.loads(net_bytes)
+    _worker_res_bus = init_res_bus
+    _worker_started = started
+
+
+def _run_outage_chunk(chunk: List[Tuple[str, Any]], init: str,
+                      chunk_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Solve a chunk of outages on the network of the current worker process."""
+    if _worker_started is not None and chunk_id is not None:
+        _worker_started.put(chunk_id)
+    return [_run_outage(_worker_net, element_type, idx, init=init,
+                        init_res_bus=_worker_res_bus)
+            for element_type, idx in chunk]
+
+
+def _run_outages_parallel(net: pp.pandapowerNet, outages: List[Tuple[str, Any]],
+                          init: str, init_res_bus, workers: int,
+                          chunk_size: Optional[int],
+                          contingency_timeout: Optional[float]) -> List[Dict[str, Any]]:
+    """Solve outages in a process pool, in the same order as the serial path.
+
+    The network is pickled once and unpickled once per worker by the pool
+    initializer. Outages are split into chunks whose results are returned in
+    submission order. With a timeout, every chunk gets contingency_timeout
+    seconds per outage from the moment a worker starts it; when a chunk runs
+    over, the pool is terminated (freeing the stuck worker) and the unfinished
+    chunks are solved by a new pool.
+
+    Args:
+        net: Working network
+        outages: List of (element_type, index) tuples
+        init: Power flow initialization passed to ``pp.runpp``
+        init_res_bus: Bus results to warm start from (or None)
+        workers: Number of worker processes
+        chunk_size: Outages per task (None to split evenly, four chunks per worker)
+        contingency_timeout: Time budget in seconds per contingency (None for no limit)
+
+    Returns:
+        List of contingency results
+    """
+    if not chunk_size:
+        chunk_size = max(1, math.ceil(len(outages) / (workers * 4)))
+    chunks = [outages[i:i + chunk_size] for i in range(0, len(outages), chunk_size)]
+    net_bytes = pickle.dumps(net, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Spawn avoids forking the running server (event loop and stdio threads)
+    ctx = multiprocessing.get_context("spawn")
+    if not contingency_timeout:
+        with ctx.Pool(min(workers, len(chunks)), initializer=_init_worker,
+                      initargs=(net_bytes, init_res_bus)) as pool:
+            pending = [pool.apply_async(_run_outage_chunk, (chunk, init)) for chunk in chunks]
+            results = []
+            for i, async_result in enumerate(pending):
+                results.extend(async_result.get())
+                logger.info(f"Contingency chunk {i + 1}/{len(chunks)} completed")
+        return results
+
+    chunk_results = {}
+    remaining = list(range(len(chunks)))
+    while remaining:
+        started = ctx.Queue()
+        with ctx.Pool(min(workers, len(remaining)), initializer=_init_worker,
+                      initargs=(net_bytes, init_res_bus, started)) as pool:
+            pending = {i: pool.apply_async(_run_outage_chunk, (chunks[i], init, i)) for i in remaining}
+            deadlines = {}
+            expired = []
+            while pending and not expired:
+                try:
+                    while True:
+                        i = started.get_nowait()
+                        deadlines[i] = time.monotonic() + contingency_timeout * len(chunks[i])
+                except queue.Empty:
+                    pass
+                for i in [i for i, async_result in pending.items() if async_result.ready()]:
+                    chunk_results[i] = pending.pop(i).get()
+                    logger.info(f"Contingency chunk {len(chunk_results)}/{len(chunks)} completed")
+                now = time.monotonic()
+                expired = [i for i in pending if deadlines.get(i, math.inf) < now]
+                if not expired:
+                    time.sleep(0.01)
+            for i in expired:
+                chunk_results[i] = [{
+                    'contingency': f"{element_type}_{idx}",
+                    'converged': False,
+                    'error': f"Timed out after {contingency_timeout} s per contingency"
+                } for element_type, idx in chunks[i]]
+                logger.info(f"Contingency chunk {len(chunk_results)}/{len(chunks)} timed out")
+            remaining = [i for i in pending if i not in chunk_results]
+        # Leaving the pool context terminates the workers still stuck on timed out chunks
+    return [result for i in range(len(chunks)) for result in chunk_results[i]]
+
+
 @mcp.tool()
 def run_contingency_analysis(contingency_type: str = "N-1", 
-                           elements: Optional[List[str]] = None) -> Dict[str, Any]:
+                           elements: Optional[List[str]] = None,
+                           mode: str = "full",
+                           screen_margin: float = 0.9,
+                           workers: int = 1,
+                           chunk_size: Optional[int] = None,
+                           contingency_timeout: Optional[float] = None,
+                           limits: Optional[Dict[str, float]] = None,
+                           network_id: Optional[str] = None) -> Dict[str, Any]:
     """Run contingency analysis on the current network.
     
+    In "full" mode every outage is solved with an AC power flow. In "screen"
+    mode all outages are first screened with LODF-based DC estimates built
+    once from the base case, and only the flagged outages are re-solved with
+    an AC power flow warm-started from the base case solution.
+    
+    The violations of all contingencies are extracted in one vectorized step
+    and kept as an index on the network, which ``get_worst_violations``
+    queries without re-running the analysis.
+    
     Args:
         contingency_type: Type of contingency analysis ("N-1" or "N-2")
         elements: List of specific elements to analyze (optional)
+        mode: "full" to AC-solve every outage or "screen" for DC screening
+        screen_margin: Fraction of the loading limit above which a screened
+            outage is re-solved with AC power flow (screen mode only)
+        workers: Number of worker processes for the AC solves (1 runs serially,
+            0 uses all CPU cores)
+        chunk_size: Number of outages sent to a worker per task (default:
+            split evenly, four chunks per worker)
+        contingency_timeout: Time budget in seconds per contingency in parallel
+            runs, counted from the start of each chunk; chunks exceeding it
+            are reported as timed out (optional)
+        limits: Violation limits overriding the defaults, keys "vm_min_pu",
+            "vm_max_pu", "line_max_loading_percent" and
+            "trafo_max_loading_percent" (optional)
+        network_id: Name of the network to analyze (default: the current network)
         
     Returns:
         Dict containing contingency analysis results
     """
-    logger.info("Running contingency analysis")
+    logger.info(f"Running contingency analysis ({mode} mode)")
     try:
-        net = _get_network()
+        if mode not in ("full", "screen"):
+            raise ValueError("Unsupported mode. Use 'full' or 'screen'.")
+        if workers < 0:
+            raise ValueError("workers must be 0 (all cores) or a positive number.")
+        limits = _violation_limits(limits)
+
+        entry = _get_entry(network_id)
+        net = entry["net"]
+        start_time = time.perf_counter()
         
-        # Store original state
-        orig_net = net.deepcopy()
+        # Work on a single copy, outages are toggled in place
+        work_net = copy.deepcopy(net)
         results = []
         
         # Define elements to analyze
         if elements is None:
             elements = ['line', 'trafo']
+        outages = [(element_type, idx) for element_type in elements
+                   for idx in net[element_type].index]
+
+        init = "auto"
+        base_res_bus = None
+        screening = None
+        ac_outages = outages
+        if mode == "screen":
+            pp.runpp(work_net)
+            if not work_net.converged:
+                raise RuntimeError("Base case power flow did not converge")
+            flags, estimates = _screen_outages(work_net, outages, screen_margin, limits)
+            ac_outages = [outage for outage, flag in zip(outages, flags) if flag]
+            init = "results"
+            base_res_bus = work_net.res_bus.copy()
+            screening = {
+                "screened_out": [f"{element_type}_{idx}" for (element_type, idx), flag
+                                 in zip(outages, flags) if not flag],
+                "estimated_max_loading_percent": estimates,
+                "time_s": round(time.perf_counter() - start_time, 4)
+            }
+            
+        if workers == 0:
+            workers = os.cpu_count() or 1
             
         # Perform contingency analysis
-        for element_type in elements:
-            for idx in net[element_type].index:
-                # Create contingency by taking element out of service
-                contingency_net = orig_net.deepcopy()
-                contingency_net[element_type].at[idx, 'in_service'] = False
-                
-                try:
-                    pp.runpp(contingency_net)
-                    
-                    # Check for violations
-                    violations = {
-                        'voltage_violations': contingency_net.res_bus[
-                            (contingency_net.res_bus.vm_pu < 0.95) | 
-                            (contingency_net.res_bus.vm_pu > 1.05)
-                        ].index.tolist(),
-                        'loading_violations': contingency_net.res_line[
-                            contingency_net.res_line.loading_percent > 100
-                        ].index.tolist()
-                    }
-                    
-                    results.append({
-                        'contingency': f"{element_type}_{idx}",
-                        'converged': contingency_net.converged,
-                        'violations': violations
-                    })
-                    
-                except Exception as e:
-                    results.append({
-                        'contingency': f"{element_type}_{idx}",
-                        'converged': False,
-                        'error': str(e)
-                    })
+        ac_start = time.perf_counter()
+        if workers > 1 and len(ac_outages) > 1:
+            results = _run_outages_parallel(work_net, ac_outages, init, base_res_bus,
+                                            workers, chunk_size, contingency_timeout)
+        else:
+            for element_type, idx in ac_outages:
+                results.append(_run_outage(work_net, element_type, idx, init=init,
+                                           init_res_bus=base_res_bus))
+        ac_time = time.perf_counter() - ac_start
+        index_start = time.perf_counter()
+        entry["violation_index"] = _build_violation_index(work_net, results, limits)
+        index_time = time.perf_counter() - index_start
+        total_time = time.perf_counter() - start_time
+
+        timing = {
+            "total_s": round(total_time, 4),
+            "ac_solve_s": round(ac_time, 4),
+            "ac_solves": len(ac_outages),
+            "violation_index_s": round(index_time, 4),
+            "total_contingencies": len(outages),
+            "workers": workers
+        }
+        if mode == "screen" and ac_outages:
+            # Compare against the time needed to AC-solve every outage
+            estimated_full = ac_time / len(ac_outages) * len(outages)
+            timing["estimated_full_s"] = round(estimated_full, 4)
+            timing["estimated_speedup"] = round(estimated_full / total_time, 2)
         
-        return {
+        response = {
             "status": "success",
             "message": "Contingency analysis completed",
-            "results": results
+            "mode": mode,
+            "results": results,
+            "violation_count": len(entry["violation_index"]["severity"]),
+            "timing": timing
+        }
+        if screening is not None:
+            response["screening"] = screening
+        return response
+    except ValueError as ve:
+        return {
+            "status": "error",
+            "message": str(ve)
         }
     except RuntimeError as re:
         return {
@@ -218,26 +1153,110 @@ def run_contingency_analysis(contingency_type: str = "N-1",
         }
 
 @mcp.tool()
-def get_network_info() -> Dict[str, Any]:
+def get_worst_violations(n: int = 10, element_type: Optional[str] = None,
+                         by: str = "violation",
+                         network_id: Optional[str] = None) -> Dict[str, Any]:
+    """Get the worst violations of the last contingency analysis of a network.
+    
+    Answered from the violation index built by ``run_contingency_analysis``,
+    without re-running any power flow. Severity is the distance beyond the
+    limit in percent (of nominal voltage for buses, of the rating for lines
+    and transformers).
+    
+    Args:
+        n: Number of entries to return
+        element_type: Only consider violations of "bus", "line" or "trafo" (optional)
+        by: "violation" for the n worst single violations or "contingency"
+            for the n contingencies with the worst violations
+        network_id: Name of the network (default: the current network)
+        
+    Returns:
+        Dict containing a columnar table of the worst violations or contingencies
+    """
+    try:
+        if by not in ("violation", "contingency"):
+            raise ValueError("Unsupported by. Use 'violation' or 'contingency'.")
+        if element_type is not None and element_type not in dict(_VIOLATION_TABLES):
+            raise ValueError(f"Unsupported element_type. Use one of {[t for t, _ in _VIOLATION_TABLES]}.")
+        index = _get_entry(network_id)["violation_index"]
+        if index is None:
+            raise RuntimeError("No contingency analysis results. Run run_contingency_analysis first.")
+
+        violations = pd.DataFrame({key: index[key] for key in
+                                   ("contingency", "element_type", "element", "value", "severity")})
+        if element_type is not None:
+            violations = violations[violations.element_type == element_type]
+        if by == "violation":
+            # The index is already sorted worst first
+            table = violations.head(n).reset_index(drop=True)
+        else:
+            table = violations.groupby("contingency", sort=False).agg(
+                max_severity=("severity", "max"),
+                violations=("severity", "size")
+            ).sort_values("max_severity", ascending=False, kind="stable").head(n)
+
+        return {
+            "status": "success",
+            "message": f"{len(table)} worst entries of {len(violations)} violations",
+            "limits": index["limits"],
+            "worst": _encode_table(table)
+        }
+    except ValueError as ve:
+        return {
+            "status": "error",
+            "message": str(ve)
+        }
+    except RuntimeError as re:
+        return {
+            "status": "error",
+            "message": str(re)
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to get worst violations: {str(e)}"
+        }
+
+
+@mcp.tool()
+def get_network_info(fields: Optional[List[str]] = None, float32: bool = False,
+                     output_dir: Optional[str] = None,
+                     network_id: Optional[str] = None) -> Dict[str, Any]:
     """Get information about the current network.
     
+    Element tables are returned in a columnar form (column names plus one
+    value array per column). With ``output_dir`` the full tables are written
+    to Parquet files and only their paths and summary statistics are returned.
+    
+    Args:
+        fields: Table columns to return, e.g. ["name", "vn_kv"] (optional)
+        float32: Round float values to float32 precision
+        output_dir: Directory to write the full bus, line and trafo tables to as Parquet (optional)
+        network_id: Name of the network (default: the current network)
+    
     Returns:
         Dict containing network statistics and information
     """
     logger.info("Retrieving network information")
     try:
-        net = _get_network()
+        net = _get_network(network_id)
         info = {
             "buses": len(net.bus),
             "lines": len(net.line),
             "trafos": len(net.trafo),
             "generators": len(net.gen),
             "loads": len(net.load),
-            "switches": len(net.switch),
-            "bus_data": net.bus.to_dict(),
-            "line_data": net.line.to_dict(),
-            "trafo_data": net.trafo.to_dict()
+            "switches": len(net.switch)
+        }
+        tables = {
+            "bus_data": net.bus,
+            "line_data": net.line,
+            "trafo_data": net.trafo
         }
+        if output_dir is not None:
+            info.update(_export_tables(tables, output_dir))
+        else:
+            info.update({name: _encode_table(df, fields, float32) for name, df in tables.items()})
         
         return {
             "status": "success",
@@ -255,5 +1274,586 @@ def get_network_info() -> Dict[str, Any]:
             "message": f"Failed to get network information: {str(e)}"
         }
 
+def _read_profiles(profile_path: str) -> pd.DataFrame:
+    """Read a time series profile table from a CSV or Parquet file.
+    
+    Rows are time steps (first CSV column is the index) and columns are named
+    ``<element>.<column>.<index>``, e.g. ``load.p_mw.3``.
+    """
+    if profile_path.endswith('.csv'):
+        return pd.read_csv(profile_path, index_col=0)
+    if profile_path.endswith('.parquet'):
+        return pd.read_parquet(profile_path)
+    raise ValueError("Unsupported profile format. Use .csv or .parquet files.")
+
+
+def _parse_profile_targets(net: pp.pandapowerNet,
+                           columns: List[str]) -> Dict[Tuple[str, str], Tuple[pd.Index, np.ndarray]]:
+    """Group profile columns by the element table column they drive.
+    
+    Args:
+        net: Network the profiles are applied to
+        columns: Profile column names ``<element>.<column>.<index>``
+        
+    Returns:
+        Dict mapping (element, column) to the element indices and the
+        positions of their profile columns
+    """
+    groups = {}
+    for pos, name in enumerate(columns):
+        parts = str(name).split('.')
+        if len(parts) != 3:
+            raise ValueError(f"Invalid profile column '{name}'. Use <element>.<column>.<index>.")
+        element, column, idx = parts
+        if element not in net or not isinstance(net[element], pd.DataFrame) or column not in net[element].columns:
+            raise ValueError(f"Invalid profile column '{name}': unknown element table or column.")
+        table_index = net[element].index
+        idx = int(idx) if table_index.dtype.kind in 'iu' else idx
+        if idx not in table_index:
+            raise ValueError(f"Invalid profile column '{name}': {element} {idx} does not exist.")
+        groups.setdefault((element, column), ([], []))
+        groups[(element, column)][0].append(idx)
+        groups[(element, column)][1].append(pos)
+    return {key: (pd.Index(indices), np.array(positions))
+            for key, (indices, positions) in groups.items()}
+
+
+def _chunk_stats(values: np.ndarray, timesteps: pd.Index, elements: pd.Index) -> Dict[str, Any]:
+    """Get min/max (with location), sum and count of a (time steps x elements) array."""
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return {"count": 0}
+    element_ids = elements.tolist()
+    t_min, e_min = np.unravel_index(np.argmin(np.where(valid, values, np.inf)), values.shape)
+    t_max, e_max = np.unravel_index(np.argmax(np.where(valid, values, -np.inf)), values.shape)
+    return {
+        "count": int(valid.sum()),
+        "sum": float(values[valid].sum()),
+        "min": float(values[t_min, e_min]),
+        "min_at": {"timestep": str(timesteps[t_min]), "element": element_ids[e_min]},
+        "max": float(values[t_max, e_max]),
+        "max_at": {"timestep": str(timesteps[t_max]), "element": element_ids[e_max]}
+    }
+
+
+def _combine_stats(chunks: List[Dict[str, Any]], variables: List[str]) -> Dict[str, Any]:
+    """Combine per-chunk statistics into aggregate statistics per variable."""
+    combined = {}
+    for variable in variables:
+        stats = [chunk["stats"][variable] for chunk in chunks if chunk["stats"][variable]["count"]]
+        if not stats:
+            combined[variable] = None
+            continue
+        count = sum(stat["count"] for stat in stats)
+        lowest = min(stats, key=lambda stat: stat["min"])
+        highest = max(stats, key=lambda stat: stat["max"])
+        combined[variable] = {
+            "min": lowest["min"],
+            "min_at": lowest["min_at"],
+            "max": highest["max"],
+            "max_at": highest["max_at"],
+            "mean": sum(stat["sum"] for stat in stats) / count
+        }
+    return combined
+
+
+@mcp.tool()
+def run_timeseries(profile_path: str, output_dir: str,
+                   output_variables: Optional[List[str]] = None,
+                   chunk_size: int = 168, resume: bool = True,
+                   max_iteration: int = 10, tolerance_mva: float = 1e-8,
+                   network_id: Optional[str] = None) -> Dict[str, Any]:
+    """Run a time series power flow driven by load/generation profiles.
+    
+    All time steps are solved on the same network object, each one warm
+    started from the previous solution. When the profiles only change bus
+    injections (load/sgen/storage p_mw and q_mvar, gen p_mw and vm_pu) the
+    internal power flow model is recycled between time steps. Results are
+    written per chunk of time steps to Parquet files in
+    ``output_dir/<table>.<column>/`` and a progress file allows an
+    interrupted run to resume after the last completed chunk. The profiled
+    columns are restored to their original values at the end.
+    
+    Args:
+        profile_path: CSV or Parquet file with one row per time step and
+            columns named <element>.<column>.<index>, e.g. load.p_mw.3
+        output_dir: Directory for the chunked results and the progress file
+        output_variables: Result columns to record as <table>.<column>
+            (default: bus vm_pu, line and trafo loading_percent)
+        chunk_size: Number of time steps per output chunk
+        resume: Continue a previous run in output_dir with the same profile file
+            contents, network and settings
+        max_iteration: Maximum number of iterations per time step
+        tolerance_mva: Convergence tolerance in MVA
+        network_id: Name of the network to simulate (default: the current network)
+        
+    Returns:
+        Dict containing aggregate statistics, throughput and output locations
+    """
+    logger.info(f"Running time series power flow with profiles from {profile_path}")
+    try:
+        if not PYARROW_AVAILABLE:
+            raise ValueError("pyarrow package not installed. Install it to write time series results.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive number.")
+        entry = _get_entry(network_id)
+        net = entry["net"]
+        variables = output_variables or _DEFAULT_TIMESERIES_OUTPUTS
+        for variable in variables:
+            table, _, column = variable.partition('.')
+            if table not in net or not isinstance(net[table], pd.DataFrame) or column not in net[table].columns:
+                raise ValueError(f"Invalid output variable '{variable}'. Use <table>.<column>, e.g. res_bus.vm_pu.")
+
+        profiles = _read_profiles(profile_path)
+        targets = _parse_profile_targets(net, list(profiles.columns))
+        profile_values = profiles.to_numpy(dtype=np.float64)
+        n_steps = len(profiles)
+
+        recycle = None
+        if set(targets) <= _RECYCLE_BUS_PQ_TARGETS | _RECYCLE_GEN_TARGETS:
+            recycle = {"bus_pq": True, "trafo": False,
+                       "gen": bool(set(targets) & _RECYCLE_GEN_TARGETS)}
+
+        # Resume from the progress file of a previous run with the same setup, profile
+        # contents and network
+        os.makedirs(output_dir, exist_ok=True)
+        progress_path = os.path.join(output_dir, "progress.json")
+        progress = {
+            "profile_path": os.path.abspath(profile_path),
+            "profile_hash": _file_hash(profile_path),
+            "network": _net_fingerprint(net),
+            "n_steps": n_steps,
+            "chunk_size": chunk_size,
+            "variables": variables,
+            "completed_steps": 0,
+            "chunks": []
+        }
+        if resume and os.path.exists(progress_path):
+            with open(progress_path) as f:
+                previous = json.load(f)
+            if all(previous.get(key) == progress[key]
+                   for key in ("profile_path", "profile_hash", "network", "n_steps", "chunk_size",
+                               "variables")):
+                progress = previous
+        first_step = progress["completed_steps"]
+
+        original = {key: net[key[0]].loc[indices, key[1]].copy()
+                    for key, (indices, _) in targets.items()}
+        run_start = time.perf_counter()
+        try:
+            need_full_solve = True
+            for chunk_start in range(first_step, n_steps, chunk_size):
+                chunk_stop = min(chunk_start + chunk_size, n_steps)
+                buffers = {variable: None for variable in variables}
+                converged = np.zeros(chunk_stop - chunk_start, dtype=bool)
+                for step in range(chunk_start, chunk_stop):
+                    row = profile_values[step]
+                    for (element, column), (indices, positions) in targets.items():
+                        net[element].loc[indices, column] = row[positions]
+                    try:
+                        if recycle is not None and not need_full_solve:
+                            pp.runpp(net, max_iteration=max_iteration,
+                                     tolerance_mva=tolerance_mva, recycle=recycle)
+                        else:
+                            pp.runpp(net, max_iteration=max_iteration, tolerance_mva=tolerance_mva,
+                                     init="auto" if need_full_solve else "results")
+                        need_full_solve = not net.converged
+                    except pp.LoadflowNotConverged:
+                        need_full_solve = True
+                    converged[step - chunk_start] = not need_full_solve
+
+                    for variable in variables:
+                        table, column = variable.split('.')
+                        if buffers[variable] is None:
+                            buffers[variable] = np.full((chunk_stop - chunk_start, len(net[table])), np.nan)
+                        if converged[step - chunk_start]:
+                            buffers[variable][step - chunk_start] = net[table][column].to_numpy()
+
+                # Write the chunk, then record it as completed
+                timesteps = profiles.index[chunk_start:chunk_stop]
+                chunk_stats = {}
+                for variable, values in buffers.items():
+                    table = variable.split('.')[0]
+                    elements = net[table].index
+                    variable_dir = os.path.join(output_dir, variable)
+                    os.makedirs(variable_dir, exist_ok=True)
+                    pd.DataFrame(values, index=timesteps, columns=[str(e) for e in elements]).to_parquet(
+                        os.path.join(variable_dir, f"chunk_{chunk_start:06d}.parquet"))
+                    chunk_stats[variable] = _chunk_stats(values, timesteps, elements)
+                progress["chunks"].append({
+                    "start": chunk_start,
+                    "stop": chunk_stop,
+                    "non_converged": int((~converged).sum()),
+                    "stats": chunk_stats
+                })
+                progress["completed_steps"] = chunk_stop
+                with open(progress_path, 'w') as f:
+                    json.dump(progress, f)
+                logger.info(f"Time series: {chunk_stop}/{n_steps} time steps completed")
+        finally:
+            for (element, column), values in original.items():
+                net[element].loc[values.index, column] = values.values
+        run_time = time.perf_counter() - run_start
+        steps_run = n_steps - first_step
+
+        return {
+            "status": "success",
+            "message": f"Time series power flow completed for {n_steps} time steps",
+            "output_dir": os.path.abspath(output_dir),
+            "time_steps": n_steps,
+            "resumed_from_step": first_step,
+            "non_converged_steps": sum(chunk["non_converged"] for chunk in progress["chunks"]),
+            "recycled_model": recycle is not None,
+            "statistics": _combine_stats(progress["chunks"], variables),
+            "timing": {
+                "run_time_s": round(run_time, 4),
+                "steps_per_second": round(steps_run / run_time, 2) if run_time > 0 else None
+            }
+        }
+    except ValueError as ve:
+        return {
+            "status": "error",
+            "message": str(ve)
+        }
+    except RuntimeError as re:
+        return {
+            "status": "error",
+            "message": str(re)
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Time series power flow failed: {str(e)}"
+        }
+
+def _sweep_metrics(net: pp.pandapowerNet, metrics: List[str]) -> Dict[str, float]:
+    """Compute scenario metrics from the power flow results of a network."""
+    values = {
+        "min_vm_pu": lambda: net.res_bus.vm_pu.min(),
+        "max_vm_pu": lambda: net.res_bus.vm_pu.max(),
+        "max_line_loading_percent": lambda: net.res_line.loading_percent.max(),
+        "max_trafo_loading_percent": lambda: net.res_trafo.loading_percent.max(),
+        "losses_mw": lambda: net.res_line.pl_mw.sum() + net.res_trafo.pl_mw.sum()
+    }
+    return {metric: float(values[metric]()) for metric in metrics}
+
+
+def _run_scenarios(net: pp.pandapowerNet, changes: List[Tuple[str, str, pd.Index]],
+                   scenarios: List[Tuple[float, ...]], metrics: List[str]) -> List[Dict[str, Any]]:
+    """Apply and solve scenarios in place on a network, then restore it.
+    
+    Each scenario is warm started from the previous converged one. The
+    internal power flow model is recycled when all changes only affect bus
+    injections.
+    
+    Args:
+        net: Working network (modified temporarily)
+        changes: (element, column, indices) changed by each scenario value
+        scenarios: One value per change for every scenario
+        metrics: Names of the metrics to compute
+        
+    Returns:
+        List with the convergence flag and metrics of each scenario
+    """
+    targets = {(element, column) for element, column, _ in changes}
+    recycle = None
+    if targets <= _RECYCLE_BUS_PQ_TARGETS | _RECYCLE_GEN_TARGETS:
+        recycle = {"bus_pq": True, "trafo": False, "gen": bool(targets & _RECYCLE_GEN_TARGETS)}
+    original = [net[element].loc[indices, column].copy() for element, column, indices in changes]
+    need_full_solve = True
+    rows = []
+    try:
+        for scenario in scenarios:
+            for (element, column, indices), value in zip(changes, scenario):
+                net[element].loc[indices, column] = value
+            try:
+                if recycle is not None and not need_full_solve:
+                    pp.runpp(net, recycle=recycle)
+                else:
+                    pp.runpp(net, init="auto" if need_full_solve else "results")
+                need_full_solve = not net.converged
+            except pp.LoadflowNotConverged:
+                need_full_solve = True
+            row = {"converged": not need_full_solve}
+            row.update(_sweep_metrics(net, metrics) if row["converged"]
+                       else {metric: None for metric in metrics})
+            rows.append(row)
+    finally:
+        for (element, column, indices), values in zip(changes, original):
+            net[element].loc[indices, column] = values.values
+    return rows
+
+
+def _run_scenario_chunk(changes: List[Tuple[str, str, pd.Index]],
+                        scenarios: List[Tuple[float, ...]],
+                        metrics: List[str]) -> List[Dict[str, Any]]:
+    """Solve a chunk of scenarios on the network of the current worker process."""
+    return _run_scenarios(_worker_net, changes, scenarios, metrics)
+
+
+@mcp.tool()
+def run_scenario_sweep(parameters: List[Dict[str, Any]], metrics: Optional[List[str]] = None,
+                       workers: Optional[int] = None,
+                       network_id: Optional[str] = None) -> Dict[str, Any]:
+    """Run power flows for a grid of parameter changes in one call.
+    
+    Every combination of the parameter values (cartesian product) is a
+    scenario. Scenarios are solved on a working copy of the network, so its
+    results and internal power flow model are left untouched; each solve is
+    warm started from the previous scenario, and large grids are split across
+    a process pool.
+    
+    Args:
+        parameters: List of parameter changes, each a dict with "element"
+            (e.g. "load"), "column" (e.g. "scaling" or "p_mw"), "values" (list
+            of values to sweep) and optional "indices" (elements to change,
+            default: all elements of the table)
+        metrics: Metrics to return (default: all of min_vm_pu, max_vm_pu,
+            max_line_loading_percent, max_trafo_loading_percent, losses_mw)
+        workers: Number of worker processes (default: all cores for grids of
+            at least 64 scenarios, otherwise serial)
+        network_id: Name of the network to sweep (default: the current network)
+        
+    Returns:
+        Dict containing a columnar table with one row per scenario
+    """
+    logger.info("Running scenario sweep")
+    try:
+        net = _get_network(network_id)
+        metrics = metrics or _SWEEP_METRICS
+        unknown = [metric for metric in metrics if metric not in _SWEEP_METRICS]
+        if unknown:
+            raise ValueError(f"Unknown metrics {unknown}. Use any of {_SWEEP_METRICS}.")
+        if not parameters:
+            raise ValueError("At least one parameter change is required.")
+
+        changes = []
+        labels = []
+        for parameter in parameters:
+            element, column = parameter.get("element"), parameter.get("column")
+            if (element not in net or not isinstance(net[element], pd.DataFrame)
+                    or column not in net[element].columns):
+                raise ValueError(f"Unknown element column '{element}.{column}'.")
+            if not parameter.get("values"):
+                raise ValueError(f"No values given for '{element}.{column}'.")
+            indices = pd.Index(parameter.get("indices") or net[element].index)
+            missing = indices.difference(net[element].index)
+            if len(missing):
+                raise ValueError(f"{element} {missing.tolist()} does not exist.")
+            changes.append((element, column, indices))
+            labels.append(f"{element}.{column}")
+        scenarios = list(itertools.product(*[parameter["values"] for parameter in parameters]))
+
+        if workers is None:
+            workers = (os.cpu_count() or 1) if len(scenarios) >= _PARALLEL_SWEEP_MIN_SCENARIOS else 1
+        elif workers == 0:
+            workers = os.cpu_count() or 1
+
+        start_time = time.perf_counter()
+        if workers > 1 and len(scenarios) > 1:
+            chunk_size = math.ceil(len(scenarios) / workers)
+            chunks = [scenarios[i:i + chunk_size] for i in range(0, len(scenarios), chunk_size)]
+            net_bytes = pickle.dumps(net, protocol=pickle.HIGHEST_PROTOCOL)
+            ctx = multiprocessing.get_context("spawn")
+            with ctx.Pool(len(chunks), initializer=_init_worker,
+                          initargs=(net_bytes, None)) as pool:
+                rows = [row for chunk_rows in pool.starmap(
+                            _run_scenario_chunk, [(changes, chunk, metrics) for chunk in chunks])
+                        for row in chunk_rows]
+        else:
+            # The results and recycled power flow model of the last scenario must
+            # not be left on the registry network
+            rows = _run_scenarios(copy.deepcopy(net), changes, scenarios, metrics)
+        run_time = time.perf_counter() - start_time
+
+        table = pd.DataFrame(scenarios, columns=labels)
+        table = pd.concat([table, pd.DataFrame(rows)], axis=1)
+        return {
+            "status": "success",
+            "message": f"Scenario sweep completed for {len(scenarios)} scenarios",
+            "scenarios": _encode_table(table),
+            "converged_scenarios": int(table["converged"].sum()),
+            "timing": {
+                "run_time_s": round(run_time, 4),
+                "scenarios_per_second": round(len(scenarios) / run_time, 2) if run_time > 0 else None,
+                "workers": workers
+            }
+        }
+    except ValueError as ve:
+        return {
+            "status": "error",
+            "message": str(ve)
+        }
+    except RuntimeError as re:
+        return {
+            "status": "error",
+            "message": str(re)
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Scenario sweep failed: {str(e)}"
+        }
+
+def _net_fingerprint(net: pp.pandapowerNet) -> str:
+    """Hash the input (non-result) element tables of a network.
+    
+    All-NaN columns are skipped: pandapower treats them like missing optional
+    parameters and adds them during calculations (e.g. calc_sc to net.trafo).
+    """
+    digest = hashlib.sha256()
+    for key in sorted(net.keys()):
+        df = net[key]
+        if key.startswith(('res_', '_')) or not isinstance(df, pd.DataFrame) or df.empty:
+            continue
+        df = df.loc[:, df.notna().any()]
+        digest.update(key.encode())
+        try:
+            hashed = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        except TypeError:
+            # Unhashable cell values (e.g. controller objects)
+            hashed = pd.util.hash_pandas_object(df.astype(str), index=True).to_numpy()
+        digest.update(hashed.tobytes())
+        digest.update(",".join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+
+@mcp.tool()
+def run_short_circuit(fault: str = "3ph", case: str = "max", buses: Optional[List[int]] = None,
+                      ip: bool = False, ith: bool = False, fields: Optional[List[str]] = None,
+                      float32: bool = False, network_id: Optional[str] = None) -> Dict[str, Any]:
+    """Run a short-circuit calculation (IEC 60909) with a fault at each given bus.
+    
+    Without ``buses`` a fault is calculated at every bus in one batched call,
+    which builds the short-circuit model and inverts the admittance matrix
+    once for all faults. Results are cached per network and calculation
+    options, so later studies of the same (unchanged) network at any subset
+    of already calculated buses return without recalculating.
+    
+    Args:
+        fault: Fault type ("3ph", "2ph" or "1ph")
+        case: "max" or "min" short-circuit currents
+        buses: Buses to place a fault at (default: all buses)
+        ip: Also calculate the peak short-circuit current
+        ith: Also calculate the equivalent thermal short-circuit current
+        fields: Result columns to return, e.g. ["ikss_ka"] (optional)
+        float32: Round float results to float32 precision
+        network_id: Name of the network (default: the current network)
+        
+    Returns:
+        Dict containing a columnar table of short-circuit results per bus
+    """
+    logger.info(f"Running {fault} short-circuit calculation")
+    try:
+        entry = _get_entry(network_id)
+        net = entry["net"]
+        if buses is None:
+            buses = net.bus.index[net.bus.in_service].tolist()
+        missing = pd.Index(buses).difference(net.bus.index)
+        if len(missing):
+            raise ValueError(f"Buses {missing.tolist()} do not exist.")
+
+        key = (_net_fingerprint(net), fault, case, ip, ith)
+        cached = entry["sc_cache"]
+        if cached is None or cached["key"] != key:
+            cached = entry["sc_cache"] = {"key": key, "results": None}
+        known = cached["results"].index if cached["results"] is not None else pd.Index([])
+        todo = [bus for bus in buses if bus not in known]
+
+        start_time = time.perf_counter()
+        if todo:
+            # Full inverse of Ybus pays off for many faults, LU solves for a few
+            sc.calc_sc(net, bus=todo, fault=fault, case=case, ip=ip, ith=ith,
+                       inverse_y=len(todo) > 0.1 * len(net.bus))
+            new_results = net.res_bus_sc.loc[todo].copy()
+            cached["results"] = (new_results if cached["results"] is None
+                                 else pd.concat([cached["results"], new_results]))
+        calc_time = time.perf_counter() - start_time
+
+        return {
+            "status": "success",
+            "message": f"Short-circuit calculation completed for {len(buses)} buses",
+            "cache": "hit" if not todo else ("miss" if len(todo) == len(buses) else "partial"),
+            "results": _encode_table(cached["results"].loc[buses], fields, float32),
+            "timing": {
+                "calculation_s": round(calc_time, 4),
+                "calculated_faults": len(todo),
+                "time_per_fault_s": round(calc_time / len(todo), 6) if todo else None
+            }
+        }
+    except ValueError as ve:
+        return {
+            "status": "error",
+            "message": str(ve)
+        }
+    except RuntimeError as re:
+        return {
+            "status": "error",
+            "message": str(re)
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Short-circuit calculation failed: {str(e)}"
+        }
+
+
+@mcp.tool()
+def run_opf(dc: bool = False, init: str = "flat", fields: Optional[List[str]] = None,
+            float32: bool = False, network_id: Optional[str] = None) -> Dict[str, Any]:
+    """Run an AC (runopp) or DC (rundcopp) optimal power flow.
+    
+    Args:
+        dc: Run a DC OPF instead of an AC OPF
+        init: AC OPF initialization ("flat", "pf" to start from a power flow
+            solution or "results" to start from the last results)
+        fields: Result columns to return, e.g. ["p_mw", "vm_pu"] (optional)
+        float32: Round float results to float32 precision
+        network_id: Name of the network (default: the current network)
+        
+    Returns:
+        Dict containing the cost and columnar bus and dispatch results
+    """
+    logger.info(f"Running {'DC' if dc else 'AC'} optimal power flow")
+    try:
+        net = _get_network(network_id)
+        start_time = time.perf_counter()
+        if dc:
+            pp.rundcopp(net)
+        else:
+            pp.runopp(net, init=init)
+        solve_time = time.perf_counter() - start_time
+
+        tables = {
+            "bus_results": net.res_bus,
+            "gen_results": net.res_gen,
+            "sgen_results": net.res_sgen,
+            "ext_grid_results": net.res_ext_grid
+        }
+        results = {name: _encode_table(df, fields, float32) for name, df in tables.items()}
+        return {
+            "status": "success",
+            "message": "Optimal power flow converged" if net.OPF_converged else "Optimal power flow did not converge",
+            "converged": bool(net.OPF_converged),
+            "cost": float(net.res_cost),
+            "results": results,
+            "solve_time_s": round(solve_time, 4)
+        }
+    except pp.OPFNotConverged:
+        return {
+            "status": "error",
+            "message": "Optimal power flow did not converge"
+        }
+    except RuntimeError as re:
+        return {
+            "status": "error",
+            "message": str(re)
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Optimal power flow failed: {str(e)}"
+        }
+
 if __name__ == "__main__":
     mcp.run(transport="stdio") 
\ No newline at end of file
@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandapower.networks as pn
+import panda_mcp
+
+
+class TestContingencyAnalysis(unittest.TestCase):
+    """
+    Check that the parallel contingency path reproduces the serial results.
+    """
+
+    def setUp(self):
+        panda_mcp._register_network("case30", pn.case30())
+
+    def test_parallel_matches_serial_full(self):
+        serial = panda_mcp.run_contingency_analysis(mode="full")
+        parallel = panda_mcp.run_contingency_analysis(mode="full", workers=2, chunk_size=7)
+        self.assertEqual(serial["status"], "success")
+        self.assertEqual(parallel["status"], "success")
+        self.assertEqual(serial["results"], parallel["results"])
+
+    def test_parallel_matches_serial_screen(self):
+        serial = panda_mcp.run_contingency_analysis(mode="screen")
+        parallel = panda_mcp.run_contingency_analysis(mode="screen", workers=2)
+        self.assertEqual(serial["screening"]["screened_out"], parallel["screening"]["screened_out"])
+        self.assertEqual(serial["results"], parallel["results"])
+
+    def test_parallel_with_timeout_matches_serial(self):
+        serial = panda_mcp.run_contingency_analysis(mode="full")
+        parallel = panda_mcp.run_contingency_analysis(mode="full", workers=2, chunk_size=7,
+                                                      contingency_timeout=60)
+        self.assertEqual(serial["results"], parallel["results"])
+
+    def test_timed_out_chunks(self):
+        serial = panda_mcp.run_contingency_analysis(mode="full")
+        parallel = panda_mcp.run_contingency_analysis(mode="full", workers=2, chunk_size=20,
+                                                      contingency_timeout=1e-6)
+        self.assertEqual(parallel["status"], "success")
+        self.assertEqual([r["contingency"] for r in serial["results"]],
+                         [r["contingency"] for r in parallel["results"]])
+        timed_out = [r for r in parallel["results"] if "Timed out" in r.get("error", "")]
+        self.assertGreater(len(timed_out), 0)
+        for serial_result, result in zip(serial["results"], parallel["results"]):
+            if result not in timed_out:
+                self.assertEqual(serial_result, result)
+
+    def test_worst_violations_from_index(self):
+        result = panda_mcp.run_contingency_analysis(limits={"line_max_loading_percent": 50})
+        self.assertEqual(result["status"], "success")
+        line_violations = sum(len(r["violations"]["loading_violations"])
+                              for r in result["results"] if "violations" in r)
+        self.assertGreater(line_violations, 0)
+
+        worst = panda_mcp.get_worst_violations(n=1000, element_type="line")
+        self.assertEqual(worst["status"], "success")
+        severity = worst["worst"]["data"][worst["worst"]["columns"].index("severity")]
+        self.assertEqual(len(severity), line_violations)
+        self.assertEqual(severity, sorted(severity, reverse=True))
+
+    def test_invalid_workers(self):
+        result = panda_mcp.run_contingency_analysis(workers=-1)
+        self.assertEqual(result["status"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
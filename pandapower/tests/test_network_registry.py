@@ -0,0 +1,128 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandapower as pp
+import panda_mcp
+
+TEST_CASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_case.json")
+
+
+class TestNetworkRegistry(unittest.TestCase):
+    """
+    Check load-once semantics and LRU eviction of the network registry.
+    """
+
+    def setUp(self):
+        panda_mcp._networks.clear()
+        panda_mcp._current_network_id = None
+
+    def test_load_once(self):
+        first = panda_mcp.load_network(TEST_CASE, network_id="case")
+        second = panda_mcp.load_network(TEST_CASE, network_id="case")
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        reloaded = panda_mcp.load_network(TEST_CASE, network_id="case", reload=True)
+        self.assertFalse(reloaded["cached"])
+
+    def test_unusable_parse_cache_dir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            not_a_dir = os.path.join(tmp_dir, "file")
+            open(not_a_dir, "w").close()
+            with patch.object(panda_mcp, "_PARSE_CACHE_DIR", os.path.join(not_a_dir, "cache")):
+                with self.assertLogs(panda_mcp.logger, level="WARNING"):
+                    result = panda_mcp.load_network(TEST_CASE, network_id="case")
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["parse_cache"], "miss")
+        self.assertEqual(panda_mcp.get_network_info(network_id="case")["info"]["buses"], 7)
+
+    def test_tools_use_network_id(self):
+        panda_mcp.load_network(TEST_CASE, network_id="a")
+        panda_mcp.create_empty_network(network_id="b")
+        info = panda_mcp.get_network_info(network_id="a")
+        self.assertEqual(info["info"]["buses"], 7)
+        self.assertEqual(panda_mcp.get_network_info()["info"]["buses"], 0)
+        missing = panda_mcp.run_power_flow(network_id="missing")
+        self.assertEqual(missing["status"], "error")
+
+    def test_lru_eviction(self):
+        with patch.object(panda_mcp, "_MAX_REGISTRY_MB", 0.0):
+            panda_mcp.load_network(TEST_CASE, network_id="a")
+            panda_mcp.load_network(TEST_CASE, network_id="b")
+        listed = panda_mcp.list_networks()["networks"]
+        self.assertEqual([n["network_id"] for n in listed], ["b"])
+        self.assertGreater(listed[0]["memory_mb"], 0)
+
+
+class TestParseCache(unittest.TestCase):
+    """
+    Check hits, invalidation and clearing of the on-disk parse cache.
+    """
+
+    def setUp(self):
+        panda_mcp._networks.clear()
+        panda_mcp._current_network_id = None
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "case.json")
+        shutil.copy(TEST_CASE, self.path)
+        self.cache_dir = patch.object(panda_mcp, "_PARSE_CACHE_DIR", os.path.join(self.tmp_dir.name, "cache"))
+        self.cache_dir.start()
+
+    def tearDown(self):
+        self.cache_dir.stop()
+        self.tmp_dir.cleanup()
+
+    def _load(self):
+        return panda_mcp.load_network(self.path, network_id="case", reload=True)
+
+    def test_hit_does_not_parse(self):
+        self.assertEqual(self._load()["parse_cache"], "miss")
+        with patch.object(panda_mcp.pp, "from_json", side_effect=AssertionError("parsed again")):
+            second = self._load()
+        self.assertEqual(second["parse_cache"], "hit")
+        self.assertEqual(panda_mcp.get_network_info(network_id="case")["info"]["buses"], 7)
+
+        info = panda_mcp.get_parse_cache_info()
+        self.assertEqual([entry["file_path"] for entry in info["entries"]], [os.path.abspath(self.path)])
+        self.assertTrue(os.path.exists(info["entries"][0]["cache_file"]))
+        self.assertGreater(info["total_size_mb"], 0)
+
+    def test_changed_contents_invalidate(self):
+        self._load()
+        os.utime(self.path)
+        self.assertEqual(self._load()["parse_cache"], "hit")
+
+        net = pp.from_json(self.path)
+        net.load.loc[net.load.index[0], "p_mw"] += 1.0
+        pp.to_json(net, self.path)
+        self.assertEqual(self._load()["parse_cache"], "miss")
+        loaded = panda_mcp._get_network("case")
+        self.assertAlmostEqual(loaded.load.p_mw.iloc[0], net.load.p_mw.iloc[0])
+        self.assertEqual(len(panda_mcp.get_parse_cache_info()["entries"]), 1)
+
+    def test_clear(self):
+        self._load()
+        other = os.path.join(self.tmp_dir.name, "other.json")
+        shutil.copy(TEST_CASE, other)
+        panda_mcp.load_network(other, network_id="other")
+
+        self.assertEqual(panda_mcp.clear_parse_cache(self.path)["status"], "success")
+        entries = panda_mcp.get_parse_cache_info()["entries"]
+        self.assertEqual([entry["file_path"] for entry in entries], [os.path.abspath(other)])
+        # The identical other file still uses the shared cache file
+        self.assertIsNotNone(entries[0]["cache_file"])
+        self.assertEqual(panda_mcp.clear_parse_cache(self.path)["status"], "error")
+
+        self.assertEqual(panda_mcp.clear_parse_cache()["status"], "success")
+        self.assertEqual(panda_mcp.get_parse_cache_info()["entries"], [])
+        self.assertFalse([name for name in os.listdir(panda_mcp._PARSE_CACHE_DIR) if name.endswith(".p")])
+        self.assertEqual(self._load()["parse_cache"], "miss")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandapower as pp
+import pandapower.networks as pn
+import panda_mcp
+
+
+class TestWarmStart(unittest.TestCase):
+    """
+    Check that power flows start from the last converged solution and fall back to the default start.
+    """
+
+    def setUp(self):
+        panda_mcp._networks.clear()
+        panda_mcp._register_network("case30", pn.case30())
+
+    def _vm_pu(self, result):
+        bus_results = result["results"]["bus_results"]
+        return bus_results["data"][bus_results["columns"].index("vm_pu")]
+
+    def test_second_run_is_warm_started(self):
+        cold = panda_mcp.run_power_flow()
+        warm = panda_mcp.run_power_flow()
+        self.assertEqual(cold["solver_stats"]["init"], "auto")
+        self.assertEqual(warm["solver_stats"]["init"], "results")
+        self.assertLessEqual(warm["solver_stats"]["iterations"], cold["solver_stats"]["iterations"])
+        for cold_vm, warm_vm in zip(self._vm_pu(cold), self._vm_pu(warm)):
+            self.assertAlmostEqual(cold_vm, warm_vm, places=6)
+
+    def test_flat_start(self):
+        panda_mcp.run_power_flow()
+        self.assertEqual(panda_mcp.run_power_flow(warm_start=False)["solver_stats"]["init"], "flat")
+
+    def test_stale_warm_start_falls_back(self):
+        panda_mcp.run_power_flow()
+        runpp = pp.runpp
+
+        def runpp_failing_warm_start(net, **kwargs):
+            if kwargs.get("init") == "results":
+                raise pp.LoadflowNotConverged("stale start")
+            return runpp(net, **kwargs)
+
+        with patch.object(panda_mcp.pp, "runpp", side_effect=runpp_failing_warm_start):
+            result = panda_mcp.run_power_flow()
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["solver_stats"]["init"], "auto")
+        self.assertTrue(result["results"]["converged"])
+
+    def test_changed_bus_set_is_not_warm_started(self):
+        panda_mcp.run_power_flow()
+        net = panda_mcp._get_network()
+        pp.create_bus(net, vn_kv=135.0)
+        pp.create_line_from_parameters(net, 0, len(net.bus) - 1, 1.0, 0.1, 0.1, 0.0, 1.0)
+        self.assertEqual(panda_mcp.run_power_flow()["solver_stats"]["init"], "auto")
+
+
+class TestTableEncoding(unittest.TestCase):
+    """
+    Check the columnar encoding of result tables and their Parquet export.
+    """
+
+    def setUp(self):
+        panda_mcp._networks.clear()
+        panda_mcp._register_network("case30", pn.case30())
+
+    def test_encode_table(self):
+        df = pd.DataFrame({"vm_pu": [1.0123456789, np.nan], "name": ["a", "b"], "n": [1, 2]}, index=[3, 7])
+        encoded = panda_mcp._encode_table(df)
+        self.assertEqual(encoded, {"index": [3, 7], "columns": ["vm_pu", "name", "n"],
+                                   "data": [[1.0123456789, None], ["a", "b"], [1, 2]]})
+        rounded = panda_mcp._encode_table(df, fields=["vm_pu", "missing"], float32=True)
+        self.assertEqual(rounded["columns"], ["vm_pu"])
+        self.assertEqual(rounded["data"], [[1.0123457, None]])
+
+    def test_power_flow_fields(self):
+        result = panda_mcp.run_power_flow(fields=["vm_pu", "loading_percent"])
+        self.assertEqual(result["results"]["bus_results"]["columns"], ["vm_pu"])
+        self.assertEqual(result["results"]["line_results"]["columns"], ["loading_percent"])
+        self.assertEqual(len(result["results"]["bus_results"]["index"]), 30)
+
+    @unittest.skipUnless(panda_mcp.PYARROW_AVAILABLE, "pyarrow is not available")
+    def test_export_to_parquet(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = panda_mcp.run_power_flow(output_dir=tmp_dir)
+            net = panda_mcp._get_network()
+            files = result["results"]["files"]
+            pd.testing.assert_frame_equal(pd.read_parquet(files["bus_results"]), net.res_bus)
+        summary = result["results"]["summary"]["bus_results"]
+        self.assertEqual(summary["rows"], 30)
+        stats = dict(zip(summary["stats"]["columns"], summary["stats"]["data"]))
+        self.assertAlmostEqual(stats["vm_pu"][1], net.res_bus.vm_pu.max())
+        # Only paths and summaries are returned, not the tables themselves
+        self.assertEqual(set(result["results"]), {"output_dir", "files", "summary", "converged"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandapower.networks as pn
+import panda_mcp
+
+PARAMETERS = [
+    {"element": "load", "column": "scaling", "values": [0.8, 1.0, 1.2]},
+    {"element": "gen", "column": "vm_pu", "values": [1.0, 1.02]},
+]
+
+
+class TestScenarioSweep(unittest.TestCase):
+    """
+    Check the scenario sweep against itself in parallel and its effect on the network.
+    """
+
+    def setUp(self):
+        panda_mcp._networks.clear()
+        panda_mcp._register_network("case30", pn.case30())
+
+    def test_parallel_matches_serial(self):
+        serial = panda_mcp.run_scenario_sweep(PARAMETERS, workers=1)
+        parallel = panda_mcp.run_scenario_sweep(PARAMETERS, workers=2)
+        self.assertEqual(serial["status"], "success")
+        self.assertEqual(parallel["timing"]["workers"], 2)
+        self.assertEqual(serial["converged_scenarios"], 6)
+        self.assertEqual(serial["scenarios"]["columns"], parallel["scenarios"]["columns"])
+        for column, values, parallel_values in zip(serial["scenarios"]["columns"], serial["scenarios"]["data"],
+                                                   parallel["scenarios"]["data"]):
+            for value, parallel_value in zip(values, parallel_values):
+                self.assertAlmostEqual(value, parallel_value, places=6, msg=column)
+
+    def test_network_unchanged(self):
+        self.assertEqual(panda_mcp.run_power_flow()["status"], "success")
+        net = panda_mcp._get_network()
+        loads, res_bus, ppc = net.load.copy(), net.res_bus.copy(), net._ppc
+        result = panda_mcp.run_scenario_sweep(PARAMETERS, workers=1)
+        self.assertEqual(result["status"], "success")
+        pd.testing.assert_frame_equal(net.load, loads)
+        pd.testing.assert_frame_equal(net.res_bus, res_bus)
+        self.assertIs(net._ppc, ppc)
+        self.assertTrue(net.converged)
+
+    def test_unknown_column(self):
+        result = panda_mcp.run_scenario_sweep([{"element": "load", "column": "nope", "values": [1.0]}])
+        self.assertEqual(result["status"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
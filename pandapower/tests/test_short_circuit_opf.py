@@ -0,0 +1,94 @@
+import copy
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandapower as pp
+import pandapower.networks as pn
+import pandapower.shortcircuit as sc
+import panda_mcp
+
+
+def _short_circuit_network():
+    net = pn.example_simple()
+    net.ext_grid["s_sc_max_mva"] = 1000.0
+    net.ext_grid["rx_max"] = 0.1
+    net.gen.drop(net.gen.index, inplace=True)
+    net.sgen["sn_mva"] = 2.0
+    net.sgen["k"] = 1.2
+    return net
+
+
+class TestShortCircuit(unittest.TestCase):
+    """
+    Check the short-circuit result cache against direct calculations.
+    """
+
+    def setUp(self):
+        panda_mcp._networks.clear()
+        panda_mcp._register_network("simple", _short_circuit_network())
+
+    def test_cache_hit_returns_identical_results(self):
+        first = panda_mcp.run_short_circuit()
+        second = panda_mcp.run_short_circuit()
+        self.assertEqual(first["cache"], "miss")
+        self.assertEqual(second["cache"], "hit")
+        self.assertEqual(second["timing"]["calculated_faults"], 0)
+        self.assertEqual(first["results"], second["results"])
+
+        subset = panda_mcp.run_short_circuit(buses=[3, 1])
+        self.assertEqual(subset["cache"], "hit")
+        self.assertEqual(subset["results"]["index"], [3, 1])
+
+    def test_partial_hit_matches_direct_calculation(self):
+        panda_mcp.run_short_circuit(buses=[0, 1])
+        result = panda_mcp.run_short_circuit(buses=[0, 1, 2])
+        self.assertEqual(result["cache"], "partial")
+        self.assertEqual(result["timing"]["calculated_faults"], 1)
+
+        net = _short_circuit_network()
+        sc.calc_sc(net, bus=[0, 1, 2])
+        ikss = result["results"]["data"][result["results"]["columns"].index("ikss_ka")]
+        for bus, value in zip([0, 1, 2], ikss):
+            self.assertAlmostEqual(value, net.res_bus_sc.at[bus, "ikss_ka"], places=6)
+
+    def test_changed_network_is_recalculated(self):
+        first = panda_mcp.run_short_circuit()
+        panda_mcp._get_network().ext_grid["s_sc_max_mva"] = 500.0
+        second = panda_mcp.run_short_circuit()
+        self.assertEqual(second["cache"], "miss")
+        self.assertNotEqual(first["results"], second["results"])
+
+    def test_unknown_bus(self):
+        self.assertEqual(panda_mcp.run_short_circuit(buses=[99])["status"], "error")
+
+
+class TestOptimalPowerFlow(unittest.TestCase):
+    """
+    Check the OPF tool against pandapower's OPF functions.
+    """
+
+    def setUp(self):
+        panda_mcp._networks.clear()
+        panda_mcp._register_network("case30", pn.case30())
+
+    def test_dc_opf(self):
+        result = panda_mcp.run_opf(dc=True)
+        net = pn.case30()
+        pp.rundcopp(net)
+        self.assertTrue(result["converged"])
+        self.assertAlmostEqual(result["cost"], net.res_cost, places=4)
+
+    def test_ac_opf(self):
+        result = panda_mcp.run_opf(fields=["p_mw"])
+        net = copy.deepcopy(pn.case30())
+        pp.runopp(net)
+        self.assertTrue(result["converged"])
+        self.assertAlmostEqual(result["cost"], net.res_cost, places=3)
+        self.assertEqual(result["results"]["gen_results"]["columns"], ["p_mw"])
+
+
+if __name__ == "__main__":
+    unittest.main()
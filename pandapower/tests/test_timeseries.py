@@ -0,0 +1,87 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandapower as pp
+import pandapower.networks as pn
+import panda_mcp
+
+
+class TestTimeseries(unittest.TestCase):
+    """
+    Check chunked time series runs and resuming them after an interruption.
+    """
+
+    def setUp(self):
+        panda_mcp._networks.clear()
+        panda_mcp._register_network("case30", pn.case30())
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.profile_path = os.path.join(self.tmp_dir.name, "profile.csv")
+        scale = np.linspace(0.8, 1.2, 8)
+        net = panda_mcp._get_network()
+        pd.DataFrame({f"load.p_mw.{i}": net.load.p_mw[i] * scale for i in (0, 1, 2)}).to_csv(self.profile_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _run(self, name, **kwargs):
+        return panda_mcp.run_timeseries(self.profile_path, os.path.join(self.tmp_dir.name, name),
+                                        chunk_size=3, **kwargs)
+
+    def _interrupted_run(self, name):
+        runpp = pp.runpp
+        calls = []
+
+        def failing_runpp(*args, **kwargs):
+            calls.append(1)
+            if len(calls) > 4:
+                raise RuntimeError("interrupted")
+            return runpp(*args, **kwargs)
+
+        with patch.object(panda_mcp.pp, "runpp", side_effect=failing_runpp):
+            result = self._run(name)
+        self.assertEqual(result["status"], "error")
+
+    def _read(self, name, variable="res_bus.vm_pu"):
+        return pd.read_parquet(os.path.join(self.tmp_dir.name, name, variable))
+
+    def test_chunked_run(self):
+        loads = panda_mcp._get_network().load.copy()
+        result = self._run("full")
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["non_converged_steps"], 0)
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp_dir.name, "full", "res_bus.vm_pu"))), 3)
+        self.assertEqual(len(self._read("full")), 8)
+        pd.testing.assert_frame_equal(panda_mcp._get_network().load, loads)
+
+    def test_resume_after_interruption(self):
+        self._interrupted_run("resumed")
+        with open(os.path.join(self.tmp_dir.name, "resumed", "progress.json")) as f:
+            self.assertEqual(json.load(f)["completed_steps"], 3)
+        resumed = self._run("resumed")
+        self.assertEqual(resumed["resumed_from_step"], 3)
+        self._run("full")
+        pd.testing.assert_frame_equal(self._read("resumed").sort_index(), self._read("full").sort_index())
+
+    def test_changed_profile_restarts(self):
+        self._interrupted_run("run")
+        profile = pd.read_csv(self.profile_path, index_col=0)
+        (profile * 1.01).to_csv(self.profile_path)
+        self.assertEqual(self._run("run")["resumed_from_step"], 0)
+
+    def test_changed_network_restarts(self):
+        self._interrupted_run("run")
+        panda_mcp._get_network().line.loc[0, "r_ohm_per_km"] *= 2
+        self.assertEqual(self._run("run")["resumed_from_step"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()